@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.fighters import Mitsu, Tank
+from core import game
+from core.game import Fighter, load_animation, VISIBLE_WIDTH, VISIBLE_HEIGHT
+from managers.frame_data_manager import get_fighter_frame_data
+
+GROUND_Y = VISIBLE_HEIGHT - 98
+
+
+@pytest.fixture
+def fighters(pygame_display):
+    player1 = Fighter(1, VISIBLE_WIDTH // 4, GROUND_Y - 230, Mitsu(), GROUND_Y)
+    player2 = Fighter(2, 3 * VISIBLE_WIDTH // 4, GROUND_Y - 230, Tank(), GROUND_Y)
+    return player1, player2
+
+
+def bench_update_physics(benchmark, fighters):
+    fighter = fighters[0]
+    fighter.vel_x = fighter.speed
+    fighter.on_ground = False
+    benchmark(fighter.update_physics)
+
+
+def bench_take_damage(benchmark, fighters):
+    fighter = fighters[1]
+
+    def hit():
+        # Sans invincibilité ni mort pour toujours passer par le calcul complet des dégâts
+        fighter.health = fighter.max_health
+        fighter.invincibility_frames = 0
+        fighter.take_damage(8, 1000, is_special=True)
+
+    benchmark(hit)
+
+
+def bench_draw(benchmark, fighters, pygame_display):
+    fighter = fighters[0]
+    fighter.update_physics()
+    benchmark(fighter.draw, pygame_display)
+
+
+def bench_draw_health_stamina_bars(benchmark, fighters, pygame_display):
+    fighter = fighters[1]
+    fighter.health = fighter.max_health * 0.6
+    fighter.combo_count = 3
+    benchmark(fighter.draw_health_stamina_bars, pygame_display)
+
+
+def _walk_animation():
+    frame_data = get_fighter_frame_data("Mitsu")
+    base_path = os.path.join("src", "assets", "characters", frame_data["directory"])
+    return base_path, "walk", frame_data["animations"]["walk"], int(600 / 3.5), int(800 / 3.5)
+
+
+def bench_load_animation_cold(benchmark, pygame_display):
+    # Cache d'images vidé avant chaque mesure : décodage des fichiers compris
+    benchmark.pedantic(load_animation, args=_walk_animation(), setup=game.image_cache.clear, rounds=10)
+
+
+def bench_load_animation_cached(benchmark, pygame_display):
+    benchmark(load_animation, *_walk_animation())
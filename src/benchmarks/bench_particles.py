@@ -0,0 +1,42 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.particle_system import Particle, ParticleSystem
+
+PARTICLE_COUNT = 500
+DT = 1 / 60
+
+
+def make_system(count=PARTICLE_COUNT):
+    system = ParticleSystem()
+    for _ in range(count):
+        pos = (random.uniform(0, 1225), random.uniform(0, 784))
+        vel = (random.uniform(-120, 120), random.uniform(-200, 50))
+        color = (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
+        # Durées de vie assez longues pour que le système reste plein pendant la mesure
+        system.particles.append(Particle(pos, vel, color, lifetime=random.uniform(1000, 2000)))
+    return system
+
+
+def bench_particle_update(benchmark):
+    system = make_system()
+    benchmark(system.update, DT)
+
+
+def bench_particle_update_expiring(benchmark):
+    # Toutes les particules expirent pendant l'appel : coût du filtrage de la liste
+    def setup():
+        system = make_system()
+        for particle in system.particles:
+            particle.age = particle.lifetime
+        return (system, ), {}
+
+    benchmark.pedantic(lambda system: system.update(DT), setup=setup)
+
+
+def bench_particle_draw(benchmark, pygame_display):
+    system = make_system()
+    benchmark(system.draw, pygame_display)
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pygame
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.selector import CharacterSelect, SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+@pytest.fixture
+def character_select(pygame_display):
+    # Seuls l'écran et le temps d'animation servent au fond : pas de chargement des portraits ni des sons
+    select = CharacterSelect.__new__(CharacterSelect)
+    select.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    select.animation_time = 0.0
+    return select
+
+
+def bench_draw_gradient_background(benchmark, character_select):
+    def draw():
+        character_select.animation_time += 0.016
+        character_select.draw_gradient_background()
+
+    benchmark(draw)
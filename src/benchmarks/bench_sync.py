@@ -0,0 +1,36 @@
+import json
+import random
+
+import pytest
+
+
+@pytest.fixture
+def sync_message():
+    """Requête UPDATE_STATE envoyée à chaque frame par le client multijoueur."""
+    game_state = {
+        "position": {"x": random.uniform(0, 1225), "y": random.uniform(400, 686)},
+        "velocity": {"x": random.uniform(-6, 6), "y": random.uniform(-12, 12)},
+        "health": random.uniform(0, 100),
+        "stamina": random.uniform(0, 100),
+        "direction": random.choice((-1, 1)),
+        "animation": random.choice(("idle", "walk", "attack", "special_attack")),
+        "animation_frame": random.uniform(0, 8),
+        "attacking": random.random() < 0.3,
+        "blocking": random.random() < 0.2,
+        "jumping": random.random() < 0.2
+    }
+    return {
+        "action": "UPDATE_STATE",
+        "room_id": "a-1b2c3d4e",
+        "player_id": "f3b0c442-98fc-1c14-9afb-f4c8996fb924",
+        "game_state": game_state
+    }
+
+
+def bench_sync_encode(benchmark, sync_message):
+    benchmark(lambda: json.dumps(sync_message).encode('utf-8'))
+
+
+def bench_sync_decode(benchmark, sync_message):
+    payload = json.dumps(sync_message).encode('utf-8')
+    benchmark(lambda: json.loads(payload.decode('utf-8')))
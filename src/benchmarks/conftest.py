@@ -0,0 +1,233 @@
+"""Configuration des benchmarks des chemins critiques du jeu.
+
+Lancement (depuis la racine du dépôt, sans fenêtre grâce aux pilotes SDL "dummy") :
+
+    python -m pytest src/benchmarks                 # mesure et compare au dernier run enregistré
+    python -m pytest src/benchmarks --bench-save    # ajoute le run à l'historique (history.jsonl)
+    python -m pytest src/benchmarks --bench-fail    # échoue si un benchmark a régressé
+
+La fixture `benchmark` reprend l'interface de pytest-benchmark (`benchmark(fn, *args)` et
+`benchmark.pedantic(...)`) sans en dépendre. L'historique est versionné : une régression
+apparaît directement dans la revue du diff.
+"""
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Les modules du jeu configurent un fichier de log à l'import : un handler déjà présent l'évite,
+# et les écritures de logs ne faussent pas les mesures
+logging.getLogger().addHandler(logging.NullHandler())
+
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPO_DIR = os.path.dirname(SRC_DIR)
+sys.path.append(SRC_DIR)
+
+HISTORY_FILE = os.path.join(os.path.dirname(__file__), "history.jsonl")
+SEED = 1234
+DEFAULT_ROUNDS = 30
+MIN_ROUND_TIME = 0.002  # Durée minimale d'une mesure (s) pour le calibrage des itérations
+DEFAULT_THRESHOLD = 0.2  # Ralentissement (médiane) au-delà duquel un benchmark est signalé
+
+_results = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "benchmarks PythFighter")
+    group.addoption("--bench-rounds", type=int, default=DEFAULT_ROUNDS,
+                    help="Nombre de mesures par benchmark")
+    group.addoption("--bench-save", action="store_true",
+                    help="Ajoute les résultats à l'historique")
+    group.addoption("--bench-threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="Ralentissement relatif signalé comme régression (0.2 = +20%%)")
+    group.addoption("--bench-fail", action="store_true",
+                    help="Échoue si une régression est détectée")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def repo_cwd():
+    # Les chemins des assets sont relatifs à la racine du dépôt
+    previous = os.getcwd()
+    os.chdir(REPO_DIR)
+    yield
+    os.chdir(previous)
+
+
+@pytest.fixture(autouse=True)
+def fixed_seed():
+    random.seed(SEED)
+
+
+@pytest.fixture(scope="session")
+def pygame_display(repo_cwd):
+    import pygame
+    from core.game import VISIBLE_WIDTH, VISIBLE_HEIGHT
+
+    pygame.init()
+    screen = pygame.display.set_mode((VISIBLE_WIDTH, VISIBLE_HEIGHT))
+    yield screen
+    pygame.quit()
+
+
+class Benchmark:
+    """Mesure une fonction sur plusieurs tours et garde les statistiques par appel."""
+
+    def __init__(self, name, rounds):
+        self.name = name
+        self.rounds = rounds
+        self.stats = None
+
+    def __call__(self, func, *args, **kwargs):
+        return self.pedantic(func, args, kwargs)
+
+    def pedantic(self, func, args=(), kwargs=None, setup=None, rounds=None, iterations=None, warmup_rounds=1):
+        """`setup` est appelé avant chaque mesure (hors chronométrage) et peut renvoyer (args, kwargs)."""
+        kwargs = kwargs or {}
+        rounds = rounds or self.rounds
+
+        def prepare():
+            if setup is None:
+                return args, kwargs
+            prepared = setup()
+            return prepared if prepared is not None else (args, kwargs)
+
+        if iterations is None:
+            # Avec un setup, chaque appel doit repartir d'un état neuf : une seule itération par mesure
+            iterations = 1 if setup is not None else self._calibrate(func, args, kwargs)
+
+        result = None
+        for _ in range(warmup_rounds):
+            call_args, call_kwargs = prepare()
+            result = func(*call_args, **call_kwargs)
+
+        timings = []
+        for _ in range(rounds):
+            call_args, call_kwargs = prepare()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = func(*call_args, **call_kwargs)
+            timings.append((time.perf_counter() - start) / iterations)
+
+        self.stats = {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.fmean(timings),
+            "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "rounds": rounds,
+            "iterations": iterations
+        }
+        _results[self.name] = self.stats
+        return result
+
+    @staticmethod
+    def _calibrate(func, args, kwargs):
+        iterations = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func(*args, **kwargs)
+            if time.perf_counter() - start >= MIN_ROUND_TIME or iterations >= 100000:
+                return iterations
+            iterations *= 2
+
+
+@pytest.fixture
+def benchmark(request):
+    return Benchmark(request.node.name, request.config.getoption("--bench-rounds"))
+
+
+def load_history():
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    with open(HISTORY_FILE, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_results(history):
+    """Dernière mesure connue de chaque benchmark."""
+    previous = {}
+    for run in history:
+        previous.update(run["results"])
+    return previous
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def format_duration(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    return f"{seconds * 1e3:.2f} ms"
+
+
+def find_regressions(previous, threshold):
+    regressions = {}
+    for name, stats in _results.items():
+        if name in previous:
+            ratio = stats["median"] / previous[name]["median"] - 1
+            if ratio > threshold:
+                regressions[name] = ratio
+    return regressions
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not _results:
+        return
+    # Comparaison avec l'historique tel qu'il était avant ce run
+    config._bench_previous = previous_results(load_history())
+    config._bench_regressions = find_regressions(config._bench_previous, config.getoption("--bench-threshold"))
+    if config._bench_regressions and config.getoption("--bench-fail") and session.exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    if config.getoption("--bench-save"):
+        run = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": current_commit(),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "results": {name: {key: (round(value, 9) if isinstance(value, float) else value)
+                               for key, value in stats.items()}
+                        for name, stats in sorted(_results.items())}
+        }
+        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run, ensure_ascii=False) + "\n")
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _results:
+        return
+    threshold = config.getoption("--bench-threshold")
+    previous = config._bench_previous
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'benchmark':<44}{'médiane':>12}{'min':>12}{'écart-type':>12}{'vs précédent':>14}")
+    for name, stats in sorted(_results.items()):
+        change = ""
+        if name in previous:
+            change = f"{stats['median'] / previous[name]['median'] - 1:+.1%}"
+            if name in config._bench_regressions:
+                change += " !"
+        terminalreporter.write_line(
+            f"{name:<44}{format_duration(stats['median']):>12}{format_duration(stats['min']):>12}"
+            f"{format_duration(stats['stddev']):>12}{change:>14}")
+
+    for name, ratio in config._bench_regressions.items():
+        terminalreporter.write_line(f"Régression: {name} {ratio:+.1%} (seuil {threshold:.0%})", red=True)
+    if config.getoption("--bench-save"):
+        terminalreporter.write_line(f"Résultats ajoutés à {os.path.relpath(HISTORY_FILE, REPO_DIR)}")
@@ -22,6 +22,9 @@ class GameSettings:
     SOUND_ENABLED = True
     MUSIC_VOLUME = 0.7
     SFX_VOLUME = 0.8
+    MIXER_FREQUENCY = 44100
+    MIXER_BUFFER = 512  # Échantillons par tampon : plus petit = moins de latence, plus de risque de craquements
+    MIXER_VOICES = 16  # Canaux (sons simultanés) du mixeur
 
     @staticmethod
     def parse_color(color_str):
@@ -0,0 +1,101 @@
+# Répertoire des nœuds du cluster de relais PythFighter
+#
+# Chaque nœud (core/server.py --node-id ...) s'enregistre ici toutes les quelques secondes avec
+# son adresse et sa charge, et reçoit en retour la liste des nœuds vivants. Le répertoire ne voit
+# passer aucune requête de jeu : les nœuds redirigent eux-mêmes les clients vers le nœud
+# propriétaire d'une salle (l'ID de salle commence par l'ID du nœud).
+#
+# Usage : python src/core/directory.py [--port 25580]
+
+import argparse
+import json
+import logging
+import socket
+import threading
+import time
+
+HOST = '0.0.0.0'
+DIRECTORY_PORT = 25580
+NODE_TTL = 15  # Un nœud sans nouvelles depuis 15 secondes est considéré comme arrêté
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+nodes = {}  # node_id -> informations du nœud
+nodes_lock = threading.Lock()
+
+
+def live_nodes():
+    """Nœuds ayant donné des nouvelles récemment (les autres sont oubliés)."""
+    now = time.time()
+    with nodes_lock:
+        for node_id in [node_id for node_id, node in nodes.items() if now - node["last_seen"] > NODE_TTL]:
+            del nodes[node_id]
+            logging.warning(f"Nœud {node_id} retiré du cluster (plus de nouvelles)")
+        return [dict(node) for node in nodes.values()]
+
+
+def process_request(request):
+    action = request.get("action", "")
+
+    if action == "REGISTER_NODE":
+        node_id = request.get("node_id")
+        if not isinstance(node_id, str) or not node_id or "-" in node_id:
+            return {"status": "error", "message": "ID de nœud invalide"}
+        node = {
+            "node_id": node_id,
+            "host": request.get("host"),
+            "port": request.get("port"),
+            "ping_port": request.get("ping_port"),
+            "rooms": request.get("rooms", 0),
+            "last_seen": time.time()
+        }
+        with nodes_lock:
+            if node_id not in nodes:
+                logging.info(f"Nœud {node_id} enregistré ({node['host']}:{node['port']})")
+            nodes[node_id] = node
+        return {"status": "success", "nodes": live_nodes()}
+
+    if action == "LIST_NODES":
+        return {"status": "success", "nodes": live_nodes()}
+
+    return {"status": "error", "message": "Action non reconnue"}
+
+
+def handle_client(client_socket):
+    try:
+        client_socket.settimeout(5)
+        request = json.loads(client_socket.recv(4096).decode('utf-8'))
+        response = process_request(request)
+    except (OSError, ValueError) as e:
+        response = {"status": "error", "message": str(e)}
+    try:
+        client_socket.sendall(json.dumps(response).encode('utf-8'))
+    except OSError:
+        pass
+    finally:
+        client_socket.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Répertoire du cluster PythFighter")
+    parser.add_argument("--port", type=int, default=DIRECTORY_PORT)
+    args = parser.parse_args()
+
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_socket.bind((HOST, args.port))
+    server_socket.listen(32)
+    logging.info(f"Répertoire du cluster démarré sur {HOST}:{args.port}")
+
+    try:
+        while True:
+            client, addr = server_socket.accept()
+            threading.Thread(target=handle_client, args=(client,), daemon=True).start()
+    except KeyboardInterrupt:
+        logging.info("Arrêt du répertoire...")
+    finally:
+        server_socket.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,14 @@ logging.basicConfig(filename='launcher.log', level=logging.DEBUG,
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from config.fighters import Mitsu, Tank, Noya, ThunderStrike, Bruiser
+from managers.frame_data_manager import (DEFAULT_FRAME_DELAY, get_active_window, get_fighter_frame_data,
+                                         get_frame_delays, get_move_cooldown, get_move_duration)
+from core.replay import ReplayRecorder, CHECKPOINT_INTERVAL
+from managers.text_cache import text_cache, quantize
+from managers.audio_manager import audio
+from managers.bundle import open_asset
+from managers.input_manager import (InputManager, InputHistory, CommandParser, Command,
+                                    MENU_UP, MENU_DOWN, MENU_SELECT, MENU_BACK)
 
 # Constants
 BASE_WIDTH, BASE_HEIGHT = 175, 112
@@ -27,6 +35,48 @@ GROUND_Y = VISIBLE_HEIGHT - VISIBLE_HEIGHT // 5.4
 MAX_JUMP_HEIGHT = 60
 BLOCK_STAMINA_DRAIN = 0.2
 SPECIAL_ATTACK_MULTIPLIER = 2.5
+FPS = 60
+
+# Écrans de transition, dessinés frame par frame dans la boucle principale (jamais bloquants)
+COUNTDOWN_SECONDS = 3
+VICTORY_FADE_SECONDS = 0.5
+LOADING_BUDGET = 0.008  # Temps (s) consacré par frame au chargement des animations différées
+
+# Entrées d'un joueur pour une frame, codées sur un entier (un bit par action).
+# C'est ce mot qui est enregistré dans les replays.
+INPUT_LEFT = 1 << 0
+INPUT_RIGHT = 1 << 1
+INPUT_JUMP = 1 << 2
+INPUT_BLOCK = 1 << 3
+INPUT_ATTACK = 1 << 4
+INPUT_SPECIAL = 1 << 5
+# La manette n'a pas la même logique que le clavier, ses entrées ont donc leurs propres bits
+PAD_CONNECTED = 1 << 6
+PAD_LEFT = 1 << 7
+PAD_RIGHT = 1 << 8
+PAD_JUMP = 1 << 9
+PAD_ATTACK = 1 << 10
+PAD_BLOCK = 1 << 11
+PAD_SPECIAL = 1 << 12
+
+KEY_BINDINGS = {
+    1: {INPUT_LEFT: pygame.K_a, INPUT_RIGHT: pygame.K_d, INPUT_JUMP: pygame.K_w,
+        INPUT_BLOCK: pygame.K_LSHIFT, INPUT_ATTACK: pygame.K_r, INPUT_SPECIAL: pygame.K_t},
+    2: {INPUT_LEFT: pygame.K_LEFT, INPUT_RIGHT: pygame.K_RIGHT, INPUT_JUMP: pygame.K_UP,
+        INPUT_BLOCK: pygame.K_RSHIFT, INPUT_ATTACK: pygame.K_RETURN, INPUT_SPECIAL: pygame.K_p},
+}
+PAD_BUTTONS = {PAD_JUMP: 0, PAD_ATTACK: 1, PAD_BLOCK: 2, PAD_SPECIAL: 3}
+PAD_LAYOUT = {"connected": PAD_CONNECTED, "left": PAD_LEFT, "right": PAD_RIGHT}
+
+# Commandes reconnues dans l'historique des entrées (calculées dans la simulation : les replays
+# les reproduisent à l'identique). Arrière, avant, attaque déclenche l'attaque spéciale.
+INPUT_HISTORY_SIZE = 30
+DIRECTIONS = {
+    "forward": {1: INPUT_RIGHT | PAD_RIGHT, -1: INPUT_LEFT | PAD_LEFT},
+    "back": {1: INPUT_LEFT | PAD_LEFT, -1: INPUT_RIGHT | PAD_RIGHT},
+}
+COMMANDS = [Command("special", ("back", "forward", INPUT_ATTACK | PAD_ATTACK), window=15)]
+command_parser = CommandParser(COMMANDS, DIRECTIONS)
 
 class GameState(Enum):
     COUNTDOWN = "countdown"
@@ -39,138 +89,27 @@ class GameState(Enum):
 image_cache = {}
 
 def load_image(path):
-    if not os.path.exists(path):
-        logging.error(f"Image file not found: {path}")
-        return None
     if path not in image_cache:
         try:
-            image = pygame.image.load(path).convert_alpha()
+            image = pygame.image.load(open_asset(path)).convert_alpha()
             image_cache[path] = image
             logging.info(f"Image loaded successfully: {path}")
+        except FileNotFoundError:
+            logging.error(f"Image file not found: {path}")
+            return None
         except Exception as e:
             logging.error(f"Error loading image {path}: {e}")
             return None
     return image_cache[path]
 
-def update(self):
-    current_time = time.time()
-    events = pygame.event.get()
-
-    for event in events:
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                # Toggle options menu instead of quitting
-                if self.game_state == GameState.PLAYING:
-                    self.game_state = GameState.OPTIONS
-                elif self.game_state == GameState.OPTIONS:
-                    self.game_state = GameState.PLAYING
-            elif self.game_state == GameState.VICTORY and event.key == pygame.K_r:
-                self.__init__()  # Réinitialiser le jeu
-                self.game_state = GameState.COUNTDOWN
-                return
-
-    self.screen.fill((0, 0, 0))
-    self.screen.blit(self.bg_image, (0, 0))
-
-    keys = pygame.key.get_pressed()
-
-    if self.game_state == GameState.PAUSED:
-        for fighter in self.fighters:
-            fighter.draw(self.screen)
-        self.draw_pause_menu()
-        self.handle_menu_input(keys, events)
-        return
-
-    if self.game_state == GameState.VICTORY:
-        for fighter in self.fighters:
-            fighter.draw(self.screen)
-        self.draw_victory_screen()
-        if keys[pygame.K_RETURN]:
-            pygame.quit()
-            sys.exit()
-        return
-
-    if self.game_state == GameState.OPTIONS:
-        self.show_options_menu()
-        self.handle_menu_input(keys, events)
-        return
-
-    remaining_time = self.draw_timer()
-    if remaining_time <= 0:
-        health_percent_1 = self.fighters[0].health / self.fighters[0].max_health
-        health_percent_2 = self.fighters[1].health / self.fighters[1].max_health
-        self.winner = 1 if health_percent_1 >= health_percent_2 else 2
-        self.game_state = GameState.VICTORY
-        if self.sounds_loaded:
-            self.victory_sound.play()
-        return
-
-    for fighter in self.fighters:
-        fighter.update_physics()
-        fighter.recover_stamina()
-        fighter.draw(self.screen)
-
-    for i, fighter in enumerate(self.fighters):
-        if i < len(self.controllers):
-            self.handle_input(fighter, self.controllers[i], None, current_time)
-        self.handle_input(fighter, None, keys, current_time)
-        fighter.update_effects()
-
-    if self.fighters[0].hitbox.colliderect(self.fighters[1].hitbox):
-        if self.fighters[0].attacking and not self.fighters[1].stunned:
-            if self.fighters[0].special_attack():
-                opponent = self.fighters[1]
-                side_length = min(opponent.rect.width, opponent.rect.height)
-                opponent.hitbox = pygame.Rect(
-                    opponent.rect.centerx - side_length // 2,
-                    opponent.rect.centery - side_length // 2,
-                    side_length,
-                    side_length
-                )
-                opponent.take_damage(self.fighters[0].damage * SPECIAL_ATTACK_MULTIPLIER, time.time(), is_special=True)
-            else:
-                self.fighters[1].take_damage(self.fighters[0].damage, time.time())
-            if self.sounds_loaded:
-                self.hit_sound.play()
-
-        if self.fighters[1].attacking and not self.fighters[0].stunned:
-            if self.fighters[1].special_attack():
-                self.fighters[0].take_damage(self.fighters[1].damage * SPECIAL_ATTACK_MULTIPLIER, time.time(), is_special=True)
-            else:
-                self.fighters[0].take_damage(self.fighters[1].damage, time.time())
-            if self.sounds_loaded:
-                self.hit_sound.play()
-
-    for i, fighter in enumerate(self.fighters):
-        if fighter.health <= 0:
-            self.winner = 2 if i == 0 else 1
-            self.game_state = GameState.VICTORY
-            if self.sounds_loaded:
-                self.victory_sound.play()
-            return
-
-    pygame.display.flip()
-    self.clock.tick(60)
-
-def load_animation(path, action, frame_count, fighter_width, fighter_height):
+def load_animation(path, action, animation_data, fighter_width, fighter_height):
     frames = []
-    animation_folder = os.path.join(path, action)
-
-    if not os.path.exists(animation_folder):
-        logging.error(f"Animation folder not found - {animation_folder}")
-        return frames
+    animation_folder = os.path.join(path, animation_data.get("folder", action))
 
-    frame_index = 0
-    while True:
-        frame_name = f"frame_{frame_index:02}_delay-0.1s.png"
+    # La liste des frames vient du manifeste : aucun test d'existence fichier par fichier
+    for frame_name in animation_data.get("frames", []):
         frame_path = os.path.join(animation_folder, frame_name)
 
-        if not os.path.exists(frame_path):
-            break
-
         img = load_image(frame_path)
         if img:
             # Supprimer les espaces vides autour de l'image
@@ -181,13 +120,14 @@ def load_animation(path, action, frame_count, fighter_width, fighter_height):
             resized_img = pygame.transform.scale(cropped_img, (fighter_width, fighter_height))
             frames.append(resized_img)
 
-        frame_index += 1
+    if not frames:
+        logging.error(f"No frames loaded for animation - {animation_folder}")
 
     return frames
 
 
 class Fighter:
-    def __init__(self, player, x, y, fighter_data, ground_y):
+    def __init__(self, player, x, y, fighter_data, ground_y, defer_animations=False):
         self.player = player
         self.name = fighter_data.name
         self.color = fighter_data.color
@@ -210,18 +150,20 @@ class Fighter:
         self.ground_y = ground_y
         self.rect = pygame.Rect(x, y, self.fighter_width, self.fighter_height)
 
-        # Créer une hitbox légèrement plus fine
-        hitbox_width = int(self.fighter_width * 0.7)  # 70% de la largeur
-        hitbox_height = int(self.fighter_height * 0.85)  # 85% de la hauteur
-        hitbox_x = self.rect.centerx - hitbox_width // 2
-        hitbox_y = self.rect.bottom - hitbox_height  # Alignée avec les pieds
-        self.hitbox = pygame.Rect(hitbox_x, hitbox_y, hitbox_width, hitbox_height)
+        # Données de frames (animations, hitbox, timings des attaques) issues du manifeste
+        self.frame_data = get_fighter_frame_data(self.name)
+
+        # Hitbox plus fine que le sprite, proportions données par le manifeste
+        self.hitbox = pygame.Rect(0, 0, 0, 0)
+        self.update_hitbox()
 
         self.on_ground = True
         self.attacking = False
         self.can_attack = True
         self.blocking = False
         self.attack_cooldown = 0
+        self.current_move = None  # Attaque en cours ("attack" / "special_attack")
+        self.move_frame = 0  # Frames écoulées depuis le début de l'attaque en cours
         self.invincibility_frames = 0
         self.combo_count = 0
         self.last_hit_time = 0
@@ -229,7 +171,6 @@ class Fighter:
         self.animations = None
         self.current_animation = "idle"
         self.animation_frame = 0
-        self.animation_speed = 0.3
         self.special_attack_cooldown = 0
         self.using_special_attack = False
         self.special_attack_frames = 0
@@ -238,66 +179,54 @@ class Fighter:
         self.stunned = False  # Ajout de l'attribut stunned
 
         logging.info(f"Loading animations for {self.name}...")
-        base_path = os.path.join("src", "assets", "characters", self.name.lower())
         self.animations = {}
 
-        # Définir le nombre de frames pour chaque animation en fonction du personnage
-        if self.name == "ThunderStrike":
-            frame_counts = {
-                "idle": 4,
-                "walk": 8,
-                "attack": 4,
-                "dead": 7,
-                "special_attack": 4
-            }
-        elif self.name == "Tank":
-            frame_counts = {
-                "idle": 10,
-                "walk": 8,
-                "attack": 21,
-                "dead": 16,
-                "special_attack": 4
-            }
-        elif self.name == "Mitsu":
-            frame_counts = {
-                "idle": 8,
-                "walk": 8,
-                "attack": 6,
-                "dead": 6,
-                "special_attack": 4
-            }
-        elif self.name == "Noya":
-            frame_counts = {
-               "idle": 5,
-               "walk": 7,
-               "attack": 6,
-               "dead": 6,
-               "special_attack": 5
-            }
-        elif self.name == "Bruiser":
-            frame_counts = {
-                "idle": 8,
-                "walk": 8,
-                "attack": 4,
-                "dead": 6,
-                "special_attack": 5
-            }
+        # Charger les animations listées dans le manifeste. Différées, seule "idle" est chargée
+        # tout de suite : les autres le sont pendant le compte à rebours (load_next_animation)
+        self.pending_animations = list(self.frame_data["animations"])
+        if defer_animations and "idle" in self.pending_animations:
+            self.pending_animations.remove("idle")
+            self.pending_animations.insert(0, "idle")
+            self.load_next_animation()
         else:
-            frame_counts = {
-                "id66": 4,
-                "wa6k": 4,
-                "atta5k": 4,
-                "dead": 4,
-                "special_attack": 4
-            }
-
-        # Charger les animations en fonction du nombre de frames défini
-        for action, frame_count in frame_counts.items():
-            self.animations[action] = load_animation(base_path, action, frame_count, self.fighter_width, self.fighter_height)
-
-        # Log des animations chargées
-        for anim_name, frames in self.animations.items():
-            logging.info(f"Animation '{anim_name}' pour {self.name}: {len(frames)} frames chargées.")
+            while self.load_next_animation():
+                pass
+
+    def load_next_animation(self):
+        """Charge la prochaine animation en attente ; retourne False quand il n'en reste plus."""
+        if not self.pending_animations:
+            return False
+        action = self.pending_animations.pop(0)
+        base_path = os.path.join("src", "assets", "characters", self.frame_data["directory"])
+        self.animations[action] = load_animation(base_path, action, self.frame_data["animations"][action],
+                                                 self.fighter_width, self.fighter_height)
+        logging.info(f"Animation '{action}' pour {self.name}: {len(self.animations[action])} frames chargées.")
+        return True
+
+    # Attributs qui définissent l'état de simulation (points de contrôle des replays).
+    # rect et hitbox n'en font pas partie : update_physics les recalcule avant toute utilisation.
+    STATE_FIELDS = ("pos_x", "pos_y", "vel_x", "vel_y", "direction", "health", "stamina", "speed", "damage",
+                    "on_ground", "attacking", "can_attack", "blocking", "using_special_attack", "stunned",
+                    "attack_cooldown", "special_attack_cooldown", "invincibility_frames", "combo_count",
+                    "last_hit_time", "current_animation", "current_move", "move_frame")
+    # Attributs des effets spéciaux, présents uniquement pendant l'effet
+    EFFECT_FIELDS = ("burn_damage", "burn_duration", "stun_duration", "boost_duration", "boost_stat_name")
+
+    def get_state(self):
+        state = {field: getattr(self, field) for field in self.STATE_FIELDS}
+        state.update({field: getattr(self, field) for field in self.EFFECT_FIELDS if hasattr(self, field)})
+        return state
+
+    def set_state(self, state):
+        for field in self.STATE_FIELDS:
+            setattr(self, field, state[field])
+        for field in self.EFFECT_FIELDS:
+            if field in state:
+                setattr(self, field, state[field])
+            elif hasattr(self, field):
+                delattr(self, field)
+        # rect et hitbox sont recalculés à partir de la position au début de la frame suivante
+        self.rect.topleft = (int(self.pos_x), int(self.pos_y))
 
     def draw(self, surface):
         # Animation d'entrée "slide" + effet de glow
@@ -339,12 +268,10 @@ class Fighter:
 
             surface.blit(sprite, (self.rect.x, self.rect.y))
 
-            if current_anim == "special_attack":
-                self.animation_frame = (self.animation_frame + 0.15) % len(self.animations[current_anim])
-            elif current_anim == "attack":
-                self.animation_frame = (self.animation_frame + 0.25) % len(self.animations[current_anim])
-            else:
-                self.animation_frame = (self.animation_frame + self.animation_speed) % len(self.animations[current_anim])
+            # Vitesse de l'animation : délai de chaque frame donné par le manifeste
+            delays = get_frame_delays(self.frame_data, current_anim)
+            delay = delays[frame_idx] if frame_idx < len(delays) else DEFAULT_FRAME_DELAY
+            self.animation_frame = (self.animation_frame + 1 / (FPS * delay)) % len(self.animations[current_anim])
 
             if self.invincibility_frames > 0:
                 glow_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
@@ -440,41 +367,41 @@ class Fighter:
             pygame.draw.rect(highlight_surface, highlight_color, (0, 0, int(stamina_width), highlight_height), border_radius=5)
             surface.blit(highlight_surface, (bar_x, 40))
 
-        name_font = pygame.font.Font(None, 24)
+        # Textes servis par le cache : le nom et les libellés sont rendus une seule fois,
+        # les nombres sont composés de chiffres déjà rendus
         name_color = (220, 220, 240)
-        name_text = name_font.render(self.name, True, name_color)
-        name_shadow = name_font.render(self.name, True, (0, 0, 0))
-        health_text = name_font.render(f"{int(self.health)}/{self.max_health}", True, (150, 150, 180))
-        health_shadow = name_font.render(f"{int(self.health)}/{self.max_health}", True, (0, 0, 0))
+        name_text = text_cache.render(self.name, 24, name_color)
+        name_shadow = text_cache.render(self.name, 24, (0, 0, 0))
+        health_label = f"{int(self.health)}/{self.max_health}"
 
         combo_scale = 1.0 + (0.2 * min(self.combo_count, 5)) if self.combo_count > 1 else 1.0
-        combo_font = pygame.font.Font(None, int(24 * combo_scale))
+        combo_size = int(24 * combo_scale)
         combo_color = (255, 215, 0) if self.combo_count > 1 else (200, 200, 100)
-        combo_text = combo_font.render(f"Combo: {self.combo_count}", True, combo_color)
-        combo_shadow = combo_font.render(f"Combo: {self.combo_count}", True, (0, 0, 0))
+        combo_label = f"Combo: {self.combo_count}"
 
         if self.player == 1:
             surface.blit(name_shadow, (bar_x + 2, 62))
-            surface.blit(health_shadow, (bar_x + bar_width - 98, 62))
-            surface.blit(combo_shadow, (bar_x + 2, 82))
+            text_cache.blit_dynamic(surface, health_label, (bar_x + bar_width - 98, 62), 24, (0, 0, 0))
+            text_cache.blit_dynamic(surface, combo_label, (bar_x + 2, 82), combo_size, (0, 0, 0))
             surface.blit(name_text, (bar_x, 60))
-            surface.blit(health_text, (bar_x + bar_width - 100, 60))
-            surface.blit(combo_text, (bar_x, 80))
+            text_cache.blit_dynamic(surface, health_label, (bar_x + bar_width - 100, 60), 24, (150, 150, 180))
+            text_cache.blit_dynamic(surface, combo_label, (bar_x, 80), combo_size, combo_color)
         else:
+            combo_width = text_cache.dynamic_width(combo_label, combo_size, combo_color)
             surface.blit(name_shadow, (bar_x + bar_width - name_text.get_width() + 2, 62))
-            surface.blit(health_shadow, (bar_x + 2, 62))
-            surface.blit(combo_shadow, (bar_x + bar_width - combo_text.get_width() + 2, 82))
+            text_cache.blit_dynamic(surface, health_label, (bar_x + 2, 62), 24, (0, 0, 0))
+            text_cache.blit_dynamic(surface, combo_label, (bar_x + bar_width - combo_width + 2, 82), combo_size, (0, 0, 0))
             surface.blit(name_text, (bar_x + bar_width - name_text.get_width(), 60))
-            surface.blit(health_text, (bar_x, 60))
-            surface.blit(combo_text, (bar_x + bar_width - combo_text.get_width(), 80))
+            text_cache.blit_dynamic(surface, health_label, (bar_x, 60), 24, (150, 150, 180))
+            text_cache.blit_dynamic(surface, combo_label, (bar_x + bar_width - combo_width, 80), combo_size, combo_color)
 
         if self.blocking and self.stamina > 0:
-            block_font = pygame.font.Font(None, 20)
-            pulse = (pygame.time.get_ticks() % 1000) / 1000.0
+            # Pulsation par paliers : quelques couleurs en cache au lieu d'un rendu par frame
+            pulse = quantize((pygame.time.get_ticks() % 1000) / 1000.0)
             alpha = 128 + int(127 * pulse)
             block_color = (0, 255, 255, alpha)
-            block_text = block_font.render("BLOCKING", True, block_color)
-            block_shadow = block_font.render("BLOCKING", True, (0, 0, 0))
+            block_text = text_cache.render("BLOCKING", 20, block_color)
+            block_shadow = text_cache.render("BLOCKING", 20, (0, 0, 0))
             block_x = bar_x if self.player == 1 else bar_x + bar_width - block_text.get_width()
 
             shield_radius = 20 + int(5 * pulse)
@@ -485,11 +412,10 @@ class Fighter:
             surface.blit(block_text, (block_x, 100))
 
         if self.special_attack_cooldown <= 0:
-            special_font = pygame.font.Font(None, 20)
-            pulse = (pygame.time.get_ticks() % 1000) / 1000.0
+            pulse = quantize((pygame.time.get_ticks() % 1000) / 1000.0)
             special_color = (255, 50 + int(205 * pulse), 50 + int(100 * pulse))
-            special_text = special_font.render("SPECIAL READY", True, special_color)
-            special_shadow = special_font.render("SPECIAL READY", True, (0, 0, 0))
+            special_text = text_cache.render("SPECIAL READY", 20, special_color)
+            special_shadow = text_cache.render("SPECIAL READY", 20, (0, 0, 0))
             special_x = bar_x if self.player == 1 else bar_x + bar_width - special_text.get_width()
 
             glow_surface = pygame.Surface((special_text.get_width() + 10, special_text.get_height() + 10), pygame.SRCALPHA)
@@ -502,10 +428,9 @@ class Fighter:
             surface.blit(special_shadow, (special_x + 1, 121))
             surface.blit(special_text, (special_x, 120))
         else:
-            cooldown_font = pygame.font.Font(None, 18)
-            cooldown_text = cooldown_font.render(f"SPECIAL: {self.special_attack_cooldown // 60 + 1}s", True, (200, 200, 200))
-            cooldown_x = bar_x if self.player == 1 else bar_x + bar_width - cooldown_text.get_width()
-            surface.blit(cooldown_text, (cooldown_x, 120))
+            cooldown_label = f"SPECIAL: {self.special_attack_cooldown // 60 + 1}s"
+            cooldown_x = bar_x if self.player == 1 else bar_x + bar_width - text_cache.dynamic_width(cooldown_label, 18, (200, 200, 200))
+            text_cache.blit_dynamic(surface, cooldown_label, (cooldown_x, 120), 18, (200, 200, 200))
 
     def take_damage(self, damage, current_time, is_special=False):
         if self.invincibility_frames <= 0:
@@ -552,11 +477,7 @@ class Fighter:
         if self.can_attack and self.attack_cooldown == 0 and not self.blocking and self.stamina >= 10:
             distance = abs(self.rect.centerx - opponent_x)
             if distance < self.rect.width * 2:
-                self.attacking = True
-                self.can_attack = False
-                self.attack_cooldown = 30
-                self.animation_frame = 0
-                self.current_animation = "attack"
+                self.start_move("attack")
                 self.stamina -= 10
                 return True
         return False
@@ -564,12 +485,9 @@ class Fighter:
     def special_attack(self):
         """Effectue une attaque spéciale unique pour chaque personnage."""
         if self.special_attack_cooldown <= 0 and self.stamina >= 30 and not self.blocking:
+            self.start_move("special_attack")
             self.using_special_attack = True
-            self.attacking = True
-            self.can_attack = False
-            self.current_animation = "special_attack"
-            self.animation_frame = 0
-            self.special_attack_cooldown = 240  # Cooldown de 4 secondes
+            self.special_attack_cooldown = get_move_cooldown(self.frame_data, "special_attack")  # 4 secondes par défaut
             self.stamina -= 30
 
             # Effet visuel pour l'attaque spéciale
@@ -662,14 +580,39 @@ class Fighter:
                 del self.boost_duration
                 del self.boost_stat_name
 
+    def update_hitbox(self):
+        """Hitbox centrée sur le sprite et alignée avec les pieds, aux proportions du manifeste."""
+        width = int(self.rect.width * self.frame_data["hitbox"]["width"])
+        height = int(self.rect.height * self.frame_data["hitbox"]["height"])
+        self.hitbox.update(self.rect.centerx - width // 2, self.rect.bottom - height, width, height)
+
+    def start_move(self, move):
+        """Démarre une attaque : durée et fenêtre de coups viennent du manifeste (clavier comme manette)."""
+        self.attacking = True
+        self.can_attack = False
+        self.current_move = move
+        self.move_frame = 0
+        self.attack_cooldown = get_move_duration(self.frame_data, move)
+        self.current_animation = move
+        self.animation_frame = 0
+
+    def hit_active(self):
+        """Vrai pendant les frames actives de l'attaque en cours (après le startup, avant la recovery)."""
+        if not self.attacking or self.current_move is None:
+            return False
+        start, end = get_active_window(self.frame_data, self.current_move)
+        return start <= self.move_frame < end
+
     def reset_attack(self):
         if self.attack_cooldown > 0:
             self.attack_cooldown -= 1
+            self.move_frame += 1
 
             if self.attack_cooldown == 1:
                 self.attacking = False
                 self.can_attack = True
                 self.using_special_attack = False
+                self.current_move = None
 
                 if self.current_animation in ["attack", "special_attack"]:
                     self.current_animation = "idle"
@@ -746,10 +689,7 @@ class Fighter:
 
         self.rect.x = int(self.pos_x)
         self.rect.y = int(self.pos_y)
-        side = min(self.rect.width, self.rect.height)
-        hitbox_x = self.rect.centerx - side // 2
-        hitbox_y = self.rect.centery - side // 2
-        self.hitbox.update(hitbox_x, hitbox_y, side, side)
+        self.update_hitbox()
 
         if self.invincibility_frames > 0:
             self.invincibility_frames -= 1
@@ -758,18 +698,23 @@ class Fighter:
 
 
 class Game:
-    def __init__(self, player1_type="Mitsu", player2_type="Tank"):
+    def __init__(self, player1_type="Mitsu", player2_type="Tank", seed=None, record=True, headless=False):
         pygame.init()
         pygame.joystick.init()
         self.screen = pygame.display.set_mode((VISIBLE_WIDTH, VISIBLE_HEIGHT))
         pygame.display.set_caption("PythFighter")
+        self.headless = headless
 
-        random.seed(time.time()*time.time())  # Ensure randomness by seeding with the current time
+        # La graine est enregistrée dans le replay pour rejouer exactement le même combat
+        self.seed = seed if seed is not None else int(time.time() * 1000)
+        random.seed(self.seed)
+        # Aléatoire purement visuel (tremblement d'écran), séparé pour ne pas influencer la simulation
+        self.fx_random = random.Random()
         self.bg_selected = random.choice(["bg_2.png", "backg.png", "bgtree.png", "bg-ile.png", "bgjoconde.png", "bgmatrix.png","jard.png"])
 
         try:
             bg_path = os.path.join("src", "assets", "backgrounds", self.bg_selected)
-            self.bg_image = pygame.image.load(bg_path).convert_alpha()
+            self.bg_image = pygame.image.load(open_asset(bg_path)).convert_alpha()
             self.bg_image = pygame.transform.scale(self.bg_image, (VISIBLE_WIDTH, VISIBLE_HEIGHT))
             logging.info(f"Background image loaded successfully: {bg_path}")
         except Exception as e:
@@ -804,95 +749,88 @@ class Game:
 
         self.fighters = [
             Fighter(1, VISIBLE_WIDTH // 4 - 75, self.ground_y - fighter_height,  # Position ajustée pour le joueur 1
-                    fighter_map[player1_type](), self.ground_y),
+                    fighter_map[player1_type](), self.ground_y, defer_animations=not headless),
             Fighter(2, VISIBLE_WIDTH * 3 // 4 - 75, self.ground_y - fighter_height,  # Position ajustée pour le joueur 2
-                    fighter_map[player2_type](), self.ground_y)
+                    fighter_map[player2_type](), self.ground_y, defer_animations=not headless)
         ]
         # Ajoute une référence au jeu pour chaque fighter
         for fighter in self.fighters:
             fighter.game_ref = self
 
-        self.controllers = []
-        for i in range(min(2, pygame.joystick.get_count())):
-            try:
-                joy = pygame.joystick.Joystick(i)
-                joy.init()
-                self.controllers.append(joy)
-                logging.info(f"Controller {i} initialized with {joy.get_numaxes()} axes and {joy.get_numbuttons()} buttons.")
-            except Exception as e:
-                logging.error(f"Error initializing controller {i}: {e}")
+        # Entrées lues depuis les événements ; les manettes peuvent être branchées en cours de partie
+        self.input = InputManager(KEY_BINDINGS, PAD_LAYOUT, PAD_BUTTONS, use_joysticks=not headless)
+        self.controllers = self.input.controllers
+        for joy in self.controllers:
+            logging.info(f"Controller {joy.get_instance_id()} initialized with {joy.get_numaxes()} axes and {joy.get_numbuttons()} buttons.")
+        # Historique des mots appliqués par la simulation (commandes), sauvegardé dans les points de contrôle
+        self.input_histories = [InputHistory(INPUT_HISTORY_SIZE) for _ in self.fighters]
 
         self.clock = pygame.time.Clock()
         self.game_state = GameState.COUNTDOWN
         self.start_time = time.time()
+        self.state_started = self.start_time  # Début de l'écran de transition en cours
         self.game_start_time = None
         self.round_time = 99
-        self.font = pygame.font.Font(None, 36)
+        self.font = text_cache.font(36)
         self.winner = None
         self.shake_timer = 0
         self.shake_intensity = 0
+        self.frame_count = 0
+
+        self.recorder = None
+        if record:
+            self.recorder = ReplayRecorder(player1_type, player2_type, self.seed, self.bg_selected, FPS)
 
         self.menu_options = ["Resume", "Options", "Quit"]
         self.selected_option = 0
 
-        try:
-            pygame.mixer.init()
-            self.hit_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "hit.wav"))
-            self.victory_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "victory.wav"))
-            self.menu_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "menu.wav"))
-            self.sounds_loaded = True
-            logging.info("Sounds loaded successfully")
-        except Exception as e:
-            logging.error(f"Failed to load sound effects: {e}")
-            self.sounds_loaded = False
-            self.hit_sound = None
-            self.victory_sound = None
-            self.menu_sound = None
+        # Sons décodés une fois dans la banque partagée, joués sur le pool de canaux du moteur audio
+        self.sounds_loaded = not headless and audio.init()
+        if self.sounds_loaded:
+            audio.preload(("hit", "victory", "menu"))
+
+    def remaining_time(self):
+        # Le chrono est compté en frames de simulation pour que les replays soient reproductibles
+        return max(0, self.round_time - self.frame_count // FPS)
 
     def draw_timer(self):
-        if self.game_start_time:
-            remaining_time = max(0, int(self.round_time - (time.time() - self.game_start_time)))
-            timer_text = self.font.render(str(remaining_time), True, (255, 255, 255))
-            timer_rect = timer_text.get_rect(center=(VISIBLE_WIDTH // 2, 30))
-            self.screen.blit(timer_text, timer_rect)
-            return remaining_time
-        return self.round_time
+        timer_text = text_cache.render(str(self.remaining_time()), 36, (255, 255, 255))
+        timer_rect = timer_text.get_rect(center=(VISIBLE_WIDTH // 2, 30))
+        self.screen.blit(timer_text, timer_rect)
 
     def draw_pause_menu(self):
         pause_surface = pygame.Surface((VISIBLE_WIDTH, VISIBLE_HEIGHT), pygame.SRCALPHA)
         pause_surface.fill((0, 0, 0, 180))
         self.screen.blit(pause_surface, (0, 0))
 
-        title_font = pygame.font.Font(None, 72)
-        title_text = title_font.render("PAUSE", True, (255, 255, 255))
+        title_text = text_cache.render("PAUSE", 72, (255, 255, 255))
         title_rect = title_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 4))
         self.screen.blit(title_text, title_rect)
 
         for i, option in enumerate(self.menu_options):
             color = (255, 255, 0) if i == self.selected_option else (200, 200, 200)
-            option_text = self.font.render(option, True, color)
+            option_text = text_cache.render(option, 36, color)
             option_rect = option_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 2 + i * 50))
             self.screen.blit(option_text, option_rect)
 
             if i == self.selected_option:
                 pygame.draw.rect(self.screen, (255, 255, 0), option_rect.inflate(20, 10), 2)
 
-        controls_font = pygame.font.Font(None, 24)
-        controls_text = controls_font.render("↑/↓: Navigate   Enter: Select", True, (150, 150, 150))
+        controls_text = text_cache.render("↑/↓: Navigate   Enter: Select", 24, (150, 150, 150))
         controls_rect = controls_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT * 3 // 4 + 50))
         self.screen.blit(controls_text, controls_rect)
 
         pygame.display.flip()
 
-    def draw_victory_screen(self):
+    def draw_victory_screen(self, fade=1.0):
+        """Écran de victoire ; `fade` (0 à 1) assombrit progressivement le combat en arrière-plan."""
         victory_surface = pygame.Surface((VISIBLE_WIDTH, VISIBLE_HEIGHT), pygame.SRCALPHA)
-        victory_surface.fill((0, 0, 0, 180))
+        victory_surface.fill((0, 0, 0, int(180 * fade)))
         self.screen.blit(victory_surface, (0, 0))
 
-        title_font = pygame.font.Font(None, 72)
         winner_name = self.fighters[self.winner - 1].name
-        title_text = title_font.render(f"PLAYER {self.winner} WINS!", True, (255, 215, 0))
-        name_text = title_font.render(f"{winner_name}", True, self.fighters[self.winner - 1].color)
+        title_text = text_cache.render(f"PLAYER {self.winner} WINS!", 72, (255, 215, 0))
+        name_text = text_cache.render(f"{winner_name}", 72, self.fighters[self.winner - 1].color)
 
         title_rect = title_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 4))
         name_rect = name_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 4 + 80))
@@ -901,152 +839,93 @@ class Game:
         self.screen.blit(name_text, name_rect)
 
         # Ajouter une option "Rejouer"
-        replay_font = pygame.font.Font(None, 36)
-        replay_text = replay_font.render("Press R to Replay or ESC to Quit", True, (200, 200, 200))
+        replay_text = text_cache.render("Press R to Replay or ESC to Quit", 36, (200, 200, 200))
         replay_rect = replay_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT * 3 // 4 + 50))
         self.screen.blit(replay_text, replay_rect)
 
         pygame.display.flip()
 
-    def handle_input(self, fighter, controller, keys, current_time):
-        deadzone = 0.2
-
-        if controller:
-            try:
-                x_axis = controller.get_axis(0)
-                if abs(x_axis) > deadzone:
-                    fighter.vel_x = fighter.speed * (x_axis / abs(x_axis))
-                    fighter.direction = 1 if x_axis > 0 else -1
-                    fighter.current_animation = "walk"
-                else:
-                    fighter.vel_x = 0
-                    if not fighter.attacking and not fighter.using_special_attack:
-                        fighter.current_animation = "idle"
+    def apply_input(self, fighter, word):
+        """Applique le mot d'entrée d'un joueur (même code en jeu et en relecture de replay)."""
+        opponent = self.fighters[1 if fighter.player == 1 else 0]
 
-                if controller.get_button(0) and fighter.on_ground:  # Bouton A/X
-                    fighter.vel_y = -MAX_JUMP_HEIGHT * 0.15
-                    fighter.on_ground = False
-
-                if controller.get_button(2):
-                    fighter.blocking = True
-                    fighter.stamina = max(0, fighter.stamina - BLOCK_STAMINA_DRAIN * 3)
-                else:
-                    fighter.blocking = False
-                
-                if fighter.blocking:
-                    fighter.attacking = False
-                    fighter.can_attack = False
-                    fighter.current_animation = "block"
-                else:
+        if word & PAD_CONNECTED:
+            if word & (PAD_LEFT | PAD_RIGHT):
+                direction = -1 if word & PAD_LEFT else 1
+                fighter.vel_x = fighter.speed * direction
+                fighter.direction = direction
+                fighter.current_animation = "walk"
+            else:
+                fighter.vel_x = 0
+                if not fighter.attacking and not fighter.using_special_attack:
                     fighter.current_animation = "idle"
 
+            if word & PAD_JUMP and fighter.on_ground:  # Bouton A/X
+                fighter.vel_y = -MAX_JUMP_HEIGHT * 0.15
+                fighter.on_ground = False
 
-                if controller.get_button(1) and fighter.can_attack:  # Bouton B/O
-                    fighter.attacking = True
-                    fighter.can_attack = False
-                    fighter.attack_cooldown = 20
-                    fighter.current_animation = "attack"
-                    fighter.attack(self.fighters[1 if fighter.player == 1 else 0].rect.centerx)
-
-                if controller.get_button(3):
-                    if not fighter.using_special_attack and fighter.special_attack_cooldown <= 0:
-                      # Bouton Y/Triangle
-                        fighter.special_attack()
-                        fighter.current_animation = "special_attack"
-                        fighter.using_special_attack = True
-                        fighter.special_attack_cooldown = 180
-                elif not controller.get_button(3):
-                    fighter.using_special_attack = False
-
-                if self.game_state in [GameState.PAUSED, GameState.VICTORY]:
-                    if controller.get_button(7):
-                        if self.game_state == GameState.PAUSED:
-                            self.game_state = GameState.PLAYING
-                        elif self.game_state == GameState.VICTORY:
-                            pygame.quit()
-                            sys.exit()
-
-                    try:
-                        dpad_y = controller.get_hat(0)[1] if controller.get_numhats() > 0 else 0
-                        if dpad_y == 1:
-                            self.selected_option = (self.selected_option - 1) % len(self.menu_options)
-                            pygame.time.delay(200)
-                        elif dpad_y == -1:
-                            self.selected_option = (self.selected_option + 1) % len(self.menu_options)
-                            pygame.time.delay(200)
-                    except Exception as e:
-                        logging.error(f"Error navigating D-pad: {e}")
-            except Exception as e:
-                logging.error(f"Error handling controller input: {e}")
-
-        if keys:
-            if fighter.player == 1:
-                if keys[pygame.K_a]:
-                    fighter.vel_x = -fighter.speed * 2
-                    fighter.direction = -1
-                elif keys[pygame.K_d]:
-                    fighter.vel_x = fighter.speed * 2
-                    fighter.direction = 1
-
-                if keys[pygame.K_w] and fighter.on_ground:
-                    fighter.vel_y = -10
-                    fighter.on_ground = False
-
-                if keys[pygame.K_LSHIFT]:
-                    fighter.block()
-                else:
-                    fighter.stop_blocking()
+            if word & PAD_BLOCK:
+                fighter.blocking = True
+                fighter.stamina = max(0, fighter.stamina - BLOCK_STAMINA_DRAIN * 3)
+            else:
+                fighter.blocking = False
 
-                if keys[pygame.K_r]:
-                    fighter.attack(self.fighters[1].rect.centerx)
+            if fighter.blocking:
+                fighter.attacking = False
+                fighter.can_attack = False
+                fighter.current_animation = "block"
+            else:
+                fighter.current_animation = "idle"
 
-                if keys[pygame.K_t]:
+            if word & PAD_ATTACK and fighter.can_attack:  # Bouton B/O
+                # Pas de condition de distance à la manette, mais les mêmes timings qu'au clavier
+                fighter.start_move("attack")
+
+            if word & PAD_SPECIAL:
+                if not fighter.using_special_attack and fighter.special_attack_cooldown <= 0:
+                    # Bouton Y/Triangle
                     fighter.special_attack()
             else:
-                if keys[pygame.K_LEFT]:
-                    fighter.vel_x = -fighter.speed * 2
-                    fighter.direction = -1
-                elif keys[pygame.K_RIGHT]:
-                    fighter.vel_x = fighter.speed * 2
-                    fighter.direction = 1
-
-                if keys[pygame.K_UP] and fighter.on_ground:
-                    fighter.vel_y = -10
-                    fighter.on_ground = False
-
-                if keys[pygame.K_RSHIFT]:
-                    fighter.block()
-                else:
-                    fighter.stop_blocking()
+                fighter.using_special_attack = False
 
-                if keys[pygame.K_RETURN]:
-                    fighter.attack(self.fighters[0].rect.centerx)
+        if word & INPUT_LEFT:
+            fighter.vel_x = -fighter.speed * 2
+            fighter.direction = -1
+        elif word & INPUT_RIGHT:
+            fighter.vel_x = fighter.speed * 2
+            fighter.direction = 1
 
-                if keys[pygame.K_p]:
-                    fighter.special_attack()
+        if word & INPUT_JUMP and fighter.on_ground:
+            fighter.vel_y = -10
+            fighter.on_ground = False
 
-    def handle_menu_input(self, keys, events):
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.selected_option = (self.selected_option - 1) % len(self.menu_options)
-                    if self.sounds_loaded and self.menu_sound:
-                        try:
-                            self.menu_sound.play()
-                        except Exception as e:
-                            logging.error(f"Error playing menu sound: {e}")
-                elif event.key == pygame.K_DOWN:
-                    self.selected_option = (self.selected_option + 1) % len(self.menu_options)
-                    if self.sounds_loaded and self.menu_sound:
-                        try:
-                            self.menu_sound.play()
-                        except Exception as e:
-                            logging.error(f"Error playing menu sound: {e}")
-                elif event.key == pygame.K_RETURN:
-                    self.execute_menu_option()
-                elif event.key == pygame.K_ESCAPE:
-                    if self.game_state == GameState.PAUSED:
-                        self.game_state = GameState.PLAYING
+        if word & INPUT_BLOCK:
+            fighter.block()
+        else:
+            fighter.stop_blocking()
+
+        if word & INPUT_ATTACK:
+            fighter.attack(opponent.rect.centerx)
+
+        if word & INPUT_SPECIAL:
+            fighter.special_attack()
+
+    def handle_menu_input(self, actions):
+        """Navigation des menus (clavier, croix, stick ou boutons) : une action par appui, sans attente."""
+        for action in actions:
+            if action == MENU_UP:
+                self.selected_option = (self.selected_option - 1) % len(self.menu_options)
+                if self.sounds_loaded:
+                    audio.play("menu")
+            elif action == MENU_DOWN:
+                self.selected_option = (self.selected_option + 1) % len(self.menu_options)
+                if self.sounds_loaded:
+                    audio.play("menu")
+            elif action == MENU_SELECT:
+                self.execute_menu_option()
+            elif action == MENU_BACK:
+                if self.game_state == GameState.PAUSED:
+                    self.game_state = GameState.PLAYING
 
     def execute_menu_option(self):
         selected = self.menu_options[self.selected_option]
@@ -1064,23 +943,21 @@ class Game:
         options_surface.fill((0, 0, 0, 180))
         self.screen.blit(options_surface, (0, 0))
 
-        title_font = pygame.font.Font(None, 72)
-        title_text = title_font.render("OPTIONS", True, (255, 255, 255))
+        title_text = text_cache.render("OPTIONS", 72, (255, 255, 255))
         title_rect = title_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 4))
         self.screen.blit(title_text, title_rect)
 
         options = ["Sound: ON" if self.sounds_loaded else "Sound: OFF", "Back to Game"]
         for i, option in enumerate(options):
             color = (255, 255, 0) if i == 0 else (200, 200, 200)
-            option_text = self.font.render(option, True, color)
+            option_text = text_cache.render(option, 36, color)
             option_rect = option_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 2 + i * 50))
             self.screen.blit(option_text, option_rect)
 
             if i == 0:
                 pygame.draw.rect(self.screen, (255, 255, 0), option_rect.inflate(20, 10), 2)
 
-        controls_font = pygame.font.Font(None, 24)
-        controls_text = controls_font.render("↑/↓: Navigate   Enter: Select", True, (150, 150, 150))
+        controls_text = text_cache.render("↑/↓: Navigate   Enter: Select", 24, (150, 150, 150))
         controls_rect = controls_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT * 3 // 4 + 50))
         self.screen.blit(controls_text, controls_rect)
 
@@ -1097,8 +974,7 @@ class Game:
         overlay.fill((0, 0, 0, 128))
         self.screen.blit(overlay, (0, 0))
 
-        font = pygame.font.Font(None, 200)
-        text = font.render(str(number), True, (255, 255, 255))
+        text = text_cache.render(str(number), 200, (255, 255, 255))
         text_rect = text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 2))
 
         for i in range(20, 0, -5):
@@ -1109,23 +985,152 @@ class Game:
 
         self.screen.blit(text, text_rect)
 
-        ready_font = pygame.font.Font(None, 72)
-        ready_text = ready_font.render("GET READY!", True, (255, 255, 255))
+        ready_text = text_cache.render("GET READY!", 72, (255, 255, 255))
         ready_rect = ready_text.get_rect(center=(VISIBLE_WIDTH // 2, VISIBLE_HEIGHT // 2 - 150))
         self.screen.blit(ready_text, ready_rect)
 
         pygame.display.flip()
-        pygame.time.wait(1000)
 
-    def update(self):
-        current_time = time.time()
-        events = pygame.event.get()
+    def load_assets(self, budget=None):
+        """Charge les animations différées, dans la limite de `budget` secondes (tout si None).
+
+        Retourne True quand tout est chargé.
+        """
+        deadline = None if budget is None else time.perf_counter() + budget
+        for fighter in self.fighters:
+            while fighter.pending_animations:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return False
+                fighter.load_next_animation()
+        return True
+
+    def start_match(self):
+        # La simulation ne démarre qu'avec toutes les animations (elles fixent current_animation)
+        self.load_assets()
+        self.input.flush()
+        self.game_state = GameState.PLAYING
+        self.game_start_time = time.time()
+
+    def get_state(self):
+        """État de la simulation, enregistré dans les points de contrôle des replays."""
+        return {
+            "frame": self.frame_count,
+            "fighters": [fighter.get_state() for fighter in self.fighters],
+            "input_history": [history.words() for history in self.input_histories],
+        }
+
+    def set_state(self, state):
+        self.frame_count = state["frame"]
+        for fighter, fighter_state in zip(self.fighters, state["fighters"]):
+            fighter.set_state(fighter_state)
+        # Les replays enregistrés avant l'historique des entrées repartent d'un historique vide
+        for history, words in zip(self.input_histories, state.get("input_history", [[], []])):
+            history.restore(words, self.frame_count)
+        self.winner = None
+        self.game_state = GameState.PLAYING
+
+    def end_match(self, winner):
+        self.winner = winner
+        self.game_state = GameState.VICTORY
+        self.state_started = time.time()
+        if self.sounds_loaded:
+            audio.play("victory")
+        if self.recorder:
+            self.recorder.winner = winner
+            self.recorder.save()
+            self.recorder = None
+
+    def step(self, words):
+        """Avance la simulation d'une frame. Retourne False quand le combat est terminé."""
+        if self.game_state == GameState.COUNTDOWN:
+            # Replay ou appel direct sans compte à rebours
+            self.start_match()
+        if self.frame_count % CHECKPOINT_INTERVAL == 0:
+            # Graine réinitialisée à chaque point de contrôle : un replay peut reprendre de n'importe lequel
+            random.seed(self.seed + self.frame_count)
+            if self.recorder:
+                self.recorder.checkpoint(self.frame_count, self.get_state())
+        if self.recorder:
+            self.recorder.record(words)
+        self.frame_count += 1
+        current_time = self.frame_count / FPS
+
+        if self.remaining_time() <= 0:
+            health_percent_1 = self.fighters[0].health / self.fighters[0].max_health
+            health_percent_2 = self.fighters[1].health / self.fighters[1].max_health
+            self.end_match(1 if health_percent_1 >= health_percent_2 else 2)
+            return False
+
+        for fighter in self.fighters:
+            fighter.update_physics()
+            fighter.recover_stamina()
 
+        for fighter, word, history in zip(self.fighters, words, self.input_histories):
+            history.push(self.frame_count, word, current_time)
+            if "special" in command_parser.match(history, fighter.direction):
+                word |= PAD_SPECIAL if word & PAD_CONNECTED else INPUT_SPECIAL
+            self.apply_input(fighter, word)
+
+            # Appliquer les effets spéciaux actifs
+            fighter.update_effects()
+
+        if self.fighters[0].hitbox.colliderect(self.fighters[1].hitbox):
+            # Un coup ne touche que pendant les frames actives de l'attaque (manifeste)
+            if self.fighters[0].hit_active() and not self.fighters[1].stunned:
+                if self.fighters[0].special_attack():
+                    self.fighters[1].take_damage(self.fighters[0].damage * SPECIAL_ATTACK_MULTIPLIER, current_time, is_special=True)
+                else:
+                    self.fighters[1].take_damage(self.fighters[0].damage, current_time)
+                if self.sounds_loaded:
+                    audio.play("hit")
+
+            if self.fighters[1].hit_active() and not self.fighters[0].stunned:
+                if self.fighters[1].special_attack():
+                    self.fighters[0].take_damage(self.fighters[1].damage * SPECIAL_ATTACK_MULTIPLIER, current_time, is_special=True)
+                else:
+                    if not self.fighters[0].blocking:
+                        self.fighters[0].take_damage(self.fighters[1].damage, current_time)
+                if self.sounds_loaded:
+                    audio.play("hit")
+
+        for i, fighter in enumerate(self.fighters):
+            if fighter.health <= 0:
+                self.end_match(2 if i == 0 else 1)
+                return False
+
+        return True
+
+    def render(self):
+        """Dessine l'arène, le chrono et les combattants (aucune logique de jeu ici)."""
         shake_offset = [0, 0]
         if self.shake_timer > 0:
             self.shake_timer -= 1
-            shake_offset[0] = random.randint(-self.shake_intensity, self.shake_intensity)
-            shake_offset[1] = random.randint(-self.shake_intensity, self.shake_intensity)
+            shake_offset[0] = self.fx_random.randint(-self.shake_intensity, self.shake_intensity)
+            shake_offset[1] = self.fx_random.randint(-self.shake_intensity, self.shake_intensity)
+
+        self.screen.fill((0, 0, 0))
+        self.screen.blit(self.bg_image, (shake_offset[0], shake_offset[1]))
+
+        if self.game_state == GameState.OPTIONS:
+            return
+
+        if self.game_state == GameState.PLAYING:
+            self.draw_timer()
+
+        for fighter in self.fighters:
+            fighter.draw(self.screen)
+
+    def pump_events(self):
+        """Traite uniquement les événements de fermeture (utilisé pendant la relecture des replays)."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                sys.exit()
+
+    def update(self):
+        events = pygame.event.get()
+        self.input.process_events(events)
+        menu_actions = self.input.take_menu_actions()
 
         for event in events:
             if event.type == pygame.QUIT:
@@ -1140,106 +1145,56 @@ class Game:
                     self.game_state = GameState.COUNTDOWN
                     return
 
-        self.screen.fill((0, 0, 0))
-        self.screen.blit(self.bg_image, (shake_offset[0], shake_offset[1]))
-
-        keys = pygame.key.get_pressed()
+        if self.game_state == GameState.COUNTDOWN:
+            # Les animations se chargent pendant le décompte ; Entrée ou A le passe
+            self.load_assets(LOADING_BUDGET)
+            elapsed = time.time() - self.state_started
+            if elapsed >= COUNTDOWN_SECONDS or MENU_SELECT in menu_actions:
+                self.start_match()
+            else:
+                self.draw_countdown(COUNTDOWN_SECONDS - int(elapsed))
+                self.clock.tick(FPS)
+            return
 
         if self.game_state == GameState.PAUSED:
-            for fighter in self.fighters:
-                fighter.draw(self.screen)
+            self.render()
             self.draw_pause_menu()
-            self.handle_menu_input(keys, events)
+            self.handle_menu_input(menu_actions)
+            self.clock.tick(FPS)
             return
 
         if self.game_state == GameState.VICTORY:
-            for fighter in self.fighters:
-                fighter.draw(self.screen)
-            self.draw_victory_screen()
-            if keys[pygame.K_RETURN]:
-                pygame.quit()
-                sys.exit()
+            fade = min(1.0, (time.time() - self.state_started) / VICTORY_FADE_SECONDS)
+            if MENU_SELECT in menu_actions:
+                if fade >= 1.0:
+                    pygame.quit()
+                    sys.exit()
+                # Premier appui pendant le fondu : affichage complet immédiat
+                self.state_started -= VICTORY_FADE_SECONDS
+                fade = 1.0
+            self.render()
+            self.draw_victory_screen(fade)
+            self.clock.tick(FPS)
             return
 
         if self.game_state == GameState.OPTIONS:
+            self.render()
             self.show_options_menu()
-            self.handle_menu_input(keys, events)
-            return
-
-        remaining_time = self.draw_timer()
-        if remaining_time <= 0:
-            health_percent_1 = self.fighters[0].health / self.fighters[0].max_health
-            health_percent_2 = self.fighters[1].health / self.fighters[1].max_health
-            self.winner = 1 if health_percent_1 >= health_percent_2 else 2
-            self.game_state = GameState.VICTORY
-            if self.sounds_loaded:
-                self.victory_sound.play()
+            self.handle_menu_input(menu_actions)
+            self.clock.tick(FPS)
             return
 
-        for fighter in self.fighters:
-            fighter.update_physics()
-            fighter.recover_stamina()
-            fighter.draw(self.screen)
-
-        for i, fighter in enumerate(self.fighters):
-            if i < len(self.controllers):
-                self.handle_input(fighter, self.controllers[i], None, current_time)
-
-            self.handle_input(fighter, None, keys, current_time)
-
-            # Appliquer les effets spéciaux actifs
-            fighter.update_effects()
-
-        if self.fighters[0].hitbox.colliderect(self.fighters[1].hitbox):
-            if self.fighters[0].attacking and not self.fighters[1].stunned:
-                if self.fighters[0].special_attack():
-                    # Adjust the opponent's hitbox to be a square before applying the special attack damage
-                    opponent = self.fighters[1]
-                    side_length = min(opponent.rect.width, opponent.rect.height)
-                    opponent.hitbox = pygame.Rect(
-                        opponent.rect.centerx - side_length // 2,
-                        opponent.rect.centery - side_length // 2,
-                        side_length,
-                        side_length
-                    )
-                    opponent.take_damage(self.fighters[0].damage * SPECIAL_ATTACK_MULTIPLIER, time.time(), is_special=True)
-                else:
-                    self.fighters[1].take_damage(self.fighters[0].damage, time.time())
-                if self.sounds_loaded:
-                    self.hit_sound.play()
+        # Un mot d'entrée par joueur et par frame : le même format sert aux replays et au réseau
+        words = self.input.sample()
 
-            if self.fighters[1].attacking and not self.fighters[0].stunned:
-                if self.fighters[1].special_attack():
-                    if not self.fighters[0].blocking:
-                        # Adjust the opponent's hitbox to be a square before applying the special attack damage
-                        opponent = self.fighters[0]
-                        side_length = min(opponent.rect.width, opponent.rect.height)
-                    self.fighters[0].take_damage(self.fighters[1].damage * SPECIAL_ATTACK_MULTIPLIER, time.time(), is_special=True)
-                else:
-                    if not self.fighters[0].blocking:
-                        self.fighters[0].take_damage(self.fighters[1].damage, time.time())
-                if self.sounds_loaded:
-                    self.hit_sound.play()
-
-        for i, fighter in enumerate(self.fighters):
-            if fighter.health <= 0:
-                self.winner = 2 if i == 0 else 1
-                self.game_state = GameState.VICTORY
-                if self.sounds_loaded:
-                    self.victory_sound.play()
-                return
+        if not self.step(words):
+            return
 
+        self.render()
         pygame.display.flip()
-        self.clock.tick(60)
+        self.clock.tick(FPS)
 
     def run(self):
-        if self.game_state == GameState.COUNTDOWN:
-            for i in range(3, 0, -1):
-                self.draw_countdown(i)
-            # Do not scale fighter graphics so that background and hitbox sizes remain correct.
-            self.game_state = GameState.PLAYING
-            self.game_start_time = time.time()
-
         while True:
             self.update()
 
@@ -11,13 +11,16 @@ import threading
 from enum import Enum
 import math
 
-# Configuration des logs
-logging.basicConfig(filename='multiplayer.log', level=logging.DEBUG,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
-
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from config.fighters import Mitsu, Tank, Noya, ThunderStrike, Bruiser
+from managers.structured_logging import setup_logging
+from managers.text_cache import text_cache
+from managers.bundle import asset_exists, open_asset
+from managers.audio_manager import audio
+
+# Configuration des logs : écriture en arrière-plan, les messages répétés à chaque frame sont limités
+setup_logging('multiplayer.log', level=logging.INFO, console=False)
 
 # Constants
 BASE_WIDTH, BASE_HEIGHT = 175, 112
@@ -56,12 +59,12 @@ class GameState(Enum):
 image_cache = {}
 
 def load_image(path):
-    if not os.path.exists(path):
+    if not asset_exists(path):
         logging.error(f"Image file not found: {path}")
         return None
     if path not in image_cache:
         try:
-            image = pygame.image.load(path).convert_alpha()
+            image = pygame.image.load(open_asset(path)).convert_alpha()
             image_cache[path] = image
             logging.info(f"Image loaded successfully: {path}")
         except Exception as e:
@@ -116,16 +119,9 @@ class Fighter:
         self.animation_speed = 0.15
         self.animation_time = 0
         
-        # Sons
-        try:
-            self.attack_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "attack.wav"))
-            self.jump_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "jump.wav"))
-            self.hit_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "hit.wav"))
-            self.special_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "special.wav"))
-            self.sounds_loaded = True
-        except Exception as e:
-            logging.error(f"Failed to load fighter sounds: {e}")
-            self.sounds_loaded = False
+        # Sons : banque partagée, décodée une seule fois pour tous les combattants
+        self.sounds_loaded = audio.init()
+        audio.preload(("attack", "jump", "hit", "special"))
     
     def _load_animation(self, animation_name, frames):
         animation_frames = []
@@ -251,7 +247,7 @@ class Fighter:
             self.vel_y = -self.fighter_type.jump_power
             self.jumping = True
             if self.sounds_loaded:
-                self.jump_sound.play()
+                audio.play("jump")
     
     def attack(self):
         if not self.attacking and not self.jumping and self.stun_time <= 0 and not self.blocking and self.attack_cooldown <= 0:
@@ -260,7 +256,7 @@ class Fighter:
             self.animation_frame = 0
             self.animation_time = 0
             if self.sounds_loaded:
-                self.attack_sound.play()
+                audio.play("attack")
     
     def special_attack(self):
         if not self.attacking and self.stun_time <= 0 and not self.blocking and self.special_cooldown <= 0 and self.stamina >= 30:
@@ -271,7 +267,7 @@ class Fighter:
             self.stamina -= 30
             self.special_cooldown = 2.0
             if self.sounds_loaded:
-                self.special_sound.play()
+                audio.play("special")
     
     def block(self, is_blocking):
         if self.stun_time <= 0 and not self.attacking and not self.jumping:
@@ -296,7 +292,7 @@ class Fighter:
             
             self.hit_cooldown = 0.5
             if self.sounds_loaded:
-                self.hit_sound.play()
+                audio.play("hit")
     
     def check_hit(self, opponent):
         # Créer un rectangle pour la zone d'attaque
@@ -351,7 +347,6 @@ class MultiplayerGame:
         self.mp_manager = MultiplayerManager()
         self.connected = False
         self.opponent_fighter = None
-        self.host_uuid = None
         self.status_message = ""
         pygame.init()
         pygame.joystick.init()
@@ -389,7 +384,7 @@ class MultiplayerGame:
         
         try:
             bg_path = os.path.join("src", "assets", "backgrounds", self.bg_selected)
-            self.bg_image = pygame.image.load(bg_path).convert_alpha()
+            self.bg_image = pygame.image.load(open_asset(bg_path)).convert_alpha()
             self.bg_image = pygame.transform.scale(self.bg_image, (VISIBLE_WIDTH, VISIBLE_HEIGHT))
             logging.info(f"Background image loaded successfully: {bg_path}")
         except Exception as e:
@@ -438,7 +433,7 @@ class MultiplayerGame:
         self.start_time = time.time()
         self.game_start_time = None
         self.round_time = 99
-        self.font = pygame.font.Font(None, 36)
+        self.font = text_cache.font(36)
         self.winner = None
         
         # Interface
@@ -446,81 +441,41 @@ class MultiplayerGame:
         self.selected_option = 0
         
         # Sons
-        try:
-            pygame.mixer.init()
-            self.hit_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "hit.wav"))
-            self.victory_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "victory.wav"))
-            self.menu_sound = pygame.mixer.Sound(os.path.join("src", "assets", "sounds", "menu.wav"))
-            self.sounds_loaded = True
-            logging.info("Sounds loaded successfully")
-        except Exception as e:
-            logging.error(f"Failed to load sound effects: {e}")
-            self.sounds_loaded = False
-            self.hit_sound = None
-            self.victory_sound = None
-            self.menu_sound = None
+        self.sounds_loaded = audio.init()
+        audio.preload(("hit", "victory", "menu"))
         
         # Se connecter au serveur
         self._connect_to_server()
     
     def _connect_to_server(self):
-        """Établit la connexion avec le serveur."""
+        """Crée ou rejoint la salle via le MultiplayerManager, qui garde l'identifiant du joueur dans la salle."""
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(5)
-                s.connect((SERVER_HOST, SERVER_PORT))
-                
-                # Créer ou rejoindre une salle
-                if self.is_host:
-                    created_room = self.mp_manager.create_room(self.player_name, self.fighter_type)
-                    if created_room:
-                        self.room_id = created_room
-                        self.connected = True
-                        self.status_message = f"Salle créée avec succès. ID: {self.room_id}"
-                    else:
-                        self.status_message = "Erreur lors de la création de la salle."
+            # Créer ou rejoindre une salle
+            if self.is_host:
+                created_room = self.mp_manager.create_room(self.player_name, self.fighter_type)
+                if created_room:
+                    self.room_id = created_room
+                    self.connected = True
+                    self.status_message = f"Salle créée avec succès. ID: {self.room_id}"
+                    logging.info(f"Room created with ID: {self.room_id}")
                 else:
-                    joined = self.mp_manager.join_room(self.room_id, self.player_name, self.fighter_type)
-                    if joined:
-                        self.connected = True
-                        self.status_message = f"Connecté à la salle {self.room_id}"
-                    else:
-                        self.status_message = "Salle non trouvée ou erreur de connexion."
-                
-                data = {
-                    "action": "JOIN_ROOM",
-                    "room_id": self.room_id,
-                    "client_id": self.client_id,
-                    "player_name": self.player_name,
-                    "fighter_type": self.fighter_type,
-                    "player_uuid": self.client_id  # Utiliser le même UUID pour l'identification
-                }
-                
-                s.sendall(json.dumps(data).encode('utf-8'))
-                response = s.recv(1024).decode('utf-8')
-                
-                try:
-                    response_data = json.loads(response)
-                    if response_data.get("status") == "success":
-                        self.server_connected = True
-                        
-                        if self.is_host:
-                            self.room_id = response_data.get("room_id")
-                            logging.info(f"Room created with ID: {self.room_id}")
-                        else:
-                            # Mettre à jour le type de combattant de l'adversaire
-                            opponent_fighter = response_data.get("host_fighter_type", "Tank")
-                            host_uuid = response_data.get("host_uuid")
-                            self._update_opponent_fighter(opponent_fighter)
-                            logging.info(f"Joined room {self.room_id} with opponent fighter: {opponent_fighter} (UUID: {host_uuid})")
-                        
-                        # Indiquer que le joueur est prêt
-                        self._set_ready(True)
-                    else:
-                        error_msg = response_data.get("message", "Unknown error")
-                        logging.error(f"Failed to connect to server: {error_msg}")
-                except json.JSONDecodeError:
-                    logging.error(f"Invalid server response: {response}")
+                    self.status_message = "Erreur lors de la création de la salle."
+            else:
+                joined = self.mp_manager.join_room(self.room_id, self.player_name, self.fighter_type)
+                if joined:
+                    self.connected = True
+                    self.status_message = f"Connecté à la salle {self.room_id}"
+                    # Mettre à jour le type de combattant de l'adversaire
+                    opponent_fighter = self.mp_manager.match_data["player1_type"]
+                    self._update_opponent_fighter(opponent_fighter)
+                    logging.info(f"Joined room {self.room_id} with opponent fighter: {opponent_fighter}")
+                else:
+                    self.status_message = "Salle non trouvée ou erreur de connexion."
+            
+            if self.connected:
+                self.server_connected = True
+                # Indiquer que le joueur est prêt
+                self._set_ready(True)
         except Exception as e:
             logging.error(f"Connection error: {e}")
     
@@ -667,10 +622,10 @@ class MultiplayerGame:
                         opponent_state = response_data.get("opponent_state")
                         if opponent_state:
                             self.opponent_connected = True
-                            logging.info(f"État de l'adversaire reçu: {opponent_state.get('health', 'N/A')} PV")
+                            logging.debug(f"État de l'adversaire reçu: {opponent_state.get('health', 'N/A')} PV")
                             return opponent_state
                         else:
-                            logging.info("Aucun état d'adversaire disponible")
+                            logging.debug("Aucun état d'adversaire disponible")
                     else:
                         error_msg = response_data.get("message", "Erreur inconnue")
                         logging.error(f"Échec de récupération de l'état de l'adversaire: {error_msg}")
@@ -730,7 +685,7 @@ class MultiplayerGame:
                 # Vérifier si l'adversaire est prêt
                 if self.game_state == GameState.WAITING:
                     opponent_ready = self._check_opponent_ready()
-                    logging.info(f"Vérification si l'adversaire est prêt: {opponent_ready}")
+                    logging.debug(f"Vérification si l'adversaire est prêt: {opponent_ready}")
                     if opponent_ready:
                         self.game_state = GameState.COUNTDOWN
                         self.start_time = time.time()
@@ -772,6 +727,7 @@ class MultiplayerGame:
                 data = {
                     "action": "SET_READY",
                     "room_id": self.room_id,
+                    "player_id": self.mp_manager.player_id,  # Identifiant du joueur dans la salle
                     "client_id": self.client_id,
                     "player_uuid": self.client_id,  # Ajouter l'UUID pour cohérence
                     "ready": ready
@@ -810,6 +766,7 @@ class MultiplayerGame:
                 data = {
                     "action": "CHECK_OPPONENT_READY",
                     "room_id": self.room_id,
+                    "player_id": self.mp_manager.player_id,
                     "client_id": self.client_id
                 }
                 
@@ -839,7 +796,7 @@ class MultiplayerGame:
                 # Vérifier si l'adversaire est connecté
                 if self.server_connected and not self.opponent_connected:
                     opponent_ready = self._check_opponent_ready()
-                    logging.info(f"Vérification si l'adversaire est prêt: {opponent_ready}")
+                    logging.debug(f"Vérification si l'adversaire est prêt: {opponent_ready}")
                     if opponent_ready:
                         self.opponent_connected = True
                         self.game_state = GameState.COUNTDOWN
@@ -1058,13 +1015,13 @@ class MultiplayerGame:
                     self.game_state = GameState.DEFEAT
                     self.winner = self.remote_fighter
                     if self.sounds_loaded:
-                        self.victory_sound.play()
+                        audio.play("victory")
                 
                 elif self.remote_fighter.health <= 0:
                     self.game_state = GameState.VICTORY
                     self.winner = self.local_fighter
                     if self.sounds_loaded:
-                        self.victory_sound.play()
+                        audio.play("victory")
                 
                 # Mettre à jour le temps restant
                 if self.game_start_time:
@@ -1085,7 +1042,10 @@ class MultiplayerGame:
                             self.winner = self.local_fighter
                         
                         if self.sounds_loaded:
-                            self.victory_sound.play()
+                            audio.play("victory")
+                
+                if self.game_state in (GameState.VICTORY, GameState.DEFEAT):
+                    self._report_result(current_time - (self.game_start_time or current_time))
             
             elif self.game_state == GameState.PAUSED:
                 # Menu pause
@@ -1095,13 +1055,13 @@ class MultiplayerGame:
                     self.selected_option = (self.selected_option - 1) % len(self.menu_options)
                     self.button_pressed = True
                     if self.sounds_loaded:
-                        self.menu_sound.play()
+                        audio.play("menu")
                 
                 elif keys[pygame.K_DOWN] and not self.button_pressed:
                     self.selected_option = (self.selected_option + 1) % len(self.menu_options)
                     self.button_pressed = True
                     if self.sounds_loaded:
-                        self.menu_sound.play()
+                        audio.play("menu")
                 
                 elif keys[pygame.K_RETURN] and not self.button_pressed:
                     self.button_pressed = True
@@ -1119,8 +1079,8 @@ class MultiplayerGame:
             
             if self.game_state == GameState.WAITING:
                 # Afficher un message d'attente
-                waiting_text = self.font.render("En attente d'un adversaire...", True, (255, 255, 255))
-                room_text = self.font.render(f"ID de salle: {self.room_id}", True, (255, 255, 255))
+                waiting_text = text_cache.render("En attente d'un adversaire...", 36, (255, 255, 255))
+                room_text = text_cache.render(f"ID de salle: {self.room_id}", 36, (255, 255, 255))
                 
                 self.screen.blit(waiting_text, (VISIBLE_WIDTH // 2 - waiting_text.get_width() // 2, VISIBLE_HEIGHT // 2))
                 self.screen.blit(room_text, (VISIBLE_WIDTH // 2 - room_text.get_width() // 2, VISIBLE_HEIGHT // 2 + 40))
@@ -1130,7 +1090,7 @@ class MultiplayerGame:
                 elapsed = current_time - self.start_time
                 count = 3 - int(elapsed)
                 
-                count_text = self.font.render(str(count), True, (255, 255, 255))
+                count_text = text_cache.render(str(count), 36, (255, 255, 255))
                 self.screen.blit(count_text, (VISIBLE_WIDTH // 2 - count_text.get_width() // 2, VISIBLE_HEIGHT // 2))
                 
                 # Dessiner les combattants
@@ -1146,12 +1106,11 @@ class MultiplayerGame:
                 if self.game_start_time:
                     elapsed = current_time - self.game_start_time
                     remaining = max(0, self.round_time - int(elapsed))
-                    time_text = self.font.render(f"{remaining}", True, (255, 255, 255))
+                    time_text = text_cache.render(f"{remaining}", 36, (255, 255, 255))
                     self.screen.blit(time_text, (VISIBLE_WIDTH // 2 - time_text.get_width() // 2, 20))
                 
                 # Afficher le ping
-                ping_text = self.font.render(f"Ping: {self.ping} ms", True, (200, 200, 200))
-                self.screen.blit(ping_text, (10, 10))
+                text_cache.blit_dynamic(self.screen, f"Ping: {self.ping} ms", (10, 10), 36, (200, 200, 200))
                 
                 # Menu pause
                 if self.game_state == GameState.PAUSED:
@@ -1161,13 +1120,13 @@ class MultiplayerGame:
                     self.screen.blit(overlay, (0, 0))
                     
                     # Titre
-                    pause_text = self.font.render("PAUSE", True, (255, 255, 255))
+                    pause_text = text_cache.render("PAUSE", 36, (255, 255, 255))
                     self.screen.blit(pause_text, (VISIBLE_WIDTH // 2 - pause_text.get_width() // 2, VISIBLE_HEIGHT // 3))
                     
                     # Options
                     for i, option in enumerate(self.menu_options):
                         color = (255, 255, 0) if i == self.selected_option else (255, 255, 255)
-                        option_text = self.font.render(option, True, color)
+                        option_text = text_cache.render(option, 36, color)
                         self.screen.blit(option_text, (VISIBLE_WIDTH // 2 - option_text.get_width() // 2, VISIBLE_HEIGHT // 2 + i * 40))
                 
                 # Écran de victoire/défaite
@@ -1178,11 +1137,11 @@ class MultiplayerGame:
                     self.screen.blit(overlay, (0, 0))
                     
                     # Message
-                    result_text = self.font.render("VICTOIRE !" if self.game_state == GameState.VICTORY else "DÉFAITE...", True, (255, 255, 0) if self.game_state == GameState.VICTORY else (255, 0, 0))
+                    result_text = text_cache.render("VICTOIRE !" if self.game_state == GameState.VICTORY else "DÉFAITE...", 36, (255, 255, 0) if self.game_state == GameState.VICTORY else (255, 0, 0))
                     self.screen.blit(result_text, (VISIBLE_WIDTH // 2 - result_text.get_width() // 2, VISIBLE_HEIGHT // 3))
                     
                     # Instructions
-                    instr_text = self.font.render("Appuyez sur ÉCHAP pour quitter", True, (255, 255, 255))
+                    instr_text = text_cache.render("Appuyez sur ÉCHAP pour quitter", 36, (255, 255, 255))
                     self.screen.blit(instr_text, (VISIBLE_WIDTH // 2 - instr_text.get_width() // 2, VISIBLE_HEIGHT * 2 // 3))
             
             pygame.display.flip()
@@ -1192,6 +1151,13 @@ class MultiplayerGame:
         self._leave_room()
         pygame.quit()
     
+    def _report_result(self, duration):
+        """Déclare le résultat au serveur (pour le classement) sans bloquer l'affichage de fin de match."""
+        won = self.game_state == GameState.VICTORY
+        # Thread non démon : la déclaration aboutit même si le joueur quitte aussitôt
+        threading.Thread(target=self.mp_manager.report_result, args=(won, duration),
+                         name="report-result").start()
+    
     def _leave_room(self):
         """Quitte la salle de jeu."""
         try:
@@ -1,101 +1,87 @@
-# Importe toutes les librairies nécessaires
-import customtkinter as ctk
-from PIL import Image
-from tkinter import messagebox
-from dotenv import load_dotenv
 import os
 import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# En premier : l'origine des mesures de démarrage (option --startup-report)
+from managers.startup_report import startup
+
+# Seul ce qui est nécessaire au premier affichage est importé ici. pygame (manettes, jeu en
+# multijoueur), dotenv et le dessin du fond sont chargés après l'apparition de la fenêtre
+import customtkinter as ctk
+from tkinter import messagebox
 import subprocess
-import pygame
 import time
 import random
 import math
 from datetime import datetime
-# Add import for CharacterSelect
-from selector import CharacterSelect
-
-class ControllerManager:
-    """Gère les entrées des manettes."""
-
-    def __init__(self):
-        load_dotenv()  # Charge les variables d'environnement depuis le fichier .env
-        self.input_mode = os.getenv('INPUT_MODE', 'keyboard')  # Lit le mode d'entrée depuis le fichier .env
-        pygame.init()
-        pygame.joystick.init()
-        self.joysticks = [pygame.joystick.Joystick(x) for x in range(pygame.joystick.get_count())]
-        print(f"Nombre de manettes détectées : {len(self.joysticks)}")
-        for joystick in self.joysticks:
-            print(f"Manette {joystick.get_instance_id()} : {joystick.get_name()}")
-        self.primary_joystick = self.joysticks[0] if self.joysticks else None
-
-    def get_input(self):
-        pygame.event.pump()
-        return [([joystick.get_button(i) for i in range(joystick.get_numbuttons())],
-                 [joystick.get_axis(i) for i in range(joystick.get_numaxes())]) for joystick in self.joysticks]
-
-    def get_primary_input(self):
-        if self.primary_joystick:
-            pygame.event.pump()
-            return [self.primary_joystick.get_button(i) for i in range(self.primary_joystick.get_numbuttons())], \
-                   [self.primary_joystick.get_axis(i) for i in range(self.primary_joystick.get_numaxes())]
-        return [], []
-
-class ParticleSystem:
-    """Système de particules pour effets visuels."""
-
-    def __init__(self, canvas: ctk.CTkCanvas, x: int, y: int, color: str, count: int = 20, lifetime: float = 1.0):
-        self.canvas = canvas
-        self.particles = []
-        self.active = True
 
-        for _ in range(count):
-            vx = random.uniform(-3, 3)
-            vy = random.uniform(-3, 3)
-            size = random.randint(2, 6)
-            fade_rate = random.uniform(0.01, 0.05)
-            alpha = 1.0
-
-            particle = {
-                'id': canvas.create_oval(x - size, y - size, x + size, y + size, fill=color, outline=""),
-                'x': x, 'y': y, 'vx': vx, 'vy': vy,
-                'size': size, 'alpha': alpha, 'fade_rate': fade_rate,
-                'lifetime': random.uniform(0.5, lifetime)
-            }
-            self.particles.append(particle)
-
-    def update(self) -> bool:
-        """Met à jour les particules et retourne True si le système est encore actif."""
-        if not self.active:
-            return False
-
-        active_particles = False
-        for p in self.particles:
-            p['lifetime'] -= 0.02
-            if p['lifetime'] <= 0:
-                self.canvas.delete(p['id'])
-                continue
+from managers.bundle import entry_command, open_asset
+from managers.controller_service import NAV_UP, NAV_DOWN, NAV_LEFT, NAV_RIGHT, BUTTON_CONFIRM, BUTTON_START
 
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            p['vy'] += 0.1  # Gravité
-            p['alpha'] -= p['fade_rate']
+startup.mark("imports")
 
-            if p['alpha'] <= 0:
-                self.canvas.delete(p['id'])
-                continue
+ANIMATION_INTERVAL = 50  # ms entre deux images d'animation
+ANIMATION_IDLE_INTERVAL = 500  # ms quand le launcher n'a pas le focus : animations suspendues
+TITLE_PULSE = 0.03  # Amplitude de la pulsation du titre
 
-            active_particles = True
+PARTICLE_POOL_SIZE = 64
+PARTICLE_COLOR_LEVELS = 16  # Nuances de l'estompage : la couleur n'est reconfigurée qu'au changement de nuance
 
-            # Mettre à jour la position et l'opacité
-            alpha_hex = int(min(255, p['alpha'] * 255))
-            color = f"#{alpha_hex:02x}0000"  # Rouge avec alpha
-            self.canvas.itemconfig(p['id'], fill=color)
-            self.canvas.coords(p['id'],
-                               p['x'] - p['size'], p['y'] - p['size'],
-                               p['x'] + p['size'], p['y'] + p['size'])
+class ParticlePool:
+    """Particules pour effets visuels, sur un nombre fixe d'éléments de canvas réutilisés.
+
+    Les ovales sont créés une fois, cachés quand ils sont libres : une émission ne crée rien et
+    une particule éteinte ne supprime rien. Au-delà de `capacity` particules vivantes, les
+    nouvelles sont ignorées.
+    """
+
+    def __init__(self, canvas: ctk.CTkCanvas, capacity: int = PARTICLE_POOL_SIZE):
+        self.canvas = canvas
+        # Appels Tcl directs : évite la conversion des arguments de coords/itemconfig à chaque particule
+        self._call = canvas.tk.call
+        self._path = str(canvas)
+        self.items = [canvas.create_oval(0, 0, 0, 0, outline="", state="hidden") for _ in range(capacity)]
+        self.free = list(range(capacity))
+        # Par emplacement actif : [x, y, vx, vy, taille, alpha, vitesse d'estompage, durée de vie, nuance]
+        self.active = {}
+
+    def emit(self, x: int, y: int, color: str, count: int = 20, lifetime: float = 1.0) -> None:
+        for _ in range(min(count, len(self.free))):
+            slot = self.free.pop()
+            size = random.randint(2, 6)
+            self.active[slot] = [x, y, random.uniform(-3, 3), random.uniform(-3, 3), size, 1.0,
+                                 random.uniform(0.01, 0.05), random.uniform(0.5, lifetime), None]
+            self._call(self._path, "coords", self.items[slot], x - size, y - size, x + size, y + size)
+            self._call(self._path, "itemconfigure", self.items[slot], "-fill", color, "-state", "normal")
+
+    def alive(self) -> bool:
+        return bool(self.canvas.winfo_exists())
+
+    def update(self) -> int:
+        """Avance toutes les particules d'un pas ; retourne le nombre de particules vivantes."""
+        call, path, items = self._call, self._path, self.items
+        for slot, p in list(self.active.items()):
+            p[7] -= 0.02
+            p[0] += p[2]
+            p[1] += p[3]
+            p[3] += 0.1  # Gravité
+            p[5] -= p[6]
+            if p[7] <= 0 or p[5] <= 0:
+                call(path, "itemconfigure", items[slot], "-state", "hidden")
+                del self.active[slot]
+                self.free.append(slot)
+                continue
 
-        self.active = active_particles
-        return active_particles
+            # Mettre à jour la position et l'opacité
+            level = int(p[5] * PARTICLE_COLOR_LEVELS)
+            if level != p[8]:
+                p[8] = level
+                alpha_hex = min(255, level * 256 // PARTICLE_COLOR_LEVELS)
+                call(path, "itemconfigure", items[slot], "-fill", f"#{alpha_hex:02x}0000")  # Rouge avec alpha
+            size = p[4]
+            call(path, "coords", items[slot], p[0] - size, p[1] - size, p[0] + size, p[1] + size)
+        return len(self.active)
 
 class LauncherPythFighter:
     """Launcher principal pour le jeu PythFighter avec une interface graphique améliorée."""
@@ -125,27 +111,48 @@ class LauncherPythFighter:
         'version': ("Consolas", 12)
     }
 
-    NAV_COOLDOWN = 0.2
-
     def __init__(self) -> None:
         """Initialise le launcher avec une configuration de base."""
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("dark-blue")
 
         self.root = ctk.CTk()
-        self.controller_manager = ControllerManager()
-        self.last_nav_time = time.time()
-        self.button_pressed = False
-        self.particles = []
-        self.input_mode = os.getenv('INPUT_MODE', 'keyboard')
+        self.controller = None  # Créé après le premier affichage (finish_startup)
+        self.controller_handlers = []  # (fenêtre, fonction) : la plus récente reçoit les actions
+        self.root.bind("<<ControllerInput>>", self._dispatch_controller)
+        self.tutorial_particles = None
+        self.input_mode = 'keyboard'
         self.setup_window()
         self.create_canvas()
-        self.load_background()
         self.create_interface()
+        self.particles = ParticlePool(self.canvas)
         self.bind_controller()
+        startup.mark("interface créée")
 
         # Lancer la boucle d'animation
         self.animate()
+        self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self) -> None:
+        """Chargements différés, une fois la fenêtre affichée."""
+        self.root.update_idletasks()
+        startup.mark("premier affichage", first_paint=True)
+
+        self.load_background()
+        startup.mark("arrière-plan")
+
+        dotenv = startup.import_module("dotenv")
+        dotenv.load_dotenv()  # Charge les variables d'environnement depuis le fichier .env
+        self.input_mode = os.getenv('INPUT_MODE', 'keyboard')
+
+        # Les manettes sont lues par un thread bloqué sur les événements SDL : il réveille la
+        # boucle Tk avec un événement virtuel quand une action arrive (voir _dispatch_controller).
+        # pygame est importé par ce thread : l'interface reste réactive pendant son chargement
+        controller_service = startup.import_module("managers.controller_service")
+        self.controller = controller_service.ControllerService(notify=self._notify_controller)
+        self.controller.start()
+        startup.mark("manettes")
+        startup.report()
 
     def setup_window(self) -> None:
         """Configure la fenêtre principale."""
@@ -164,24 +171,42 @@ class LauncherPythFighter:
         self.height = self.root.winfo_screenheight()
 
     def load_background(self) -> None:
-        """Charge ou crée l'arrière-plan."""
+        """Affiche l'arrière-plan : une seule image rendue avec PIL, au lieu de centaines d'éléments de canvas.
+
+        Appelé après le premier affichage : l'image est placée sous les éléments déjà présents.
+        """
+        from PIL import ImageTk
+
+        image = self.render_background(self.width, self.height)
+
+        # Garder une référence : Tk n'affiche plus l'image si l'objet PhotoImage est libéré
+        self.background_image = ImageTk.PhotoImage(image)
+        item = self.canvas.create_image(0, 0, image=self.background_image, anchor="nw")
+        self.canvas.tag_lower(item)
+
+    def render_background(self, width: int, height: int) -> "Image.Image":
+        """Dessine le fond (dégradé, grille, halo) avec PIL."""
+        from PIL import Image, ImageDraw
+
+        image = Image.new("RGB", (width, height), self.COLORS['background'])
+        draw = ImageDraw.Draw(image)
+
         # Créer un fond avec un effet de grille
         grid_spacing = 50
         grid_color = "#223366"
 
         # Dessiner un dégradé de fond
-        for y in range(0, self.height, 4):
+        for y in range(0, height, 4):
             # Créer un dégradé du haut vers le bas
-            darkness = int(40 + (y / self.height) * 20)
-            color = f"#{darkness:02x}{darkness:02x}{darkness + 20:02x}"
-            self.canvas.create_line(0, y, self.width, y, fill=color)
+            darkness = int(40 + (y / height) * 20)
+            draw.line([(0, y), (width, y)], fill=(darkness, darkness, darkness + 20))
 
         # Créer l'effet de grille
-        for x in range(0, self.width + grid_spacing, grid_spacing):
-            self.canvas.create_line(x, 0, x, self.height, fill=grid_color, width=1)
+        for x in range(0, width + grid_spacing, grid_spacing):
+            draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
 
-        for y in range(0, self.height + grid_spacing, grid_spacing):
-            self.canvas.create_line(0, y, self.width, y, fill=grid_color, width=1)
+        for y in range(0, height + grid_spacing, grid_spacing):
+            draw.line([(0, y), (width, y)], fill=grid_color, width=1)
 
         # Ajouter un effet de lumière au centre
         radial_colors = [
@@ -190,13 +215,11 @@ class LauncherPythFighter:
             (600, "#0D0D1A"),
         ]
 
-        center_x, center_y = self.width // 2, self.height // 3
+        center_x, center_y = width // 2, height // 3
         for radius, color in radial_colors:
-            self.canvas.create_oval(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                fill=color, outline=""
-            )
+            draw.ellipse([center_x - radius, center_y - radius, center_x + radius, center_y + radius], fill=color)
+
+        return image
 
     def create_interface(self) -> None:
         """Crée l'interface utilisateur principale."""
@@ -216,13 +239,20 @@ class LauncherPythFighter:
                 font=self.FONTS['title'],
                 fill=self.COLORS['shadow']
             )
-        self.title_text = self.canvas.create_text(
-            screen_width // 2,
-            150,
-            text="PYTH FIGHTER",
-            font=self.FONTS['title'],
-            fill=self.COLORS['primary']
-        )
+        # Un texte par taille de la pulsation, créés une fois : l'animation affiche celui de la taille
+        # courante au lieu de changer la police (nouvelle police et nouvelle mise en page à chaque image)
+        name, base_size, weight = self.FONTS['title']
+        self.title_items = {}
+        for size in range(int(base_size * (1 - TITLE_PULSE)), int(base_size * (1 + TITLE_PULSE)) + 1):
+            self.title_items[size] = self.canvas.create_text(
+                screen_width // 2,
+                150,
+                text="PYTH FIGHTER",
+                font=(name, size, weight),
+                fill=self.COLORS['primary'],
+                state="normal" if size == base_size else "hidden"
+            )
+        self.title_size = base_size
 
     def _create_menu_buttons(self) -> None:
         """Crée les boutons du menu principal avec effets de survol."""
@@ -274,52 +304,63 @@ class LauncherPythFighter:
         """Configure les entrées de la manette."""
         self.selected_index = 0
         self._highlight_button(self.selected_index)
-        self.check_controller()
+        self.push_controller_handler(self.root, self._on_main_menu_action)
+
+    def push_controller_handler(self, window, handler) -> None:
+        """Envoie les actions de la manette à `handler` tant que `window` existe."""
+        self.controller_handlers.append((window, handler))
+
+    def _notify_controller(self) -> None:
+        # Appelé depuis le thread des manettes, pas depuis celui de Tk : avec un Tcl compilé avec
+        # les threads (cas des Python officiels), tkinter transmet l'appel au thread de la boucle
+        # principale, qui traite l'événement. Si l'appel échoue (boucle pas encore lancée), l'erreur
+        # est ignorée par le service et animate() récupère les actions au tick suivant
+        self.root.event_generate("<<ControllerInput>>", when="tail")
+
+    def _dispatch_controller(self, _event=None) -> None:
+        """Transmet les actions en attente au gestionnaire de la fenêtre active."""
+        if self.controller is None:
+            return
+        for entry in self.controller.poll():
+            while self.controller_handlers and not self.controller_handlers[-1][0].winfo_exists():
+                self.controller_handlers.pop()
+            if self.controller_handlers:
+                self.controller_handlers[-1][1](entry.action)
 
     def _highlight_button(self, index: int) -> None:
         """Met en surbrillance le bouton sélectionné."""
         for i, button in enumerate(self.buttons):
             button.configure(fg_color=self.COLORS['hover'] if i == index else self.COLORS['secondary'])
 
-    def check_controller(self) -> None:
-        """Vérifie les entrées de la manette."""
-        if not hasattr(self, 'root') or not self.root.winfo_exists():
-            return
-
-        buttons, axes = self.controller_manager.get_primary_input()
-        current_time = time.time()
-
-        # Navigation verticale
-        if current_time - self.last_nav_time > self.NAV_COOLDOWN:
-            if axes and len(axes) > 1:
-                if axes[1] < -0.5:  # Haut
-                    self.selected_index = (self.selected_index - 1) % len(self.buttons)
-                    self._highlight_button(self.selected_index)
-                    self.last_nav_time = current_time
-                elif axes[1] > 0.5:  # Bas
-                    self.selected_index = (self.selected_index + 1) % len(self.buttons)
-                    self._highlight_button(self.selected_index)
-                    self.last_nav_time = current_time
-
-        # Bouton A/X
-        if buttons and len(buttons) > 0:
-            if buttons[0] and not self.button_pressed:
-                self.button_pressed = True
-                self.buttons[self.selected_index].invoke()
-            elif not buttons[0]:
-                self.button_pressed = False
-
-        # Bouton Start
-        if buttons and len(buttons) > 7 and buttons[7]:
+    def _on_main_menu_action(self, action: str) -> None:
+        """Navigation du menu principal à la manette."""
+        if action == NAV_UP:
+            self.selected_index = (self.selected_index - 1) % len(self.buttons)
+            self._highlight_button(self.selected_index)
+        elif action == NAV_DOWN:
+            self.selected_index = (self.selected_index + 1) % len(self.buttons)
+            self._highlight_button(self.selected_index)
+        elif action == BUTTON_CONFIRM:
+            self.buttons[self.selected_index].invoke()
+        elif action == BUTTON_START:
             self.confirm_quit()
 
-        self.root.after(100, self.check_controller)
+    def run_pygame_game(self, game) -> None:
+        """Lance un jeu pygame dans ce processus : la file d'événements lui est laissée pendant la partie."""
+        self.root.withdraw()  # Cacher la fenêtre principale
+        if self.controller:
+            self.controller.pause()
+        try:
+            game.run()
+        finally:
+            if self.controller:
+                self.controller.resume()
+            self.root.deiconify()  # Réafficher la fenêtre principale après la partie
 
     def launch_game(self) -> None:
         """Lance le jeu principal avec gestion d'erreurs améliorée."""
-        game_path = os.path.join(os.path.dirname(__file__), "selector.py")
         try:
-            subprocess.Popen([sys.executable, game_path])
+            subprocess.Popen(entry_command("select"))
             self.root.quit()
         except Exception as e:
             messagebox.showerror("Erreur de lancement", f"Impossible de lancer le jeu:\n{str(e)}")
@@ -386,8 +427,8 @@ class LauncherPythFighter:
 
     def check_multiplayer_controller(self) -> None:
         """Vérifie si des manettes sont connectées pour le mode multijoueur."""
-        pygame.joystick.init()
-        controller_count = pygame.joystick.get_count()
+        # Le service des manettes suit les branchements : pas besoin d'interroger pygame
+        controller_count = len(self.controller.joysticks) if self.controller else 0
         
         if controller_count == 0:
             messagebox.showinfo("Information", "Aucune manette détectée. Le mode clavier sera utilisé par défaut.")
@@ -516,11 +557,9 @@ class LauncherPythFighter:
             from core.game_multi import MultiplayerGame
             game = MultiplayerGame(player_name=player_name, fighter_type=fighter_type, room_id=room_id)
             join_window.destroy()
-            self.root.withdraw()  # Cacher la fenêtre principale
-            
+
             # Lancer le jeu
-            game.run()
-            self.root.deiconify()  # Réafficher la fenêtre principale après la partie
+            self.run_pygame_game(game)
 
         join_button = ctk.CTkButton(
             join_window,
@@ -627,11 +666,9 @@ class LauncherPythFighter:
             from core.game_multi import MultiplayerGame
             game = MultiplayerGame(player_name=player_name, fighter_type=fighter_type)
             create_window.destroy()
-            self.root.withdraw()  # Cacher la fenêtre principale
-            
+
             # Lancer le jeu
-            game.run()
-            self.root.deiconify()  # Réafficher la fenêtre principale après la partie
+            self.run_pygame_game(game)
 
         create_button = ctk.CTkButton(
             create_window,
@@ -657,10 +694,13 @@ class LauncherPythFighter:
         credits_window.resizable(False, False)
 
         # Image de titre (à remplacer par votre logo)
+        from PIL import Image
+
         try:
+            logo = Image.open(open_asset("assets/images/logo.png"))
             logo_img = ctk.CTkImage(
-                light_image=Image.open("assets/images/logo.png"),
-                dark_image=Image.open("assets/images/logo.png"),
+                light_image=logo,
+                dark_image=logo,
                 size=(200, 100)
             )
             logo_label = ctk.CTkLabel(
@@ -817,19 +857,12 @@ class LauncherPythFighter:
         # Gestion des touches clavier
         credits_window.bind("<Escape>", lambda _: credits_window.destroy())
 
-        # Vérification du contrôleur
-        def check_credits_input():
-            if not credits_window.winfo_exists():
-                return
-
-            buttons, _ = self.controller_manager.get_primary_input()
-            if buttons and len(buttons) > 0 and buttons[0]:
+        # Bouton A de la manette : fermer
+        def on_credits_action(action):
+            if action == BUTTON_CONFIRM:
                 credits_window.destroy()
-                return
-
-            credits_window.after(100, check_credits_input)
 
-        credits_window.after(100, check_credits_input)
+        self.push_controller_handler(credits_window, on_credits_action)
 
     def _get_team_credits(self) -> list:
         """Retourne la liste formatée de l'équipe de développement."""
@@ -889,8 +922,6 @@ class LauncherPythFighter:
 
     def show_options(self) -> None:
         """Affiche le menu des options avec prise en charge de la manette."""
-        self.option_button_pressed = False
-
         options_window = ctk.CTkToplevel(self.root)
         options_window.title("Options")
         options_window.attributes('-topmost', True)
@@ -961,46 +992,24 @@ class LauncherPythFighter:
 
         highlight_option(selected_option)
 
-        def check_options_controller():
+        def on_options_action(action):
             nonlocal selected_option
-            if not options_window.winfo_exists():
-                return
+            if action == NAV_UP:
+                selected_option = max(0, selected_option - 1)
+                highlight_option(selected_option)
+            elif action == NAV_DOWN:
+                selected_option = min(len(option_buttons) - 1, selected_option + 1)
+                highlight_option(selected_option)
+            elif action == BUTTON_CONFIRM:
+                if selected_option == len(option_buttons) - 1:
+                    options_window.destroy()
+                else:
+                    option_buttons[selected_option].invoke()
 
-            buttons, axes = self.controller_manager.get_primary_input()
-            current_time = time.time()
-
-            # Navigation verticale
-            if current_time - self.last_nav_time > self.NAV_COOLDOWN:
-                if axes and len(axes) > 1:
-                    if axes[1] < -0.5:  # Haut
-                        selected_option = max(0, selected_option - 1)
-                        highlight_option(selected_option)
-                        self.last_nav_time = current_time
-                    elif axes[1] > 0.5:  # Bas
-                        selected_option = min(len(option_buttons) - 1, selected_option + 1)
-                        highlight_option(selected_option)
-                        self.last_nav_time = current_time
-
-            # Action par bouton
-            if buttons and len(buttons) > 0:
-                if buttons[0] and not self.option_button_pressed:
-                    self.option_button_pressed = True
-                    if selected_option == len(option_buttons) - 1:
-                        options_window.destroy()
-                        return
-                    else:
-                        option_buttons[selected_option].invoke()
-                elif not buttons[0]:
-                    self.option_button_pressed = False
-
-            options_window.after(100, check_options_controller)
-
-        options_window.after(100, check_options_controller)
+        self.push_controller_handler(options_window, on_options_action)
 
     def confirm_quit(self) -> None:
         """Demande confirmation avant de quitter."""
-        self.quit_button_pressed = False
-
         quit_window = ctk.CTkToplevel(self.root)
         quit_window.title("Confirmation")
         quit_window.attributes('-topmost', True)
@@ -1061,77 +1070,63 @@ class LauncherPythFighter:
 
         highlight_confirmation(selected_button)
 
-        def check_confirmation_controller():
+        def on_confirmation_action(action):
             nonlocal selected_button
-            if not quit_window.winfo_exists():
-                return
+            if action in (NAV_LEFT, NAV_RIGHT):
+                selected_button = 0 if action == NAV_LEFT else 1  # Gauche (Non) / Droite (Oui)
+                highlight_confirmation(selected_button)
+            elif action == BUTTON_CONFIRM:
+                if selected_button == 0:  # Non
+                    quit_window.destroy()
+                else:  # Oui
+                    self.root.quit()
 
-            buttons, axes = self.controller_manager.get_primary_input()
-
-            # Navigation horizontale
-            if axes and len(axes) > 0:
-                if axes[0] < -0.5:  # Gauche (Non)
-                    selected_button = 0
-                    highlight_confirmation(selected_button)
-                elif axes[0] > 0.5:  # Droite (Oui)
-                    selected_button = 1
-                    highlight_confirmation(selected_button)
-
-            # Action par bouton
-            if buttons and len(buttons) > 0:
-                if buttons[0] and not self.quit_button_pressed:
-                    self.quit_button_pressed = True
-                    if selected_button == 0:  # Non
-                        quit_window.destroy()
-                        return
-                    else:  # Oui
-                        self.root.quit()
-                elif not buttons[0]:
-                    self.quit_button_pressed = False
-
-            quit_window.after(100, check_confirmation_controller)
-
-        quit_window.after(100, check_confirmation_controller)
+        self.push_controller_handler(quit_window, on_confirmation_action)
 
     def animate(self) -> None:
-        """Gère l'animation des éléments visuels."""
-        # Animer le titre avec un effet de pulsation
-        scale = 1.0 + 0.03 * math.sin(time.time() * 2)
-        new_font = (self.FONTS['title'][0], int(self.FONTS['title'][1] * scale), self.FONTS['title'][2])
-        self.canvas.itemconfig(self.title_text, font=new_font)
-
-        # Mettre à jour tous les systèmes de particules
-        active_particles = []
-        for particle_system in self.particles:
-            if particle_system.update():
-                active_particles.append(particle_system)
-
-        # Ne garder que les systèmes de particules actifs
-        self.particles = active_particles
-
-        # Ajouter de nouvelles particules aléatoirement
-        if random.random() < 0.05:  # 5% de chance à chaque frame
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height // 2)
-            particle_system = ParticleSystem(
-                self.canvas, x, y, self.COLORS['primary'],
-                count=random.randint(3, 10), lifetime=1.0
-            )
-            self.particles.append(particle_system)
+        """Gère l'animation des éléments visuels (suspendue tant que le launcher n'a pas le focus)."""
+        # Appel Tcl direct : focus_displayof() échoue sur les widgets internes inconnus de tkinter
+        focused = bool(self.root.tk.call("focus", "-displayof", self.root._w))
+        if focused:
+            # Animer le titre avec un effet de pulsation
+            scale = 1.0 + TITLE_PULSE * math.sin(time.time() * 2)
+            size = int(self.FONTS['title'][1] * scale)
+            if size != self.title_size and size in self.title_items:
+                self.canvas.itemconfigure(self.title_items[self.title_size], state="hidden")
+                self.canvas.itemconfigure(self.title_items[size], state="normal")
+                self.title_size = size
+
+            # Mettre à jour les particules (celles du tutoriel tant que sa fenêtre est ouverte)
+            self.particles.update()
+            if self.tutorial_particles is not None:
+                if self.tutorial_particles.alive():
+                    self.tutorial_particles.update()
+                else:
+                    self.tutorial_particles = None
+
+            # Ajouter de nouvelles particules aléatoirement
+            if random.random() < 0.05:  # 5% de chance à chaque frame
+                x = random.randint(0, self.width)
+                y = random.randint(0, self.height // 2)
+                self.particles.emit(x, y, self.COLORS['primary'], count=random.randint(3, 10), lifetime=1.0)
+
+        # Actions restées en file si la notification n'a pas pu être transmise (avant mainloop)
+        self._dispatch_controller()
 
         # Continuer l'animation
-        self.root.after(50, self.animate)
+        self.root.after(ANIMATION_INTERVAL if focused else ANIMATION_IDLE_INTERVAL, self.animate)
 
     def _add_tutorial_particles(self, canvas):
         """Adds dynamic particles to the tutorial screen."""
         colors = ["#E94560", "#FFA500", "#44AAFF"]
 
+        if self.tutorial_particles is None or self.tutorial_particles.canvas is not canvas:
+            self.tutorial_particles = ParticlePool(canvas, capacity=45)
         for _ in range(3):
             x = random.randint(0, self.width)
             y = random.randint(0, self.height)
             color = random.choice(colors)
-            particle_system = ParticleSystem(canvas, x, y, color, count=15, lifetime=1.5)
-            self.particles.append(particle_system)
+            self.tutorial_particles.emit(x, y, color, count=15, lifetime=1.5)
 
     def _create_controller_icon(self, canvas, x, y, tags=None):
         """Creates a placeholder controller icon on the canvas."""
@@ -1350,31 +1345,16 @@ class LauncherPythFighter:
         tutorial_window.bind("<Right>", lambda e: next_section())
         tutorial_window.bind("<Escape>", lambda e: tutorial_window.destroy())
 
-        # Vérification de l’entrée du contrôleur (pour compléter si nécessaire)
-        def check_tutorial_controller():
-            if not tutorial_window.winfo_exists():
-                return
-
-            buttons, axes = self.controller_manager.get_primary_input()
-            current_time = time.time()
-
-            if current_time - self.last_nav_time > self.NAV_COOLDOWN:
-                if axes and len(axes) > 0:
-                    if axes[0] < -0.5:  # Gauche
-                        prev_section()
-                        self.last_nav_time = current_time
-                    elif axes[0] > 0.5:  # Droite
-                        next_section()
-                        self.last_nav_time = current_time
-
-            # Si le bouton principal est pressé, quitter (par exemple)
-            if buttons and len(buttons) > 0 and buttons[0]:
+        # Manette : gauche/droite pour changer de section, A pour quitter
+        def on_tutorial_action(action):
+            if action == NAV_LEFT:
+                prev_section()
+            elif action == NAV_RIGHT:
+                next_section()
+            elif action == BUTTON_CONFIRM:
                 tutorial_window.destroy()
-                return
-
-            tutorial_window.after(100, check_tutorial_controller)
 
-        tutorial_window.after(100, check_tutorial_controller)
+        self.push_controller_handler(tutorial_window, on_tutorial_action)
 
     def return_to_main_menu(self) -> None:
         """Retourne au menu principal."""
@@ -1384,6 +1364,8 @@ class LauncherPythFighter:
     def run(self) -> None:
         """Lance le launcher."""
         self.root.mainloop()
+        if self.controller:
+            self.controller.stop()
 
 def main():
     launcher = LauncherPythFighter()
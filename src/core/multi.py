@@ -12,6 +12,12 @@ import uuid
 HOST = os.environ.get('SERVER_HOST', '194.9.172.146')  # Adresse IP du serveur, configurable via variable d'environnement
 PORT = 25568            # Port pour les connexions
 PING_PORT = 25569       # Port pour les pings
+MAX_REDIRECTS = 3       # En mode cluster, nombre maximum de nœuds essayés pour une requête
+MATCHMAKE_POLL_INTERVAL = 1  # Secondes entre deux interrogations de la file de matchmaking
+MAX_BUSY_RETRIES = 2    # Nouvelles tentatives quand le serveur répond "busy" (surcharge)
+MAX_BUSY_WAIT = 2       # Attente maximale (s) avant une nouvelle tentative, quel que soit le retry_after reçu
+PLAYER_ID_FILE = os.path.join("data", "player_id")  # Identifiant persistant du joueur (clé du classement)
+PLAYER_ID_ENV = "PYTHFIGHTER_PLAYER_ID"  # Remplace le fichier, ex: deux clients sur la même machine
 
 # Fonction pour définir l'adresse du serveur
 def set_server_address(host):
@@ -22,6 +28,27 @@ def set_server_address(host):
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def load_player_uuid():
+    """UUID du joueur, créé au premier lancement puis réutilisé : le serveur y rattache son classement."""
+    player_uuid = os.environ.get(PLAYER_ID_ENV)
+    if player_uuid:
+        return player_uuid
+    try:
+        with open(PLAYER_ID_FILE, "r", encoding="utf-8") as f:
+            player_uuid = f.read().strip()
+        if player_uuid:
+            return player_uuid
+    except OSError:
+        pass
+    player_uuid = str(uuid.uuid4())
+    try:
+        os.makedirs(os.path.dirname(PLAYER_ID_FILE), exist_ok=True)
+        with open(PLAYER_ID_FILE, "w", encoding="utf-8") as f:
+            f.write(player_uuid)
+    except OSError as e:
+        logging.warning(f"Identifiant joueur non sauvegardé ({e}), classement limité à cette session")
+    return player_uuid
+
 class MultiplayerManager:
     """Gestionnaire de connexion multijoueur pour PythFighter."""
     
@@ -29,8 +56,7 @@ class MultiplayerManager:
         self.connected = False
         self.room_id = None
         self.player_id = None
-        self.player_uuid = None  # Identifiant unique du joueur
-        self.opponent_uuid = None  # Identifiant unique de l'adversaire
+        self.player_uuid = load_player_uuid()  # Identifiant unique et persistant du joueur
         self.opponent_data = {}
         self.last_ping_time = 0
         self.ping_value = 0
@@ -43,6 +69,54 @@ class MultiplayerManager:
             "player1_type": "Mitsu",
             "player2_type": "Tank"
         }
+        # Nœud du serveur possédant la salle (en mode cluster, différent du serveur d'entrée)
+        self.server_address = (HOST, PORT)
+        self.ping_address = (HOST, PING_PORT)
+    
+    def _use_node(self, node):
+        """Adresse toutes les requêtes suivantes (et les pings) au nœud indiqué par le serveur."""
+        self.server_address = (node["host"], node["port"])
+        self.ping_address = (node["host"], node["ping_port"])
+    
+    def _request(self, data, timeout=2, retry_busy=True):
+        """Envoie une requête au nœud courant et retourne la réponse décodée.
+        
+        Si le nœud répond par une redirection (salle gérée par un autre nœud du cluster),
+        la requête est renvoyée au nœud indiqué, qui devient le nœud courant.
+        Si le serveur est surchargé ("busy"), la requête est renvoyée après le délai indiqué
+        (sauf avec retry_busy=False : les échanges d'état sont de toute façon renvoyés au tick suivant).
+        """
+        busy_retries = MAX_BUSY_RETRIES if retry_busy else 0
+        attempt = 0
+        while attempt <= MAX_REDIRECTS:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.settimeout(timeout)
+                s.connect(self.server_address)
+                s.sendall(json.dumps(data).encode('utf-8'))
+                chunks = []
+                while True:
+                    chunk = s.recv(4096)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            response_data = json.loads(b"".join(chunks).decode('utf-8'))
+            
+            if response_data.get("status") == "busy" and busy_retries > 0:
+                busy_retries -= 1
+                delay = min(MAX_BUSY_WAIT, response_data.get("retry_after", 0.5))
+                logging.warning(f"Serveur surchargé, nouvelle tentative dans {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            
+            attempt += 1
+            if "node" in response_data:
+                self._use_node(response_data["node"])
+            if response_data.get("status") != "redirect":
+                return response_data
+            logging.info(f"Redirection vers le nœud {response_data['node'].get('node_id')} "
+                         f"({self.server_address[0]}:{self.server_address[1]})")
+            data = dict(data, redirected=True)
+        return {"status": "error", "message": "Trop de redirections"}
     
     def connect_to_server(self):
         """Établit une connexion avec le serveur."""
@@ -70,9 +144,6 @@ class MultiplayerManager:
                 return False
         
         try:
-            # Générer un UUID unique pour ce joueur
-            self.player_uuid = str(uuid.uuid4())
-            
             data = {
                 "action": "CREATE_ROOM",
                 "player_name": player_name,
@@ -80,28 +151,20 @@ class MultiplayerManager:
                 "player_uuid": self.player_uuid  # Ajouter l'UUID unique
             }
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(5)
-                s.connect((HOST, PORT))
-                s.sendall(json.dumps(data).encode('utf-8'))
-                response = s.recv(1024).decode('utf-8')
-                try:
-                    response_data = json.loads(response)
-                    
-                    if response_data.get("status") == "success":
-                        self.room_id = response_data.get("room_id")
-                        self.player_id = response_data.get("player_id")
-                        self.is_host = True
-                        self.match_data["player1_type"] = fighter_type
-                        self._start_ping_thread()
-                        logging.info(f"Salle créée avec succès. ID: {self.room_id}, UUID: {self.player_uuid}")
-                        return self.room_id
-                    else:
-                        logging.error(f"Échec de création de salle: {response}")
-                        return None
-                except json.JSONDecodeError:
-                    logging.error(f"Réponse invalide du serveur: {response}")
-                    return None
+            # Une nouvelle salle part toujours du serveur d'entrée, qui choisit le nœud
+            self.server_address = (HOST, PORT)
+            response_data = self._request(data, timeout=5)
+            if response_data.get("status") == "success":
+                self.room_id = response_data.get("room_id")
+                self.player_id = response_data.get("player_id")
+                self.is_host = True
+                self.match_data["player1_type"] = fighter_type
+                self._start_ping_thread()
+                logging.info(f"Salle créée avec succès. ID: {self.room_id}, UUID: {self.player_uuid}")
+                return self.room_id
+            else:
+                logging.error(f"Échec de création de salle: {response_data}")
+                return None
         except Exception as e:
             logging.error(f"Erreur lors de la création de salle: {e}")
             return None
@@ -113,9 +176,6 @@ class MultiplayerManager:
                 return False
         
         try:
-            # Générer un UUID unique pour ce joueur
-            self.player_uuid = str(uuid.uuid4())
-            
             data = {
                 "action": "JOIN_ROOM",
                 "room_id": room_id,
@@ -124,34 +184,98 @@ class MultiplayerManager:
                 "player_uuid": self.player_uuid  # Ajouter l'UUID unique
             }
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(5)
-                s.connect((HOST, PORT))
-                s.sendall(json.dumps(data).encode('utf-8'))
-                response = s.recv(1024).decode('utf-8')
-                try:
-                    response_data = json.loads(response)
-                    
-                    if response_data.get("status") == "success":
-                        self.room_id = room_id
-                        self.player_id = response_data.get("player_id")
-                        self.opponent_uuid = response_data.get("host_uuid")  # Récupérer l'UUID de l'hôte
-                        self.is_host = False
-                        self.match_data["player2_type"] = fighter_type
-                        self.match_data["player1_type"] = response_data.get("host_fighter_type", "Mitsu")
-                        self._start_ping_thread()
-                        logging.info(f"Salle rejointe avec succès. ID: {self.room_id}, UUID: {self.player_uuid}")
-                        return True
-                    else:
-                        logging.error(f"Échec pour rejoindre la salle: {response}")
-                        return False
-                except json.JSONDecodeError:
-                    logging.error(f"Réponse invalide du serveur: {response}")
-                    return False
+            # Le serveur d'entrée redirige vers le nœud propriétaire de la salle
+            self.server_address = (HOST, PORT)
+            response_data = self._request(data, timeout=5)
+            if response_data.get("status") == "success":
+                self.room_id = room_id
+                self.player_id = response_data.get("player_id")
+                self.is_host = False
+                self.match_data["player2_type"] = fighter_type
+                self.match_data["player1_type"] = response_data.get("host_fighter_type", "Mitsu")
+                self._start_ping_thread()
+                logging.info(f"Salle rejointe avec succès. ID: {self.room_id}, UUID: {self.player_uuid}")
+                return True
+            else:
+                logging.error(f"Échec pour rejoindre la salle: {response_data}")
+                return False
         except Exception as e:
             logging.error(f"Erreur lors de la tentative de rejoindre la salle: {e}")
             return False
     
+    def find_match(self, player_name, fighter_type, region=None, timeout=120):
+        """Cherche un adversaire via la file de matchmaking (bloquant, à appeler hors boucle d'affichage).
+        
+        L'adversaire est choisi selon le classement du joueur, tenu par le serveur. Retourne l'ID
+        de la salle créée pour les deux joueurs, ou None si aucun adversaire n'a été trouvé avant
+        `timeout` secondes.
+        """
+        if not self.connected:
+            if not self.connect_to_server():
+                return None
+        
+        data = {
+            "action": "MATCHMAKE",
+            "player_name": player_name,
+            "fighter_type": fighter_type,
+            "player_uuid": self.player_uuid
+        }
+        if region is not None:
+            data["region"] = region
+        
+        self.server_address = (HOST, PORT)
+        deadline = time.time() + timeout
+        try:
+            while True:
+                response_data = self._request(data, timeout=5)
+                status = response_data.get("status")
+                if status == "matched":
+                    break
+                if status != "queued":
+                    logging.error(f"Échec du matchmaking: {response_data}")
+                    return None
+                if time.time() >= deadline:
+                    response_data = self._request(dict(data, action="MATCHMAKE_CANCEL"), timeout=5)
+                    if response_data.get("status") != "matched":
+                        logging.info("Aucun adversaire trouvé")
+                        return None
+                    break  # Apparié entre-temps
+                time.sleep(MATCHMAKE_POLL_INTERVAL)
+        except Exception as e:
+            logging.error(f"Erreur lors du matchmaking: {e}")
+            return None
+        
+        self.room_id = response_data["room_id"]
+        self.player_id = response_data["player_id"]
+        self.is_host = response_data["is_host"]
+        if self.is_host:
+            self.match_data["player1_type"] = fighter_type
+        else:
+            self.match_data["player2_type"] = fighter_type
+            self.match_data["player1_type"] = response_data.get("host_fighter_type", "Mitsu")
+        self._start_ping_thread()
+        logging.info(f"Adversaire trouvé: {response_data['opponent']['name']}, salle {self.room_id}")
+        return self.room_id
+    
+    def get_leaderboard(self, limit=10, offset=0):
+        """Meilleurs joueurs du classement du serveur (liste vide en cas d'erreur)."""
+        try:
+            response_data = self._request({"action": "LEADERBOARD", "limit": limit, "offset": offset}, timeout=5)
+            return response_data.get("players", [])
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération du classement: {e}")
+            return []
+    
+    def get_rating(self, player_name):
+        """Classement et rang du joueur (son UUID persistant), None en cas d'erreur."""
+        try:
+            response_data = self._request({"action": "GET_RATING", "player_uuid": self.player_uuid,
+                                           "player_name": player_name}, timeout=5)
+            return response_data.get("player")
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération du classement de {player_name}: {e}")
+            return None
+    
     def send_game_state(self, game_state):
         """Envoie l'état actuel du jeu au serveur."""
         if not self.room_id or not self.player_id:
@@ -165,12 +289,7 @@ class MultiplayerManager:
                 "game_state": game_state
             }
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(2)
-                s.connect((HOST, PORT))
-                s.sendall(json.dumps(data).encode('utf-8'))
-                response = s.recv(1024).decode('utf-8')
-                return "success" in response.lower()
+            return self._request(data, retry_busy=False).get("status") == "success"
         except Exception as e:
             logging.error(f"Erreur lors de l'envoi de l'état du jeu: {e}")
             return False
@@ -187,20 +306,11 @@ class MultiplayerManager:
                 "player_id": self.player_id
             }
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(2)
-                s.connect((HOST, PORT))
-                s.sendall(json.dumps(data).encode('utf-8'))
-                response = s.recv(1024).decode('utf-8')
-                try:
-                    response_data = json.loads(response)
-                    if response_data.get("status") == "success":
-                        self.opponent_data = response_data.get("opponent_state", {})
-                        return self.opponent_data
-                    return None
-                except json.JSONDecodeError:
-                    logging.error("Réponse invalide du serveur")
-                    return None
+            response_data = self._request(data, retry_busy=False)
+            if response_data.get("status") == "success":
+                self.opponent_data = response_data.get("opponent_state", {})
+                return self.opponent_data
+            return None
         except Exception as e:
             logging.error(f"Erreur lors de la récupération de l'état de l'adversaire: {e}")
             return None
@@ -217,19 +327,11 @@ class MultiplayerManager:
                 "player_id": self.player_id
             }
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(2)
-                s.connect((HOST, PORT))
-                s.sendall(json.dumps(data).encode('utf-8'))
-                response = s.recv(1024).decode('utf-8')
-                try:
-                    response_data = json.loads(response)
-                    if response_data.get("status") == "success":
-                        self.opponent_ready = response_data.get("ready", False)
-                        return self.opponent_ready
-                    return False
-                except json.JSONDecodeError:
-                    return False
+            response_data = self._request(data)
+            if response_data.get("status") == "success":
+                self.opponent_ready = response_data.get("ready", False)
+                return self.opponent_ready
+            return False
         except Exception as e:
             logging.error(f"Erreur lors de la vérification de l'état de l'adversaire: {e}")
             return False
@@ -247,16 +349,34 @@ class MultiplayerManager:
                 "ready": ready
             }
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(2)
-                s.connect((HOST, PORT))
-                s.sendall(json.dumps(data).encode('utf-8'))
-                response = s.recv(1024).decode('utf-8')
-                return "success" in response.lower()
+            return self._request(data).get("status") == "success"
         except Exception as e:
             logging.error(f"Erreur lors de la définition de l'état prêt: {e}")
             return False
     
+    def report_result(self, won, duration=0):
+        """Déclare le résultat du match au serveur, qui l'enregistre quand l'adversaire a déclaré le même."""
+        if not self.room_id or not self.player_id:
+            return False
+        
+        try:
+            data = {
+                "action": "RECORD_MATCH_RESULT",
+                "room_id": self.room_id,
+                "player_id": self.player_id,
+                "won": won,
+                "duration": round(duration, 1)
+            }
+            
+            response_data = self._request(data, timeout=5)
+            if response_data.get("status") == "error":
+                logging.warning(f"Résultat du match refusé: {response_data.get('message')}")
+                return False
+            return True
+        except Exception as e:
+            logging.error(f"Erreur lors de l'envoi du résultat du match: {e}")
+            return False
+    
     def leave_room(self):
         """Quitte la salle actuelle."""
         if not self.room_id or not self.player_id:
@@ -269,11 +389,8 @@ class MultiplayerManager:
                 "player_id": self.player_id
             }
             
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(2)
-                s.connect((HOST, PORT))
-                s.sendall(json.dumps(data).encode('utf-8'))
-                
+            self._request(data)
+            
             self._stop_ping_thread()
             self.room_id = None
             self.player_id = None
@@ -310,7 +427,7 @@ class MultiplayerManager:
             start_time = time.time()
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.settimeout(2)
-                s.connect((HOST, PING_PORT))
+                s.connect(self.ping_address)
                 s.sendall(b"PING")
                 response = s.recv(1024)
                 if response == b"PONG":
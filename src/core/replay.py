@@ -0,0 +1,199 @@
+# Enregistrement et relecture des combats locaux
+#
+# Un replay ne contient pas d'images : uniquement la graine aléatoire, les personnages et,
+# pour chaque frame de jeu, un mot d'entrée par joueur (voir INPUT_* dans game.py).
+# Les entrées sont compressées par plages (run-length) car elles changent rarement d'une frame
+# à l'autre. Des points de contrôle réguliers (état complet des combattants) permettent de
+# se déplacer dans le replay sans tout re-simuler et de détecter une désynchronisation.
+#
+# Usage : python src/core/replay.py replays/fichier.pfr [--speed 50] [--headless] [--seek 1200]
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+REPLAY_VERSION = 3  # 2 : attaques rythmées par le manifeste des frames ; 3 : hitbox du manifeste
+REPLAY_DIR = "replays"
+REPLAY_EXTENSION = ".pfr"
+
+# Un point de contrôle toutes les 5 secondes de jeu
+CHECKPOINT_INTERVAL = 300
+
+
+class ReplayRecorder:
+    """Accumule les entrées d'un combat et les écrit dans un fichier replay."""
+
+    def __init__(self, player1_type, player2_type, seed, background, fps=60):
+        self.header = {
+            "version": REPLAY_VERSION,
+            "fighters": [player1_type, player2_type],
+            "seed": seed,
+            "background": background,
+            "fps": fps,
+            "checkpoint_interval": CHECKPOINT_INTERVAL,
+        }
+        self.runs = []  # [mot_joueur1, mot_joueur2, nombre_de_frames]
+        self.frame_count = 0
+        self.checkpoints = []
+        self.winner = None
+
+    def record(self, words):
+        """Ajoute les entrées d'une frame."""
+        if self.runs and self.runs[-1][0] == words[0] and self.runs[-1][1] == words[1]:
+            self.runs[-1][2] += 1
+        else:
+            self.runs.append([words[0], words[1], 1])
+        self.frame_count += 1
+
+    def checkpoint(self, frame, state):
+        self.checkpoints.append({"frame": frame, "state": state})
+
+    def save(self, path=None):
+        """Écrit le replay (JSON compressé gzip) et retourne son chemin."""
+        if path is None:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            fighters = "_vs_".join(self.header["fighters"])
+            path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{fighters}{REPLAY_EXTENSION}")
+
+        data = dict(self.header, frames=self.frame_count, inputs=self.runs,
+                    checkpoints=self.checkpoints, winner=self.winner)
+        try:
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            logging.info(f"Replay saved: {path} ({self.frame_count} frames, {os.path.getsize(path)} bytes)")
+        except OSError as e:
+            logging.error(f"Error saving replay {path}: {e}")
+            return None
+        return path
+
+
+class Replay:
+    """Replay chargé en mémoire."""
+
+    def __init__(self, data):
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        self.fighters = data["fighters"]
+        self.seed = data["seed"]
+        self.background = data["background"]
+        self.fps = data.get("fps", 60)
+        self.frame_count = data["frames"]
+        self.winner = data.get("winner")
+        self.checkpoints = {cp["frame"]: cp["state"] for cp in data.get("checkpoints", [])}
+
+        # Décompression des plages : une entrée (mot1, mot2) par frame
+        self.inputs = []
+        for word1, word2, count in data["inputs"]:
+            self.inputs.extend([(word1, word2)] * count)
+
+    def nearest_checkpoint(self, frame):
+        """Dernier point de contrôle enregistré avant (ou à) la frame demandée."""
+        frames = [f for f in self.checkpoints if f <= frame]
+        return max(frames) if frames else None
+
+
+def load_replay(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return Replay(json.load(f))
+
+
+class ReplayPlayer:
+    """Re-simule un replay, à vitesse normale avec rendu ou en accéléré sans rendu."""
+
+    def __init__(self, replay, headless=False):
+        from core.game import Game
+
+        self.replay = replay
+        self.headless = headless
+        self.game = Game(replay.fighters[0], replay.fighters[1], seed=replay.seed,
+                         record=False, headless=headless)
+        if self.game.bg_selected != replay.background:
+            logging.warning(f"Replay background mismatch: {self.game.bg_selected} != {replay.background}")
+        self.desyncs = 0
+
+    def seek(self, frame):
+        """Restaure le point de contrôle le plus proche puis simule jusqu'à la frame demandée."""
+        frame = max(0, min(frame, self.replay.frame_count))
+        checkpoint = self.replay.nearest_checkpoint(frame)
+        if checkpoint is not None and (checkpoint > self.game.frame_count or frame < self.game.frame_count):
+            self.game.set_state(self.replay.checkpoints[checkpoint])
+        while self.game.frame_count < frame and self.step():
+            pass
+
+    def step(self):
+        """Simule une frame. Retourne False à la fin du replay ou du combat."""
+        frame = self.game.frame_count
+        if frame >= self.replay.frame_count:
+            return False
+
+        expected = self.replay.checkpoints.get(frame)
+        if expected is not None and frame > 0:
+            self.check_desync(frame, expected)
+
+        return self.game.step(self.replay.inputs[frame])
+
+    def check_desync(self, frame, expected):
+        state = self.game.get_state()
+        if state != expected:
+            self.desyncs += 1
+            for i, (current, recorded) in enumerate(zip(state["fighters"], expected["fighters"])):
+                for key in recorded:
+                    if current.get(key) != recorded[key]:
+                        logging.warning(f"Replay desync at frame {frame}: fighter {i + 1} {key} "
+                                        f"= {current.get(key)} (recorded {recorded[key]})")
+                        return
+
+    def play(self, speed=1.0):
+        """Joue le replay. En mode headless la simulation tourne aussi vite que possible."""
+        start = time.perf_counter()
+        start_frame = self.game.frame_count
+        # En accéléré, on n'affiche qu'une frame sur `speed`
+        render_every = max(1, int(speed))
+
+        while self.step():
+            if self.headless:
+                continue
+            if self.game.frame_count % render_every == 0:
+                self.game.render()
+                self.game.pump_events()
+            self.game.clock.tick(self.replay.fps * speed)
+
+        elapsed = time.perf_counter() - start
+        frames = self.game.frame_count - start_frame
+        logging.info(f"Replay finished: {frames} frames in {elapsed:.2f}s "
+                     f"({frames / max(elapsed, 1e-6) / self.replay.fps:.1f}x), winner: {self.game.winner}, "
+                     f"desyncs: {self.desyncs}")
+        if self.replay.winner is not None and self.game.winner != self.replay.winner:
+            logging.warning(f"Replay result mismatch: {self.game.winner} != {self.replay.winner}")
+        return self.game.winner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lecteur de replays PythFighter")
+    parser.add_argument("path", help="Fichier replay (.pfr)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Vitesse de lecture (ex: 10 ou 100)")
+    parser.add_argument("--headless", action="store_true", help="Re-simule sans affichage")
+    parser.add_argument("--seek", type=int, default=0, help="Frame de départ")
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    replay = load_replay(args.path)
+    player = ReplayPlayer(replay, headless=args.headless)
+    if args.seek:
+        player.seek(args.seek)
+    winner = player.play(args.speed)
+    print(f"Frames: {player.game.frame_count}/{replay.frame_count} - Vainqueur: joueur {winner} - "
+          f"Désynchronisations: {player.desyncs}")
+
+
+if __name__ == "__main__":
+    main()
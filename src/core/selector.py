@@ -17,6 +17,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from config.settings import GameSettings
 from config.fighters import Mitsu, Tank, Noya, ThunderStrike, Bruiser
 from managers.position_manager import PositionManager
+from managers.audio_manager import audio, PRIORITY_HIGH
+from managers.text_cache import text_cache
+from managers.bundle import asset_exists, entry_command, list_assets, open_asset
 
 FIGHTERS = {
     "Mitsu": Mitsu(),
@@ -39,6 +42,13 @@ CARD_SHADOW_COLOR = (0, 0, 0, 120)
 GRADIENT_TOP = (40, 40, 60)
 GRADIENT_BOTTOM = (15, 15, 25)
 
+# Écran versus (en frames à FPS) : entrée des portraits, maintien, sortie, puis dernière image figée
+VERSUS_IN_FRAMES = 30
+VERSUS_HOLD_FRAMES = 60
+VERSUS_OUT_FRAMES = 30
+VERSUS_END_FRAMES = 30
+VERSUS_SKIP_KEYS = (pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE)
+
 class ResourceManager:
     def __init__(self, base_path="assets"):
         self.assets = {
@@ -59,40 +69,34 @@ class ResourceManager:
         self.load_fonts()
 
     def load_images(self):
-        if os.path.exists(self.paths["images"]):
-            for file in os.listdir(self.paths["images"]):
-                if file.endswith(('.png', '.jpg', '.jpeg')):
-                    try:
-                        key = os.path.splitext(file)[0]
-                        self.assets["images"][key] = pygame.image.load(
-                            os.path.join(self.paths["images"], file)).convert_alpha()
-                    except Exception as e:
-                        print(f"Failed to load image {file}: {e}")
-
-    def load_sounds(self):
-        if os.path.exists(self.paths["sounds"]):
-            sound_files = {
-                "hover": "hover.wav",
-                "select": "select.wav",
-                "character_select": "character_select.mp3",
-                "fight": "fight.wav",
-                "versus": "versus.wav"
-            }
-            for key, file in sound_files.items():
+        for file in list_assets(self.paths["images"]):
+            if file.endswith(('.png', '.jpg', '.jpeg')):
                 try:
-                    self.assets["sounds"][key] = pygame.mixer.Sound(
-                        os.path.join(self.paths["sounds"], file))
+                    key = os.path.splitext(file)[0]
+                    self.assets["images"][key] = pygame.image.load(
+                        open_asset(os.path.join(self.paths["images"], file))).convert_alpha()
                 except Exception as e:
-                    print(f"Failed to load sound {file}: {e}")
+                    print(f"Failed to load image {file}: {e}")
+
+    def load_sounds(self):
+        # Sons de la banque partagée (décodés une seule fois) ; la musique est lue en flux par pygame.mixer.music
+        if audio.init():
+            for key in ("hover", "select", "fight", "versus"):
+                sound = audio.bank.get(key)
+                if sound is not None:
+                    self.assets["sounds"][key] = sound
+            # Annonces des personnages : décodées ici plutôt qu'au moment de la sélection
+            audio.preload(f"{name.lower()}_intro" for name in FIGHTERS)
 
     def load_fonts(self):
         try:
             font_path = os.path.join(self.paths["fonts"], "your-fancy-font.ttf")
+            font_source = (lambda: open_asset(font_path)) if asset_exists(font_path) else (lambda: None)
             self.assets["fonts"] = {
-                'title': pygame.font.Font(font_path if os.path.exists(font_path) else None, 72),
-                'subtitle': pygame.font.Font(font_path if os.path.exists(font_path) else None, 48),
-                'normal': pygame.font.Font(font_path if os.path.exists(font_path) else None, 36),
-                'small': pygame.font.Font(font_path if os.path.exists(font_path) else None, 24)
+                'title': pygame.font.Font(font_source(), 72),
+                'subtitle': pygame.font.Font(font_source(), 48),
+                'normal': pygame.font.Font(font_source(), 36),
+                'small': pygame.font.Font(font_source(), 24)
             }
         except Exception as e:
             print(f"Failed to load fonts: {e}")
@@ -210,6 +214,8 @@ class CharacterSelect:
         # Ajout pour les animations versus
         self.versus_particles = []
         self.lightning_bolts = []
+        self.versus_start = None  # Ticks du début de l'écran versus, None pendant la sélection
+        self.versus_skipped = False
         self.character_portraits = {}
         self.load_character_portraits()
 
@@ -223,11 +229,11 @@ class CharacterSelect:
                 # Chercher le fichier avec différentes extensions
                 for ext in VALID_EXTENSIONS:
                     candidate = os.path.join(self.resource_manager.paths["images"], f"{fighter_name.lower()}_portrait{ext}")
-                    if os.path.exists(candidate):
+                    if asset_exists(candidate):
                         portrait_path = candidate
                         break
                 if portrait_path:
-                    original = pygame.image.load(portrait_path).convert_alpha()
+                    original = pygame.image.load(open_asset(portrait_path)).convert_alpha()
                     # Calculer le ratio pour préserver les proportions sans agrandir les petites images
                     width_ratio = TARGET_SIZE[0] / original.get_width()
                     height_ratio = TARGET_SIZE[1] / original.get_height()
@@ -471,7 +477,7 @@ class CharacterSelect:
             color = SETTINGS.PLAYER1_COLOR if player == "player1" else SETTINGS.PLAYER2_COLOR
             self.particles.create_explosion(pos, color)
             if self.select_sound:
-                self.select_sound.play()
+                audio.play("select")
 
             # Store the device used for selection
             self.player_devices[player] = device_id
@@ -493,7 +499,7 @@ class CharacterSelect:
         last_hover_p2 = None
 
         try:
-            pygame.mixer.music.load("assets/sounds/character_select.mp3")
+            pygame.mixer.music.load(open_asset("assets/sounds/character_select.mp3"), "mp3")
             pygame.mixer.music.set_volume(0.5)
             pygame.mixer.music.play(-1)
         except:
@@ -505,6 +511,9 @@ class CharacterSelect:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif self.versus_start is not None:
+                    if (event.type == pygame.KEYDOWN and event.key in VERSUS_SKIP_KEYS) or event.type == pygame.JOYBUTTONDOWN:
+                        self.versus_skipped = True
                 elif event.type == pygame.JOYBUTTONDOWN:
                     if event.button == 0:  # A button
                         joystick = pygame.joystick.Joystick(event.instance_id)
@@ -527,14 +536,22 @@ class CharacterSelect:
                             if hovered_char:
                                 self.handle_character_selection(player, hovered_char, joystick_id)
 
+            if self.versus_start is not None and running:
+                # Écran versus : une image par tour de boucle, la fenêtre continue de traiter ses événements
+                if not self.update_versus_screen():
+                    self.launch_game()
+                pygame.display.flip()
+                clock.tick(FPS)
+                continue
+
             # Update hover state for each player
             current_hover_p1 = self.player_hovered["player1"]
             current_hover_p2 = self.player_hovered["player2"]
 
             if current_hover_p1 != last_hover_p1 and self.hover_sound:
-                self.hover_sound.play()
+                audio.play("hover")
             if current_hover_p2 != last_hover_p2 and self.hover_sound:
-                self.hover_sound.play()
+                audio.play("hover")
 
             last_hover_p1 = current_hover_p1
             last_hover_p2 = current_hover_p2
@@ -568,11 +585,7 @@ class CharacterSelect:
 
             if self.selection_done:
                 self.play_character_intro(self.selected["player1"])
-                self.show_versus_screen()
-
-                subprocess.run([sys.executable, "src/core/game.py",
-                               self.selected["player1"], self.selected["player2"]])
-                sys.exit()
+                self.start_versus_screen()
 
             pygame.display.flip()
             clock.tick(FPS)
@@ -685,28 +698,36 @@ class CharacterSelect:
                                     (position[0] - scaled_size,
                                      position[1] - scaled_size))
 
-    def show_versus_screen(self):
+    def launch_game(self):
+        subprocess.run(entry_command("game", self.selected["player1"], self.selected["player2"]))
+        sys.exit()
+
+    def start_versus_screen(self):
+        audio.play("versus")
+        self.lightning_bolts = []
+        self.versus_start = pygame.time.get_ticks()
+        self.versus_skipped = False
+        self.versus_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def update_versus_screen(self):
+        """Dessine l'image courante de l'écran versus ; retourne False quand il est terminé ou passé.
+
+        L'image est choisie d'après le temps écoulé : l'animation garde sa durée même si des
+        frames sont perdues.
+        """
+        animation_duration = VERSUS_IN_FRAMES + VERSUS_HOLD_FRAMES + VERSUS_OUT_FRAMES
+        frame = (pygame.time.get_ticks() - self.versus_start) * FPS // 1000
+        if self.versus_skipped or frame >= animation_duration + VERSUS_END_FRAMES:
+            return False
+        self.draw_versus_frame(min(frame, animation_duration - 1))
+        return True
+
+    def draw_versus_frame(self, frame):
         """Animation améliorée de l'écran versus"""
         # Récupération des données des combattants
         player1_data = FIGHTERS[self.selected["player1"]]
         player2_data = FIGHTERS[self.selected["player2"]]
-
-        # Préparation des sons
-        try:
-            versus_sound = self.resource_manager.assets["sounds"].get("versus")
-            if versus_sound:
-                versus_sound.play()
-        except:
-            pass
-
-        # Paramètres d'animation
-        animation_duration = 120  # frames
-        transition_in_duration = 30
-        hold_duration = 60
-        transition_out_duration = 30
-
-        # Surface principale
-        vs_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        vs_surface = self.versus_surface
 
         # Préparation des portraits
         p1_portrait = self.character_portraits[self.selected["player1"]]
@@ -716,62 +737,52 @@ class CharacterSelect:
         p1_target_y = SCREEN_HEIGHT // 2 - p1_portrait.get_height() // 2
         p2_target_y = SCREEN_HEIGHT // 2 - p2_portrait.get_height() // 2
 
-        # Paramètres pour les éclairs
-        self.lightning_bolts = []
-
-        # Boucle d'animation
-        for frame in range(animation_duration):
-            # Calcul des progressions
-            if frame < transition_in_duration:
-                progress = frame / transition_in_duration
-            elif frame < transition_in_duration + hold_duration:
-                progress = 1.0
-            else:
-                progress = 1.0 - (frame - (transition_in_duration + hold_duration)) / transition_out_duration
-
-            # Remplissage du fond avec gradient
-            vs_surface.fill(BACKGROUND_COLOR)
-            self._draw_versus_background(vs_surface, frame)
-
-            # Animation des portraits
-            p1_current_x = int(-p1_portrait.get_width() + (p1_target_x + p1_portrait.get_width()) * min(1.0, progress * 1.5))
-            p2_current_x = int(SCREEN_WIDTH + (p2_target_x - SCREEN_WIDTH) * min(1.0, progress * 1.5))
-
-            # Effet de zoom sur les portraits
-            portrait_zoom = 1.0 + sin(frame * 0.1) * 0.05 if progress > 0.8 else 1.0
-
-            # Affichage des portraits avec zoom et effets
-            p1_scaled = pygame.transform.scale(p1_portrait,
-                                               (int(p1_portrait.get_width() * portrait_zoom),
-                                                int(p1_portrait.get_height() * portrait_zoom)))
-            p2_scaled = pygame.transform.scale(p2_portrait,
-                                               (int(p2_portrait.get_width() * portrait_zoom),
-                                                int(p2_portrait.get_height() * portrait_zoom)))
-
-            # Aura autour des portraits
-            if progress > 0.5:
-                self._draw_portrait_aura(vs_surface, p1_current_x, p1_target_y, p1_scaled, player1_data.color, frame)
-                self._draw_portrait_aura(vs_surface, p2_current_x, p2_target_y, p2_scaled, player2_data.color, frame)
-
-            # Affichage des portraits
-            vs_surface.blit(p1_scaled, (p1_current_x, p1_target_y))
-            vs_surface.blit(p2_scaled, (p2_current_x, p2_target_y))
-
-            # Texte VS au centre avec effets
-            if progress > 0.7:
-                vs_size = int(100 + 30 * sin(frame * 0.2))
-                vs_font = pygame.font.Font(None, vs_size)
-                vs_text = vs_font.render("VS", True, (255, 255, 255))
-                vs_surface.blit(vs_text,
-                                (SCREEN_WIDTH // 2 - vs_text.get_width() // 2,
-                                 SCREEN_HEIGHT // 2 - vs_text.get_height() // 2))
-
-            # Affichage de l'écran complet
-            self.screen.blit(vs_surface, (0, 0))
-            pygame.display.flip()
-            pygame.time.delay(16)
-
-        pygame.time.delay(500)
+        # Calcul des progressions
+        if frame < VERSUS_IN_FRAMES:
+            progress = frame / VERSUS_IN_FRAMES
+        elif frame < VERSUS_IN_FRAMES + VERSUS_HOLD_FRAMES:
+            progress = 1.0
+        else:
+            progress = 1.0 - (frame - (VERSUS_IN_FRAMES + VERSUS_HOLD_FRAMES)) / VERSUS_OUT_FRAMES
+
+        # Remplissage du fond avec gradient
+        vs_surface.fill(BACKGROUND_COLOR)
+        self._draw_versus_background(vs_surface, frame)
+
+        # Animation des portraits
+        p1_current_x = int(-p1_portrait.get_width() + (p1_target_x + p1_portrait.get_width()) * min(1.0, progress * 1.5))
+        p2_current_x = int(SCREEN_WIDTH + (p2_target_x - SCREEN_WIDTH) * min(1.0, progress * 1.5))
+
+        # Effet de zoom sur les portraits
+        portrait_zoom = 1.0 + sin(frame * 0.1) * 0.05 if progress > 0.8 else 1.0
+
+        # Affichage des portraits avec zoom et effets
+        p1_scaled = pygame.transform.scale(p1_portrait,
+                                           (int(p1_portrait.get_width() * portrait_zoom),
+                                            int(p1_portrait.get_height() * portrait_zoom)))
+        p2_scaled = pygame.transform.scale(p2_portrait,
+                                           (int(p2_portrait.get_width() * portrait_zoom),
+                                            int(p2_portrait.get_height() * portrait_zoom)))
+
+        # Aura autour des portraits
+        if progress > 0.5:
+            self._draw_portrait_aura(vs_surface, p1_current_x, p1_target_y, p1_scaled, player1_data.color, frame)
+            self._draw_portrait_aura(vs_surface, p2_current_x, p2_target_y, p2_scaled, player2_data.color, frame)
+
+        # Affichage des portraits
+        vs_surface.blit(p1_scaled, (p1_current_x, p1_target_y))
+        vs_surface.blit(p2_scaled, (p2_current_x, p2_target_y))
+
+        # Texte VS au centre avec effets
+        if progress > 0.7:
+            vs_size = int(100 + 30 * sin(frame * 0.2))
+            vs_text = text_cache.render("VS", vs_size, (255, 255, 255))
+            vs_surface.blit(vs_text,
+                            (SCREEN_WIDTH // 2 - vs_text.get_width() // 2,
+                             SCREEN_HEIGHT // 2 - vs_text.get_height() // 2))
+
+        # Affichage de l'écran complet
+        self.screen.blit(vs_surface, (0, 0))
 
     def _draw_versus_background(self, surface, frame):
         # Draw a dynamic background with gradients and effects
@@ -800,13 +811,8 @@ class CharacterSelect:
                            border_radius=10)
 
     def play_character_intro(self, character_name):
-        try:
-            sound_file = f"assets/sounds/{character_name.lower()}_intro.wav"
-            if os.path.exists(sound_file):
-                intro_sound = pygame.mixer.Sound(sound_file)
-                intro_sound.play()
-        except:
-            pass
+        # Décodé au premier appel puis gardé dans la banque (ou mémorisé comme absent)
+        audio.play(f"{character_name.lower()}_intro", priority=PRIORITY_HIGH)
 
 if __name__ == "__main__":
     game = CharacterSelect()
@@ -8,39 +8,120 @@ import logging
 import os
 import signal
 import sys
+import argparse
+import multiprocessing
+import zlib
+import queue
+from contextlib import nullcontext
 from datetime import datetime
 from collections import deque
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from managers.journal import Journal
+from managers.room_registry import RoomRegistry
+from managers.matchmaking_queue import MatchmakingQueue
+from managers.rating_store import RatingStore
+from managers.match_history import MatchHistory
+from managers.metrics import Metrics, bucket_counts, format_histogram, format_metric
+from managers.structured_logging import setup_logging
+from managers.rate_limiter import TokenBucketLimiter
+
 # Configuration du serveur
 HOST = '0.0.0.0'  # Écoute sur toutes les interfaces
 PORT = 25568      # Port principal
 PING_PORT = 25569 # Port pour les pings
-STATS_PORT = 25570 # Port pour les statistiques
+STATS_PORT = 25570 # Port pour les statistiques (STATS en JSON, ou GET /metrics au format Prometheus)
+
+# Journal des salles : permet de reconstruire l'état après un redémarrage
+JOURNAL_FILE = os.path.join("data", "rooms_journal.jsonl")
+JOURNAL_COMPACT_THRESHOLD = 50000  # Nombre d'événements avant compaction
+
+LIST_ROOMS_LIMIT = 50  # Nombre maximum de salles renvoyées par LIST_ROOMS
+
+# Historique des matchs : seuls les derniers résultats de chaque salle sont conservés
+MATCH_HISTORY_SIZE = 50
+MATCH_HISTORY_PAGE_SIZE = 10  # Résultats par page (les réponses doivent rester petites)
+
+# Matchmaking : classement utilisé quand le client n'en fournit pas, région par défaut
+MATCHMAKE_DEFAULT_RATING = 1000
+MATCHMAKE_DEFAULT_REGION = "global"
+
+# Classement Elo des joueurs (par UUID), mis à jour à chaque résultat de match ; un fichier par nœud en cluster
+RATINGS_FILE = os.path.join("data", "ratings.jsonl")
+LEADERBOARD_LIMIT = 100  # Nombre maximum d'entrées renvoyées par LEADERBOARD
+
+# Métriques : actions mesurées séparément (les autres sont regroupées sous "OTHER")
+METRIC_ACTIONS = frozenset({
+    "CREATE_ROOM", "JOIN_ROOM", "LEAVE_ROOM", "UPDATE_STATE", "GET_OPPONENT_STATE", "SET_READY",
+    "CHECK_OPPONENT_READY", "RECORD_MATCH_RESULT", "LIST_ROOMS", "GET_ROOM_INFO", "GET_MATCH_HISTORY",
+    "MATCHMAKE", "MATCHMAKE_CANCEL", "MATCHMAKE_STATUS", "LEADERBOARD", "GET_RATING"
+})
+TICK_RATE_BUCKETS = (1, 5, 10, 15, 20, 30, 45, 60, 90, 120)  # Mises à jour d'état par seconde
+
+# Contrôle de charge : au-delà, le serveur répond {"status": "busy", "retry_after": ...} au lieu de ralentir
+ACCEPT_BACKLOG = 128  # Connexions en attente d'accept() dans le noyau
+MAX_WORKERS = 64  # Threads traitant les requêtes
+MAX_PENDING_REQUESTS = 256  # Connexions acceptées en attente d'un thread
+MAX_QUEUE_WAIT = 1.0  # Une requête restée plus longtemps en file est refusée (le client a déjà abandonné ou presque)
+BUSY_RETRY_AFTER = 0.5  # Délai conseillé (s) quand la file est pleine
+IP_RATE_LIMIT = 300  # Requêtes par seconde et par adresse IP (0 = pas de limite)
+IP_RATE_BURST = 600
+PLAYER_RATE_LIMIT = 60  # Requêtes par seconde et par joueur (UUID ou ID de joueur)
+PLAYER_RATE_BURST = 120
+MAX_PING_THREADS = 32  # Connexions ping/stats traitées simultanément
+REQUEST_READ_TIMEOUT = 2  # Un client qui n'envoie pas sa requête n'immobilise pas un thread plus longtemps
+
+# Expiration des salles
+ROOM_MAX_IDLE = 3600  # Une salle sans activité depuis 1 heure est supprimée
+STATS_SAVE_INTERVAL = 300  # Sauvegarde des statistiques dans le journal toutes les 5 minutes
+CLEANUP_MAX_WAIT = 60  # Le thread de nettoyage se réveille au moins toutes les minutes
+
+# Mode shardé (--shards N) : les salles sont réparties entre N processus selon le hash de leur ID
+SHARD_HOST = '127.0.0.1'
+SHARD_BASE_PORT = 25600  # Le shard i écoute sur SHARD_BASE_PORT + i (boucle locale uniquement)
+SHARD_TIMEOUT = 5
+
+# Mode cluster (--node-id ID --directory hôte:port) : plusieurs nœuds indépendants enregistrés
+# auprès d'un répertoire (core/directory.py). L'ID d'une salle commence par l'ID du nœud qui la
+# possède ("a-1b2c3d4e") : un nœud qui reçoit une requête pour la salle d'un autre nœud renvoie
+# au client l'adresse du bon nœud au lieu de la traiter.
+DIRECTORY_PORT = 25580
+HEARTBEAT_INTERVAL = 5  # Enregistrement auprès du répertoire toutes les 5 secondes
+CLUSTER_TIMEOUT = 3
+REBALANCE_MARGIN = 20  # Une création est redirigée vers un nœud ayant au moins 20 salles de moins
 
-# Configuration du logging
+# Configuration du logging : écriture en arrière-plan (JSON, un fichier par jour) avec limitation
+# du débit par message, pour que les pics de connexions ne se transforment pas en I/O disque
 log_dir = "logs"
 if not os.path.exists(log_dir):
     os.makedirs(log_dir)
 
-log_file = os.path.join(log_dir, f"server_{datetime.now().strftime('%Y%m%d')}.log")
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
-)
+setup_logging(os.path.join(log_dir, "server.log"))
 
 # Stockage des salles et des joueurs
-rooms = {}
+rooms = RoomRegistry()
+# Protège les salles : les threads de requêtes et le thread de nettoyage les modifient
+rooms_lock = threading.RLock()
 player_states = {}
 active_connections = 0
 total_connections = 0
+connections_lock = threading.Lock()
 connection_history = deque(maxlen=100)  # Garde les 100 dernières connexions
 server_start_time = time.time()
 
+# Position de ce processus dans le mode shardé (shard_index vaut None pour l'accepteur)
+shard_count = 1
+shard_index = None
+shard_processes = {}
+
+# Mode cluster (node_id vaut None hors cluster)
+node_id = None
+node_address = None  # Adresse annoncée aux clients : {"host", "port", "ping_port"}
+directory_address = None
+cluster_nodes = {}  # node_id -> dernière description reçue du répertoire
+cluster_lock = threading.Lock()
+
 # Statistiques
 class ServerStats:
     def __init__(self):
@@ -52,6 +133,7 @@ class ServerStats:
         self.peak_concurrent_users = 0
         self.peak_concurrent_rooms = 0
         self.server_uptime = 0
+        self.rooms_closed = {}  # Raison de fermeture -> nombre de salles
         self.last_reset = time.time()
         
     def update(self):
@@ -77,14 +159,84 @@ class ServerStats:
             "peak_concurrent_users": self.peak_concurrent_users,
             "peak_concurrent_rooms": self.peak_concurrent_rooms,
             "server_uptime": int(self.server_uptime),
-            "last_reset": datetime.fromtimestamp(self.last_reset).strftime('%Y-%m-%d %H:%M:%S')
+            "last_reset": datetime.fromtimestamp(self.last_reset).strftime('%Y-%m-%d %H:%M:%S'),
+            "matchmaking": matchmaker.to_dict()
+        }
+
+    def snapshot(self):
+        """Compteurs persistés dans le journal."""
+        return {
+            "total_connections": self.total_connections,
+            "total_rooms_created": self.total_rooms_created,
+            "total_matches_played": self.total_matches_played,
+            "peak_concurrent_users": self.peak_concurrent_users,
+            "peak_concurrent_rooms": self.peak_concurrent_rooms,
+            "rooms_closed": dict(self.rooms_closed),
+            "last_reset": self.last_reset
         }
 
+    def restore(self, data):
+        for key, value in data.items():
+            if hasattr(self, key):
+                setattr(self, key, value)
+
 stats = ServerStats()
+journal = Journal(JOURNAL_FILE)
+matchmaker = MatchmakingQueue()
+ratings = RatingStore(RATINGS_FILE, default_rating=MATCHMAKE_DEFAULT_RATING)
+
+metrics = Metrics()
+metrics.describe("pythfighter_requests_total", "counter", "Requêtes traitées, par action et statut de la réponse")
+metrics.describe("pythfighter_request_duration_seconds", "histogram",
+                 "Durée de traitement des requêtes (réception à envoi de la réponse), par action")
+metrics.describe("pythfighter_received_bytes_total", "counter", "Octets reçus des clients")
+metrics.describe("pythfighter_sent_bytes_total", "counter", "Octets envoyés aux clients")
+metrics.describe("pythfighter_rejected_total", "counter", "Requêtes refusées par le contrôle de charge, par raison")
+
+# Contrôle de charge (processus accepteur)
+ip_limiter = TokenBucketLimiter(IP_RATE_LIMIT, IP_RATE_BURST)
+player_limiter = TokenBucketLimiter(PLAYER_RATE_LIMIT, PLAYER_RATE_BURST)
+pending_requests = queue.Queue(maxsize=MAX_PENDING_REQUESTS)
+side_threads = threading.BoundedSemaphore(MAX_PING_THREADS)
+room_tick_samples = {}  # room_id -> (nombre de mises à jour, instant) lors de la dernière mesure
+
+def shard_for_key(key):
+    """Shard propriétaire d'un ID de salle (ou d'un UUID joueur pour CREATE_ROOM)."""
+    return zlib.crc32(key.encode('utf-8')) % shard_count
+
+def log_path():
+    """Fichier de log de ce processus (chaque processus fait tourner son propre fichier)."""
+    name = "server"
+    if node_id is not None:
+        name += f"_{node_id}"
+    if shard_index is not None:
+        name += f"_shard{shard_index}"
+    return os.path.join(log_dir, name + ".log")
+
+def journal_path():
+    """Fichier journal de ce processus (un par nœud et par shard, ils peuvent partager un dossier)."""
+    name = "rooms_journal"
+    if node_id is not None:
+        name += f"_{node_id}"
+    if shard_index is not None:
+        name += f"_shard{shard_index}"
+    return os.path.join("data", name + ".jsonl")
+
+def new_room_id():
+    """Génère un ID de salle ; en mode shardé, l'ID est choisi pour être routé vers ce shard.
+
+    En mode cluster, l'ID est préfixé par l'ID du nœud pour que tout nœud sache où le router.
+    """
+    while True:
+        room_id = str(uuid.uuid4())[:8]
+        if node_id is not None:
+            room_id = f"{node_id}-{room_id}"
+        if shard_index is None or shard_for_key(room_id) == shard_index:
+            return room_id
 
 class Room:
     def __init__(self, host_id, host_name, host_fighter):
-        self.id = str(uuid.uuid4())[:8]  # ID court et unique
+        self.id = new_room_id()  # ID court et unique
         self.host_id = host_id
         self.players = {
             host_id: {
@@ -98,14 +250,19 @@ class Room:
             }
         }
         self.game_state = {}
+        self.update_count = 0  # Nombre de UPDATE_STATE reçus (débit mesuré par les métriques)
         self.created_at = time.time()
         self.last_activity = time.time()
-        self.match_history = []
+        self.match_history = MatchHistory(MATCH_HISTORY_SIZE)
         self.round_number = 0
         self.status = "waiting"  # waiting, playing, finished
+        self.result_claims = {}  # Vainqueur déclaré par chaque joueur pour le match en cours
+        self.registry = None  # Renseigné par RoomRegistry à l'ajout de la salle
+        self._changed()
         
         stats.total_rooms_created += 1
-        logging.info(f"Nouvelle salle créée: {self.id} par {host_name} avec UUID {self.players[host_id]['uuid']}")
+        logging.info(f"Nouvelle salle créée: {self.id} par {host_name} avec UUID {self.players[host_id]['uuid']}",
+                     extra={"room": self.id})
     
     def add_player(self, player_id, player_name, fighter_type, ip_address=None, player_uuid=None):
         if len(self.players) >= 2:
@@ -120,34 +277,48 @@ class Room:
             "uuid": player_uuid or str(uuid.uuid4()),  # Utiliser l'UUID fourni ou en générer un nouveau
             "score": 0
         }
-        self.last_activity = time.time()
+        self.touch()
+        self._changed()
         return True
     
     def remove_player(self, player_id):
         if player_id in self.players:
             del self.players[player_id]
-            self.last_activity = time.time()
+            self.touch()
+            self._changed()
             return True
         return False
     
+    def touch(self):
+        """Note une activité dans la salle et repousse son expiration."""
+        self.last_activity = time.time()
+        if self.registry is not None:
+            self.registry.touch(self)
+    
+    def _changed(self):
+        """Met à jour l'adversaire de chaque joueur et les index du registre."""
+        player_ids = list(self.players)
+        self.opponent_of = {pid: other for pid in player_ids for other in player_ids if other != pid}
+        if self.registry is not None:
+            self.registry.reindex(self)
+    
     def update_player_state(self, player_id, game_state):
         if player_id in self.players:
             self.game_state[player_id] = game_state
             self.players[player_id]["last_active"] = time.time()
-            self.last_activity = time.time()
+            self.update_count += 1
+            self.touch()
             return True
         return False
     
     def get_opponent_state(self, player_id):
-        for pid in self.players:
-            if pid != player_id and pid in self.game_state:
-                return self.game_state[pid]
-        return None
+        opponent_id = self.opponent_of.get(player_id)
+        return self.game_state.get(opponent_id) if opponent_id else None
     
     def set_player_ready(self, player_id, ready=True):
         if player_id in self.players:
             self.players[player_id]["ready"] = ready
-            self.last_activity = time.time()
+            self.touch()
             
             # Si les deux joueurs sont prêts, commencer le match
             if ready and len(self.players) == 2:
@@ -155,32 +326,44 @@ class Room:
                 if all_ready and self.status == "waiting":
                     self.status = "playing"
                     self.round_number += 1
+                    self.result_claims = {}
+                    self._changed()
                     logging.info(f"Match commencé dans la salle {self.id}, round {self.round_number}")
             
             return True
         return False
     
     def is_opponent_ready(self, player_id):
-        for pid, player in self.players.items():
-            if pid != player_id:
-                return player.get("ready", False)
-        return False
+        opponent_id = self.opponent_of.get(player_id)
+        return self.players[opponent_id].get("ready", False) if opponent_id else False
     
     def get_opponent_id(self, player_id):
-        for pid in self.players:
-            if pid != player_id:
-                return pid
-        return None
+        return self.opponent_of.get(player_id)
     
     def get_host_fighter_type(self):
         return self.players[self.host_id]["fighter_type"]
     
-    def get_host_uuid(self):
-        return self.players[self.host_id]["uuid"]
+    def claim_result(self, player_id, winner_id):
+        """Note le vainqueur déclaré par un joueur pour le match en cours.
+
+        Retourne None tant que l'adversaire n'a rien déclaré, puis True si les deux déclarations
+        concordent, False sinon : un joueur seul ne peut pas s'attribuer une victoire.
+        """
+        self.result_claims[player_id] = winner_id
+        if len(self.result_claims) < 2:
+            return None
+        return len(set(self.result_claims.values())) == 1
+    
+    def end_match(self):
+        """Termine le match en cours : il faudra que les deux joueurs soient de nouveau prêts."""
+        self.status = "waiting"
+        self.result_claims = {}
+        for player in self.players.values():
+            player["ready"] = False
     
     def record_match_result(self, winner_id, loser_id, match_duration):
-        """Enregistre le résultat d'un match."""
-        if winner_id in self.players and loser_id in self.players:
+        """Enregistre le résultat du match en cours."""
+        if self.status == "playing" and winner_id in self.players and loser_id in self.players:
             result = {
                 "winner": self.players[winner_id]["name"],
                 "loser": self.players[loser_id]["name"],
@@ -193,7 +376,8 @@ class Room:
             
             self.match_history.append(result)
             self.players[winner_id]["score"] += 1
-            self.status = "waiting"
+            self.end_match()
+            self._changed()
             
             stats.total_matches_played += 1
             logging.info(f"Match terminé dans la salle {self.id}: {result['winner']} a gagné contre {result['loser']} en {result['duration']} secondes")
@@ -204,10 +388,45 @@ class Room:
     def is_empty(self):
         return len(self.players) == 0
     
-    def is_stale(self, max_age=3600):  # 1 heure par défaut
-        inactive_time = time.time() - self.last_activity
-        return inactive_time > max_age or time.time() - self.created_at > max_age * 3
+    def is_stale(self, max_age=ROOM_MAX_IDLE):  # 1 heure par défaut
+        return time.time() > self.expires_at(max_age)
+    
+    def expires_at(self, max_age=ROOM_MAX_IDLE):
+        """Date d'expiration : inactivité prolongée ou salle trop ancienne."""
+        return min(self.last_activity + max_age, self.created_at + max_age * 3)
     
+    def snapshot(self):
+        """État complet de la salle, tel qu'écrit dans le journal."""
+        return {
+            "id": self.id,
+            "host_id": self.host_id,
+            "players": self.players,
+            "created_at": self.created_at,
+            "last_activity": self.last_activity,
+            "match_history": self.match_history.to_dict(),
+            "round_number": self.round_number,
+            "status": self.status
+        }
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Recrée une salle depuis le journal (sans compter une nouvelle création)."""
+        room = cls.__new__(cls)
+        room.id = data["id"]
+        room.host_id = data["host_id"]
+        room.players = data["players"]
+        room.game_state = {}
+        room.update_count = 0
+        room.created_at = data["created_at"]
+        room.last_activity = data["last_activity"]
+        room.match_history = MatchHistory.from_dict(data["match_history"], MATCH_HISTORY_SIZE)
+        room.round_number = data["round_number"]
+        room.status = data["status"]
+        room.result_claims = {}  # Non persisté : les joueurs redéclarent après un redémarrage
+        room.registry = None
+        room._changed()
+        return room
+
     def to_dict(self):
         """Convertit la salle en dictionnaire pour l'API."""
         return {
@@ -218,16 +437,17 @@ class Room:
             "created_at": datetime.fromtimestamp(self.created_at).strftime('%Y-%m-%d %H:%M:%S'),
             "last_activity": datetime.fromtimestamp(self.last_activity).strftime('%Y-%m-%d %H:%M:%S'),
             "round_number": self.round_number,
-            "match_history_count": len(self.match_history)
+            "match_history_count": self.match_history.total
         }
 
 def handle_client(client_socket, client_address):
     """Gère les connexions des clients."""
     global active_connections, total_connections
     
-    active_connections += 1
-    total_connections += 1
-    stats.total_connections += 1
+    with connections_lock:
+        active_connections += 1
+        total_connections += 1
+        stats.total_connections += 1
     
     connection_time = time.time()
     connection_history.append({
@@ -237,14 +457,20 @@ def handle_client(client_socket, client_address):
         "datetime": datetime.fromtimestamp(connection_time).strftime('%Y-%m-%d %H:%M:%S')
     })
     
+    # Les réponses d'erreur passent aussi par send_response : elles comptent dans les métriques
+    action = None
+    started = time.perf_counter()
     try:
-        client_socket.settimeout(10)  # Timeout de 10 secondes
-        data = client_socket.recv(4096).decode('utf-8')
+        client_socket.settimeout(REQUEST_READ_TIMEOUT)
+        data = client_socket.recv(4096)
+        started = time.perf_counter()
+        metrics.inc("pythfighter_received_bytes_total", len(data))
+        data = data.decode('utf-8')
         
         # Simple connexion de test
         if data == "CONNECT":
             client_socket.sendall("CONNECTED".encode('utf-8'))
-            logging.info(f"Client connecté pour test depuis {client_address[0]}:{client_address[1]}")
+            logging.debug(f"Client connecté pour test depuis {client_address[0]}:{client_address[1]}")
             return
         
         # Traitement des commandes JSON
@@ -252,59 +478,170 @@ def handle_client(client_socket, client_address):
             request = json.loads(data)
             action = request.get("action", "")
             
+            # Limite par joueur (avant la génération d'UUID : un UUID neuf aurait toujours un seau plein)
+            player_key = request.get("player_uuid") or request.get("player_id") or request.get("client_id")
+            if player_key:
+                retry_after = player_limiter.acquire(str(player_key))
+                if retry_after:
+                    metrics.inc("pythfighter_rejected_total", reason="player_rate")
+                    send_response(client_socket, busy_response("Trop de requêtes pour ce joueur", retry_after),
+                                  action, started)
+                    return
+            
             # Ajouter l'adresse IP à la requête
             request["ip_address"] = client_address[0]
             
             # Vérifier si un UUID est fourni, sinon en générer un
             if "player_uuid" not in request and action in ["CREATE_ROOM", "JOIN_ROOM"]:
                 request["player_uuid"] = str(uuid.uuid4())
-                logging.info(f"UUID généré pour le client {client_address[0]}: {request['player_uuid']}")
+                logging.debug(f"UUID généré pour le client {client_address[0]}: {request['player_uuid']}")
             
-            if action == "CREATE_ROOM":
-                response = create_room(request)
-            elif action == "JOIN_ROOM":
-                response = join_room(request)
-            elif action == "LEAVE_ROOM":
-                response = leave_room(request)
-            elif action == "UPDATE_STATE":
-                response = update_state(request)
-            elif action == "GET_OPPONENT_STATE":
-                response = get_opponent_state(request)
-            elif action == "SET_READY":
-                response = set_ready(request)
-            elif action == "CHECK_OPPONENT_READY":
-                response = check_opponent_ready(request)
-            elif action == "RECORD_MATCH_RESULT":
-                response = record_match_result(request)
-            elif action == "LIST_ROOMS":
-                response = list_rooms(request)
-            elif action == "GET_ROOM_INFO":
-                response = get_room_info(request)
-            else:
-                response = {"status": "error", "message": "Action non reconnue"}
+            # Le classement est tenu par ce processus (l'accepteur en mode shardé), pas par les salles.
+            # En cluster, chaque nœud a le sien (voir main) : les réponses indiquent alors le nœud
+            if action == "MATCHMAKE":
+                request["rating"] = ratings.rating_of(request.get("player_uuid"))
+            
+            response = cluster_redirect(action, request) if node_id is not None else None
+            if response is None and action in ("LEADERBOARD", "GET_RATING"):
+                response = get_leaderboard(request) if action == "LEADERBOARD" else get_rating(request)
+            if response is None:
+                if shard_count > 1:
+                    response = route_request(action, request)
+                else:
+                    with rooms_lock:
+                        response = process_request(action, request)
+            
+            if action == "RECORD_MATCH_RESULT" and response.get("status") == "success":
+                # Les UUID servent de clés au classement mais ne sont pas renvoyés au client
+                ratings.submit(response.pop("winner_uuid"), response["winner"],
+                               response.pop("loser_uuid"), response["loser"])
+            
+            # Le client s'adresse ensuite directement au nœud propriétaire de la salle
+            if (node_id is not None and action in ("CREATE_ROOM", "JOIN_ROOM", "MATCHMAKE")
+                    and response.get("status") in ("success", "matched")):
+                response["node"] = dict(node_address, node_id=node_id)
             
-            client_socket.sendall(json.dumps(response).encode('utf-8'))
+            send_response(client_socket, response, action, started)
             
         except json.JSONDecodeError:
-            client_socket.sendall(json.dumps({"status": "error", "message": "Format JSON invalide"}).encode('utf-8'))
+            send_response(client_socket, {"status": "error", "message": "Format JSON invalide"}, None, started)
     
     except socket.timeout:
         logging.warning(f"Timeout de connexion pour {client_address[0]}:{client_address[1]}")
         try:
-            client_socket.sendall(json.dumps({"status": "error", "message": "Timeout de connexion"}).encode('utf-8'))
-        except:
+            send_response(client_socket, {"status": "error", "message": "Timeout de connexion"}, action, started)
+        except OSError:
             pass
     
     except Exception as e:
         logging.error(f"Erreur lors du traitement de la connexion de {client_address[0]}:{client_address[1]}: {e}")
         try:
-            client_socket.sendall(json.dumps({"status": "error", "message": str(e)}).encode('utf-8'))
-        except:
+            send_response(client_socket, {"status": "error", "message": str(e)}, action, started)
+        except OSError:
             pass
     
     finally:
         client_socket.close()
-        active_connections -= 1
+        with connections_lock:
+            active_connections -= 1
+
+def busy_response(message, retry_after):
+    return {"status": "busy", "message": message, "retry_after": round(retry_after, 3)}
+
+def reject_connection(client_socket, reason, message, retry_after):
+    """Refuse une connexion sans la traiter ; appelé par le thread d'acceptation, donc sans jamais bloquer."""
+    metrics.inc("pythfighter_rejected_total", reason=reason)
+    try:
+        client_socket.setblocking(False)
+        try:
+            # Lire la requête déjà arrivée : fermer avec des données non lues enverrait un RST au client
+            client_socket.recv(4096)
+        except BlockingIOError:
+            pass
+        client_socket.send(json.dumps(busy_response(message, retry_after)).encode('utf-8'))
+    except OSError:
+        pass
+    finally:
+        client_socket.close()
+
+def request_worker():
+    """Thread du pool : traite les connexions acceptées, dans l'ordre d'arrivée."""
+    while True:
+        client_socket, client_address, accepted_at = pending_requests.get()
+        if time.monotonic() - accepted_at > MAX_QUEUE_WAIT:
+            reject_connection(client_socket, "queue_timeout", "Serveur surchargé, réessayez plus tard",
+                              BUSY_RETRY_AFTER)
+            continue
+        handle_client(client_socket, client_address)
+
+def dispatch_connection(client_socket, client_address):
+    """Thread d'acceptation : limite par IP puis mise en file pour le pool, ou refus immédiat."""
+    retry_after = ip_limiter.acquire(client_address[0])
+    if retry_after:
+        reject_connection(client_socket, "ip_rate", "Trop de requêtes depuis cette adresse", retry_after)
+        return
+    try:
+        pending_requests.put_nowait((client_socket, client_address, time.monotonic()))
+    except queue.Full:
+        reject_connection(client_socket, "queue_full", "Serveur surchargé, réessayez plus tard", BUSY_RETRY_AFTER)
+
+def start_side_thread(handler, client_socket):
+    """Ping et stats : un thread par connexion, mais au plus MAX_PING_THREADS à la fois."""
+    if not side_threads.acquire(blocking=False):
+        client_socket.close()
+        return
+    
+    def run():
+        try:
+            handler(client_socket)
+        finally:
+            side_threads.release()
+    
+    threading.Thread(target=run, daemon=True).start()
+
+def send_response(client_socket, response, action, started):
+    """Envoie la réponse JSON et enregistre les métriques de la requête."""
+    payload = json.dumps(response).encode('utf-8')
+    client_socket.sendall(payload)
+    label = action if isinstance(action, str) and action in METRIC_ACTIONS else "OTHER"
+    metrics.inc("pythfighter_sent_bytes_total", len(payload))
+    metrics.inc("pythfighter_requests_total", action=label, status=response.get("status", "unknown"))
+    metrics.observe("pythfighter_request_duration_seconds", time.perf_counter() - started, action=label)
+
+def process_request(action, request):
+    """Exécute une requête JSON et retourne la réponse (appelé avec rooms_lock)."""
+    if action == "CREATE_ROOM":
+        response = create_room(request)
+    elif action == "JOIN_ROOM":
+        response = join_room(request)
+    elif action == "LEAVE_ROOM":
+        response = leave_room(request)
+    elif action == "UPDATE_STATE":
+        response = update_state(request)
+    elif action == "GET_OPPONENT_STATE":
+        response = get_opponent_state(request)
+    elif action == "SET_READY":
+        response = set_ready(request)
+    elif action == "CHECK_OPPONENT_READY":
+        response = check_opponent_ready(request)
+    elif action == "RECORD_MATCH_RESULT":
+        response = record_match_result(request)
+    elif action == "LIST_ROOMS":
+        response = list_rooms(request)
+    elif action == "GET_ROOM_INFO":
+        response = get_room_info(request)
+    elif action == "GET_MATCH_HISTORY":
+        response = get_match_history(request)
+    elif action == "MATCHMAKE":
+        response = matchmake(request)
+    elif action == "MATCHMAKE_CANCEL":
+        response = cancel_matchmaking(request)
+    elif action == "MATCHMAKE_STATUS":
+        response = dict(matchmaker.to_dict(), status="success")
+    else:
+        response = {"status": "error", "message": "Action non reconnue"}
+    
+    return response
 
 def create_room(request):
     """Crée une nouvelle salle de jeu."""
@@ -314,11 +651,7 @@ def create_room(request):
     player_uuid = request.get("player_uuid", str(uuid.uuid4()))
     
     # Vérifier si le joueur a déjà créé trop de salles (en utilisant UUID au lieu de l'IP)
-    existing_rooms = 0
-    for room in rooms.values():
-        for player in room.players.values():
-            if player.get("uuid") == player_uuid:
-                existing_rooms += 1
+    existing_rooms = rooms.count_rooms_for_uuid(player_uuid)
     
     if existing_rooms >= 3:
         return {"status": "error", "message": "Vous avez déjà créé trop de salles"}
@@ -331,6 +664,7 @@ def create_room(request):
     room.players[player_id]["uuid"] = player_uuid
     
     rooms[room.id] = room
+    journal.append("room_created", room=room.snapshot())
     
     return {
         "status": "success",
@@ -363,12 +697,13 @@ def join_room(request):
     success = room.add_player(player_id, player_name, fighter_type, ip_address, player_uuid)
     
     if success:
-        logging.info(f"Joueur {player_name} a rejoint la salle {room_id} avec UUID {player_uuid}")
+        journal.append("player_joined", room=room_id, player_id=player_id, player=room.players[player_id])
+        logging.info(f"Joueur {player_name} a rejoint la salle {room_id} avec UUID {player_uuid}",
+                     extra={"room": room_id})
         return {
             "status": "success",
             "player_id": player_id,
-            "host_fighter_type": room.get_host_fighter_type(),
-            "host_uuid": room.get_host_uuid()
+            "host_fighter_type": room.get_host_fighter_type()
         }
     else:
         return {"status": "error", "message": "Impossible de rejoindre la salle"}
@@ -383,10 +718,14 @@ def leave_room(request):
     
     room = rooms[room_id]
     success = room.remove_player(player_id)
+    if success:
+        journal.append("player_left", room=room_id, player_id=player_id)
     
     if room.is_empty():
         del rooms[room_id]
-        logging.info(f"Salle {room_id} fermée (vide)")
+        journal.append("room_closed", room=room_id, reason="empty")
+        stats.rooms_closed["empty"] = stats.rooms_closed.get("empty", 0) + 1
+        logging.info(f"Salle {room_id} fermée (vide)", extra={"room": room_id})
     
     return {"status": "success"}
 
@@ -442,6 +781,8 @@ def set_ready(request):
     success = room.set_player_ready(player_id, ready)
     
     if success:
+        journal.append("player_ready", room=room_id, player_id=player_id, ready=ready,
+                       status=room.status, round_number=room.round_number)
         return {"status": "success"}
     else:
         return {"status": "error", "message": "Joueur non trouvé dans la salle"}
@@ -463,37 +804,166 @@ def check_opponent_ready(request):
     }
 
 def record_match_result(request):
-    """Enregistre le résultat d'un match."""
+    """Déclare le résultat du match en cours, vu par un joueur (player_id, won).
+
+    Le résultat n'est enregistré qu'une fois par match, quand les deux joueurs l'ont déclaré et
+    que leurs déclarations concordent ; s'ils se contredisent, le match est annulé.
+    """
     room_id = request.get("room_id")
-    winner_id = request.get("winner_id")
-    loser_id = request.get("loser_id")
+    player_id = request.get("player_id")
+    won = request.get("won")
     match_duration = request.get("duration", 0)
     
     if not room_id or room_id not in rooms:
         return {"status": "error", "message": "Salle introuvable"}
     
     room = rooms[room_id]
+    if not isinstance(player_id, str) or player_id not in room.players:
+        return {"status": "error", "message": "Joueur non trouvé dans la salle"}
+    if not isinstance(won, bool):
+        return {"status": "error", "message": "Paramètres invalides"}
+    opponent_id = room.get_opponent_id(player_id)
+    if room.status != "playing" or opponent_id is None:
+        return {"status": "error", "message": "Aucun match en cours dans cette salle"}
+    
+    winner_id, loser_id = (player_id, opponent_id) if won else (opponent_id, player_id)
+    agreed = room.claim_result(player_id, winner_id)
+    if agreed is None:
+        return {"status": "pending"}
+    if not agreed:
+        room.end_match()
+        journal.append("match_void", room=room_id, round_number=room.round_number)
+        logging.warning(f"Résultats contradictoires dans la salle {room_id} : match annulé")
+        return {"status": "error", "message": "Résultats contradictoires : match annulé"}
+    
+    winner_uuid = room.players[winner_id]["uuid"]
+    loser_uuid = room.players[loser_id]["uuid"]
     success = room.record_match_result(winner_id, loser_id, match_duration)
     
     if success:
-        return {"status": "success"}
+        # match_count rend l'événement idempotent au rejeu
+        result = room.match_history.latest()
+        journal.append("match_result", room=room_id, winner_id=winner_id, result=result,
+                       match_count=room.match_history.total)
+        return {"status": "success", "winner": result["winner"], "loser": result["loser"],
+                "winner_uuid": winner_uuid, "loser_uuid": loser_uuid}
     else:
         return {"status": "error", "message": "Impossible d'enregistrer le résultat"}
 
+def rating_response(response):
+    """En cluster, le classement est propre à chaque nœud : la réponse indique lequel a répondu."""
+    if node_id is not None:
+        response["node_id"] = node_id
+    return response
+
+def get_leaderboard(request):
+    """Meilleurs joueurs du classement (pagination par offset)."""
+    try:
+        limit = max(0, min(int(request.get("limit", 10)), LEADERBOARD_LIMIT))
+        offset = max(0, int(request.get("offset", 0)))
+    except (TypeError, ValueError):
+        return {"status": "error", "message": "Paramètres invalides"}
+    return rating_response({"status": "success", "players": ratings.top(limit, offset), "total": len(ratings)})
+
+def get_rating(request):
+    """Classement et rang d'un joueur, identifié par son UUID."""
+    player_uuid = request.get("player_uuid")
+    if not isinstance(player_uuid, str) or not player_uuid:
+        return {"status": "error", "message": "UUID joueur requis"}
+    player = ratings.get(player_uuid)
+    if player is None:
+        player = {"name": request.get("player_name", "Joueur"), "rating": ratings.default_rating,
+                  "games": 0, "rank": None, "total": len(ratings)}
+    return rating_response({"status": "success", "player": player})
+
 def list_rooms(request):
     """Liste les salles disponibles."""
-    available_rooms = []
-    
-    for room_id, room in rooms.items():
-        if len(room.players) < 2 and room.status == "waiting":
-            room_info = room.to_dict()
-            available_rooms.append(room_info)
+    # Liste limitée : la réponse doit rester petite même avec des milliers de salles ouvertes
+    try:
+        limit = max(0, min(int(request.get("limit", LIST_ROOMS_LIMIT)), LIST_ROOMS_LIMIT))
+    except (TypeError, ValueError):
+        return {"status": "error", "message": "Paramètres invalides"}
+    available_rooms = [room.to_dict() for room in rooms.open_rooms(limit)]
     
     return {
         "status": "success",
-        "rooms": available_rooms
+        "rooms": available_rooms,
+        "total": rooms.open_room_count()
+    }
+
+def matchmake(request):
+    """Entre dans la file de matchmaking ou interroge son ticket (le client rappelle jusqu'à l'appariement).
+
+    Dès qu'un adversaire compatible est trouvé, la salle est créée au nom du joueur qui attendait
+    et le joueur courant la rejoint ; le premier récupère sa salle à sa prochaine interrogation.
+    """
+    player_uuid = request.get("player_uuid")
+    if not isinstance(player_uuid, str) or not player_uuid:
+        return {"status": "error", "message": "UUID joueur requis"}
+    
+    result = matchmaker.take_result(player_uuid)
+    if result is not None:
+        return result
+    
+    now = time.time()
+    ticket = matchmaker.poll(player_uuid, now)
+    if ticket is None:
+        if rooms.count_rooms_for_uuid(player_uuid) >= 3:
+            return {"status": "error", "message": "Vous avez déjà créé trop de salles"}
+        try:
+            rating = float(request.get("rating", MATCHMAKE_DEFAULT_RATING))
+        except (TypeError, ValueError):
+            return {"status": "error", "message": "Classement invalide"}
+        region = str(request.get("region") or MATCHMAKE_DEFAULT_REGION)
+        ticket = matchmaker.add(player_uuid, rating, region, request, now)
+    
+    opponent = matchmaker.find_opponent(ticket, now)
+    if opponent is not None:
+        host = create_room(opponent.request)
+        if host["status"] != "success":
+            # Seul l'adversaire est en cause : son ticket est retiré (il se réinscrit à sa prochaine
+            # interrogation), le joueur courant garde sa place, et aucun match n'est compté
+            logging.warning(f"Matchmaking: salle impossible à créer pour {opponent.player_uuid}: "
+                            f"{host.get('message')}")
+            matchmaker.remove(opponent.player_uuid)
+            opponent = None
+    if opponent is None:
+        return {
+            "status": "queued",
+            "wait": round(now - ticket.queued_at, 1),
+            "window": matchmaker.window(ticket, now),
+            "queued": len(matchmaker)
+        }
+    
+    guest = join_room(dict(ticket.request, room_id=host["room_id"]))
+    
+    matchmaker.record_match(opponent, ticket, {
+        "status": "matched",
+        "room_id": host["room_id"],
+        "player_id": host["player_id"],
+        "is_host": True,
+        "opponent": {"name": ticket.request.get("player_name", "Joueur"), "rating": ticket.rating}
+    }, now)
+    logging.info(f"Matchmaking: salle {host['room_id']} ({opponent.rating:.0f} contre {ticket.rating:.0f}, "
+                 f"{now - opponent.queued_at:.1f}s d'attente)")
+    return {
+        "status": "matched",
+        "room_id": host["room_id"],
+        "player_id": guest["player_id"],
+        "is_host": False,
+        "host_fighter_type": guest["host_fighter_type"],
+        "opponent": {"name": opponent.request.get("player_name", "Joueur"), "rating": opponent.rating}
     }
 
+def cancel_matchmaking(request):
+    """Quitte la file. Si l'appariement a déjà eu lieu, retourne la salle pour que le client la quitte."""
+    player_uuid = request.get("player_uuid")
+    result = matchmaker.take_result(player_uuid)
+    if result is not None:
+        return result
+    matchmaker.remove(player_uuid)
+    return {"status": "success"}
+
 def get_room_info(request):
     """Récupère les informations d'une salle."""
     room_id = request.get("room_id")
@@ -517,7 +987,30 @@ def get_room_info(request):
         "status": "success",
         "room": room.to_dict(),
         "players": players_info,
-        "match_history": room.match_history
+        "match_history": room.match_history.page(0, MATCH_HISTORY_PAGE_SIZE),
+        "match_summary": room.match_history.summary()
+    }
+
+def get_match_history(request):
+    """Page de l'historique des matchs d'une salle (du plus récent au plus ancien)."""
+    room_id = request.get("room_id")
+    
+    if not room_id or room_id not in rooms:
+        return {"status": "error", "message": "Salle introuvable"}
+    
+    try:
+        offset = max(0, int(request.get("offset", 0)))
+        limit = max(0, min(int(request.get("limit", MATCH_HISTORY_PAGE_SIZE)), MATCH_HISTORY_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return {"status": "error", "message": "Paramètres invalides"}
+    
+    history = rooms[room_id].match_history
+    return {
+        "status": "success",
+        "matches": history.page(offset, limit),
+        "offset": offset,
+        "available": len(history),  # Résultats encore conservés (les plus anciens sont oubliés)
+        "summary": history.summary()
     }
 
 def handle_ping(client_socket):
@@ -536,62 +1029,500 @@ def handle_stats(client_socket):
     try:
         data = client_socket.recv(1024)
         if data == b"STATS":
-            stats_data = stats.to_dict()
+            stats_data = collect_shard_stats() if shard_count > 1 else stats.to_dict()
+            if node_id is not None:
+                stats_data["node_id"] = node_id
+                with cluster_lock:
+                    stats_data["cluster_nodes"] = sorted(cluster_nodes)
             client_socket.sendall(json.dumps(stats_data).encode('utf-8'))
+        elif data.startswith(b"GET "):
+            # Requête HTTP d'un collecteur de métriques (Prometheus)
+            path = data.split(b" ", 2)[1]
+            if path == b"/metrics":
+                body = metrics_text().encode('utf-8')
+                status, content_type = "200 OK", "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                body = b"Not Found\n"
+                status, content_type = "404 Not Found", "text/plain; charset=utf-8"
+            header = f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n"
+            client_socket.sendall(header.encode('utf-8') + body)
     except Exception as e:
         logging.error(f"Erreur lors du traitement des statistiques: {e}")
     finally:
         client_socket.close()
 
+def room_metrics():
+    """Mesures des salles de ce processus (transmises à l'accepteur en mode shardé).
+
+    Le débit de mises à jour d'une salle est calculé depuis la mesure précédente.
+    """
+    global room_tick_samples
+    now = time.time()
+    rates = []
+    samples = {}
+    with rooms_lock:
+        for room in rooms.rooms_with_status("playing"):
+            previous = room_tick_samples.get(room.id)
+            if previous is not None and now > previous[1]:
+                rates.append((room.update_count - previous[0]) / (now - previous[1]))
+            samples[room.id] = (room.update_count, now)
+        data = {
+            "active_rooms": len(rooms),
+            "players": rooms.player_count(),
+            "rooms_created": stats.total_rooms_created,
+            "rooms_closed": dict(stats.rooms_closed)
+        }
+    room_tick_samples = samples
+    data["tick_rates"] = {"counts": bucket_counts(rates, TICK_RATE_BUCKETS), "sum": sum(rates), "count": len(rates)}
+    return data
+
+def metrics_text():
+    """Métriques au format d'exposition texte de Prometheus (GET /metrics sur le port stats)."""
+    if shard_count > 1:
+        parts = [forward_to_shard(index, {"action": "SHARD_METRICS"}) for index in range(shard_count)]
+        parts = [part for part in parts if "active_rooms" in part]
+    else:
+        parts = [room_metrics()]
+    
+    rooms_closed = {}
+    tick_counts = [0] * len(TICK_RATE_BUCKETS)
+    for part in parts:
+        for reason, count in part["rooms_closed"].items():
+            rooms_closed[reason] = rooms_closed.get(reason, 0) + count
+        tick_counts = [total + count for total, count in zip(tick_counts, part["tick_rates"]["counts"])]
+    
+    lines = metrics.render()
+    lines += format_metric("pythfighter_active_connections", "gauge", "Connexions clients en cours",
+                           [((), active_connections)])
+    lines += format_metric("pythfighter_pending_requests", "gauge", "Connexions acceptées en attente d'un thread",
+                           [((), pending_requests.qsize())])
+    lines += format_metric("pythfighter_active_rooms", "gauge", "Salles ouvertes",
+                           [((), sum(part["active_rooms"] for part in parts))])
+    lines += format_metric("pythfighter_active_players", "gauge", "Joueurs présents dans une salle",
+                           [((), sum(part["players"] for part in parts))])
+    lines += format_metric("pythfighter_rooms_created_total", "counter", "Salles créées",
+                           [((), sum(part["rooms_created"] for part in parts))])
+    lines += format_metric("pythfighter_rooms_closed_total", "counter", "Salles fermées, par raison",
+                           [((("reason", reason),), count) for reason, count in sorted(rooms_closed.items())])
+    lines += format_histogram("pythfighter_room_tick_rate",
+                              "Mises à jour d'état par seconde des salles en partie (depuis la mesure précédente)",
+                              TICK_RATE_BUCKETS,
+                              [((), tick_counts, sum(part["tick_rates"]["sum"] for part in parts),
+                                sum(part["tick_rates"]["count"] for part in parts))])
+    if shard_count > 1:
+        lines += format_metric("pythfighter_shards_up", "gauge", "Shards joignables", [((), len(parts))])
+    return "\n".join(lines) + "\n"
+
+last_stats_save = 0
+
+def run_maintenance():
+    """Supprime les salles expirées et sauvegarde les statistiques.
+
+    Retourne le délai avant le prochain passage (la prochaine échéance, au plus une minute).
+    """
+    global last_stats_save
+    current_time = time.time()
+    with rooms_lock:
+        for room_id in rooms.pop_expired(current_time):
+            del rooms[room_id]
+            journal.append("room_closed", room=room_id, reason="inactive")
+            stats.rooms_closed["inactive"] = stats.rooms_closed.get("inactive", 0) + 1
+            logging.info(f"Salle {room_id} supprimée (inactive)", extra={"room": room_id})
+        
+        matchmaker.prune(current_time)
+        
+        if current_time - last_stats_save >= STATS_SAVE_INTERVAL:
+            # Mettre à jour les statistiques
+            stats.update()
+            journal.append("stats", stats=stats.snapshot())
+            if journal.event_count > JOURNAL_COMPACT_THRESHOLD:
+                journal.compact(snapshot_events())
+            last_stats_save = current_time
+        
+        next_deadline = rooms.next_deadline()
+    
+    wait = CLEANUP_MAX_WAIT if next_deadline is None else next_deadline - time.time()
+    return min(CLEANUP_MAX_WAIT, max(1, wait))
+
 def clean_stale_rooms():
-    """Nettoie les salles inactives."""
+    """Supprime les salles expirées, au plus près de leur échéance (sans parcourir toutes les salles)."""
     while True:
         try:
-            current_time = time.time()
-            rooms_to_remove = []
-            
-            for room_id, room in rooms.items():
-                if room.is_stale():
-                    rooms_to_remove.append(room_id)
-            
-            for room_id in rooms_to_remove:
-                del rooms[room_id]
-                logging.info(f"Salle {room_id} supprimée (inactive)")
-            
-            # Mettre à jour les statistiques
-            stats.update()
-            
-            time.sleep(300)  # Vérifier toutes les 5 minutes
+            time.sleep(run_maintenance())
         except Exception as e:
             logging.error(f"Erreur lors du nettoyage des salles: {e}")
             time.sleep(60)
 
+def snapshot_events():
+    """Instantané de l'état courant sous forme d'événements de journal."""
+    now = time.time()
+    events = [{"type": "stats", "t": now, "stats": stats.snapshot()}]
+    for room in list(rooms.values()):
+        events.append({"type": "room_snapshot", "t": now, "room": room.snapshot()})
+    return events
+
+def apply_journal_event(event):
+    """Rejoue un événement du journal. Chaque événement est idempotent."""
+    event_type = event.get("type")
+    room = rooms.get(event.get("room")) if isinstance(event.get("room"), str) else None
+
+    if event_type == "stats":
+        stats.restore(event["stats"])
+    elif event_type in ("room_created", "room_snapshot"):
+        data = event["room"]
+        if event_type == "room_created" and data["id"] not in rooms:
+            stats.total_rooms_created += 1
+        rooms[data["id"]] = Room.from_snapshot(data)
+    elif room is None:
+        return
+    elif event_type == "player_joined":
+        room.players[event["player_id"]] = event["player"]
+        room.last_activity = event["t"]
+    elif event_type == "player_left":
+        room.players.pop(event["player_id"], None)
+        room.last_activity = event["t"]
+    elif event_type == "room_closed":
+        del rooms[event["room"]]
+    elif event_type == "player_ready":
+        if event["player_id"] in room.players:
+            room.players[event["player_id"]]["ready"] = event["ready"]
+        room.status = event["status"]
+        room.round_number = event["round_number"]
+        room.last_activity = event["t"]
+    elif event_type == "match_result":
+        if room.match_history.total < event["match_count"]:
+            room.match_history.append(event["result"])
+            if event["winner_id"] in room.players:
+                room.players[event["winner_id"]]["score"] += 1
+            room.end_match()
+            stats.total_matches_played += 1
+    elif event_type == "match_void":
+        if room.round_number == event["round_number"]:
+            room.end_match()
+
+    if room is not None and room.id in rooms:
+        room._changed()
+
+def load_journal():
+    """Reconstruit les salles et les statistiques depuis le journal, puis le compacte."""
+    start = time.perf_counter()
+    count = 0
+    for event in journal.replay():
+        try:
+            apply_journal_event(event)
+        except (KeyError, TypeError) as e:
+            logging.warning(f"Événement de journal invalide ignoré ({e}): {event}")
+        count += 1
+
+    journal.rewrite(snapshot_events())
+    journal.start()
+    logging.info(f"Journal rejoué: {count} événements, {len(rooms)} salles restaurées "
+                 f"en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+def recv_all(sock):
+    """Lit jusqu'à la fermeture de la connexion par l'autre côté."""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+def forward_to_shard(index, request):
+    """Transmet une requête au shard et retourne sa réponse."""
+    try:
+        with socket.create_connection((SHARD_HOST, SHARD_BASE_PORT + index), timeout=SHARD_TIMEOUT) as sock:
+            sock.sendall(json.dumps(request).encode('utf-8'))
+            sock.shutdown(socket.SHUT_WR)
+            return json.loads(recv_all(sock).decode('utf-8'))
+    except (OSError, ValueError) as e:
+        logging.error(f"Shard {index} injoignable: {e}")
+        return {"status": "error", "message": "Serveur temporairement indisponible, réessayez"}
+
+def route_request(action, request):
+    """Accepteur : envoie la requête au shard propriétaire de la salle."""
+    if action == "LIST_ROOMS":
+        try:
+            limit = max(0, min(int(request.get("limit", LIST_ROOMS_LIMIT)), LIST_ROOMS_LIMIT))
+        except (TypeError, ValueError):
+            return {"status": "error", "message": "Paramètres invalides"}
+        request = dict(request, limit=limit)  # Les shards reçoivent la limite déjà validée
+        available_rooms = []
+        total = 0
+        for index in range(shard_count):
+            response = forward_to_shard(index, request)
+            available_rooms.extend(response.get("rooms", []))
+            total += response.get("total", 0)
+        available_rooms.sort(key=lambda room: room["created_at"])
+        return {"status": "success", "rooms": available_rooms[:limit], "total": total}
+    
+    if action.startswith("MATCHMAKE"):
+        # Une seule file pour tous les joueurs : le shard 0 la gère et crée les salles appariées
+        return forward_to_shard(0, request)
+    
+    if action == "CREATE_ROOM":
+        # Le shard choisi génère un ID de salle qui sera routé vers lui
+        key = request.get("player_uuid")
+    else:
+        key = request.get("room_id")
+    index = shard_for_key(key) if isinstance(key, str) else 0
+    return forward_to_shard(index, request)
+
+def collect_shard_stats():
+    """Accepteur : additionne les statistiques de tous les shards."""
+    stats_data = stats.to_dict()
+    for key in ("total_rooms_created", "active_rooms", "total_matches_played", "peak_concurrent_rooms"):
+        stats_data[key] = 0
+    stats_data["shards_up"] = 0
+    for index in range(shard_count):
+        shard_stats = forward_to_shard(index, {"action": "SHARD_STATS"})
+        if "active_rooms" not in shard_stats:
+            continue
+        stats_data["shards_up"] += 1
+        if index == 0:
+            stats_data["matchmaking"] = shard_stats.get("matchmaking")
+        for key in ("total_rooms_created", "active_rooms", "total_matches_played", "peak_concurrent_rooms"):
+            stats_data[key] += shard_stats[key]
+    stats_data["shards"] = shard_count
+    return stats_data
+
+def handle_shard_connection(client_socket):
+    """Shard : traite une requête transmise par l'accepteur."""
+    try:
+        client_socket.settimeout(SHARD_TIMEOUT)
+        request = json.loads(recv_all(client_socket).decode('utf-8'))
+        action = request.get("action", "")
+        if action == "SHARD_STATS":
+            response = stats.to_dict()
+        elif action == "SHARD_METRICS":
+            response = room_metrics()
+        else:
+            response = process_request(action, request)
+    except Exception as e:
+        logging.error(f"Shard {shard_index}: erreur lors du traitement d'une requête: {e}")
+        response = {"status": "error", "message": str(e)}
+    try:
+        client_socket.sendall(json.dumps(response).encode('utf-8'))
+    except OSError as e:
+        logging.error(f"Shard {shard_index}: impossible de répondre à l'accepteur: {e}")
+    finally:
+        client_socket.close()
+
+def run_shard(index, count, node=None, base_port=SHARD_BASE_PORT):
+    """Processus shard : possède ses salles et les traite sur un seul thread, donc sans verrou."""
+    global shard_index, shard_count, journal, rooms_lock, node_id, SHARD_BASE_PORT
+    shard_index, shard_count, node_id, SHARD_BASE_PORT = index, count, node, base_port
+    rooms_lock = nullcontext()
+    journal = Journal(journal_path())
+    setup_logging(log_path())
+    
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    load_journal()
+    misplaced = sum(1 for room_id in rooms if shard_for_key(room_id) != index)
+    if misplaced:
+        logging.warning(f"Shard {index}: {misplaced} salles appartiennent à un autre shard "
+                        f"(le nombre de shards a changé ?), elles ne recevront plus de requêtes")
+    
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_socket.bind((SHARD_HOST, SHARD_BASE_PORT + index))
+    server_socket.listen(128)
+    logging.info(f"Shard {index}/{count} démarré sur {SHARD_HOST}:{SHARD_BASE_PORT + index} ({len(rooms)} salles)")
+    
+    next_maintenance = 0
+    while True:
+        if time.time() >= next_maintenance:
+            try:
+                next_maintenance = time.time() + run_maintenance()
+            except Exception as e:
+                logging.error(f"Shard {index}: erreur lors du nettoyage des salles: {e}")
+                next_maintenance = time.time() + CLEANUP_MAX_WAIT
+        
+        server_socket.settimeout(max(0.01, next_maintenance - time.time()))
+        try:
+            client, addr = server_socket.accept()
+        except socket.timeout:
+            continue
+        handle_shard_connection(client)
+
+def start_shard(index):
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=run_shard, args=(index, shard_count, node_id, SHARD_BASE_PORT),
+                              name=f"shard-{index}", daemon=True)
+    process.start()
+    shard_processes[index] = process
+
+def supervise_shards():
+    """Relance un shard arrêté ; il restaure ses salles depuis son journal."""
+    while True:
+        time.sleep(1)
+        for index, process in list(shard_processes.items()):
+            if not process.is_alive():
+                logging.error(f"Shard {index} arrêté (code {process.exitcode}), redémarrage...")
+                start_shard(index)
+
+def room_owner(room_id):
+    """ID du nœud propriétaire d'une salle (None pour un ID créé hors cluster)."""
+    if isinstance(room_id, str) and "-" in room_id:
+        return room_id.split("-", 1)[0]
+    return None
+
+def node_redirect(node):
+    return {"status": "redirect",
+            "node": {"node_id": node["node_id"], "host": node["host"], "port": node["port"],
+                     "ping_port": node["ping_port"]}}
+
+def local_room_count():
+    if shard_count > 1:
+        return collect_shard_stats()["active_rooms"]
+    return len(rooms)
+
+def cluster_redirect(action, request):
+    """Nœud du cluster : réponse de redirection si la requête concerne un autre nœud, sinon None."""
+    if action == "CREATE_ROOM":
+        # Un client déjà redirigé n'est jamais renvoyé ailleurs (les charges connues ont jusqu'à
+        # HEARTBEAT_INTERVAL de retard, deux nœuds pourraient se renvoyer le client)
+        if request.get("redirected"):
+            return None
+        with cluster_lock:
+            own = cluster_nodes.get(node_id)
+            others = [node for other_id, node in cluster_nodes.items() if other_id != node_id]
+        if own is None or not others:
+            return None
+        target = min(others, key=lambda node: node["rooms"])
+        if target["rooms"] + REBALANCE_MARGIN <= own["rooms"]:
+            return node_redirect(target)
+        return None
+    
+    owner = room_owner(request.get("room_id"))
+    if owner is None or owner == node_id:
+        return None
+    with cluster_lock:
+        node = cluster_nodes.get(owner)
+    if node is None:
+        return {"status": "error", "message": "Salle introuvable (serveur de la salle indisponible)"}
+    return node_redirect(node)
+
+def directory_request(request):
+    with socket.create_connection(directory_address, timeout=CLUSTER_TIMEOUT) as sock:
+        sock.sendall(json.dumps(request).encode('utf-8'))
+        return json.loads(recv_all(sock).decode('utf-8'))
+
+def cluster_heartbeat():
+    """Enregistre régulièrement ce nœud (avec sa charge) et récupère la liste des nœuds vivants."""
+    registered = False
+    while True:
+        try:
+            response = directory_request(dict(node_address, action="REGISTER_NODE", node_id=node_id,
+                                              rooms=local_room_count()))
+            if response.get("status") != "success":
+                logging.error(f"Enregistrement refusé par le répertoire: {response.get('message')}")
+            else:
+                with cluster_lock:
+                    cluster_nodes.clear()
+                    cluster_nodes.update((node["node_id"], node) for node in response["nodes"])
+                if not registered:
+                    logging.info(f"Nœud {node_id} enregistré auprès du répertoire "
+                                 f"({len(response['nodes'])} nœuds dans le cluster)")
+                    registered = True
+        except (OSError, ValueError) as e:
+            # On garde la dernière liste connue : les redirections restent possibles
+            logging.warning(f"Répertoire {directory_address[0]}:{directory_address[1]} injoignable: {e}")
+            registered = False
+        time.sleep(HEARTBEAT_INTERVAL)
+
+def parse_address(address, default_port):
+    host, _, port = address.rpartition(":")
+    if not host:
+        return address, default_port
+    return host, int(port)
+
 def signal_handler(sig, frame):
     """Gère l'arrêt propre du serveur."""
     logging.info("Signal d'arrêt reçu, fermeture du serveur...")
+    with rooms_lock:
+        journal.append("stats", stats=stats.snapshot())
+    journal.close()
+    ratings.close()
     sys.exit(0)
 
 def main():
     """Fonction principale du serveur."""
+    global shard_count, journal, node_id, node_address, directory_address
+    global PORT, PING_PORT, STATS_PORT, SHARD_BASE_PORT, pending_requests
+    parser = argparse.ArgumentParser(description="Serveur relais PythFighter")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Nombre de processus gérant les salles (1 = un seul processus)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--ping-port", type=int, default=None, help="Par défaut : port + 1")
+    parser.add_argument("--stats-port", type=int, default=None, help="Par défaut : port + 2")
+    parser.add_argument("--shard-base-port", type=int, default=SHARD_BASE_PORT)
+    parser.add_argument("--node-id", help="Active le mode cluster : ID court de ce nœud (sans '-')")
+    parser.add_argument("--directory", help="Adresse du répertoire du cluster (hôte[:port])")
+    parser.add_argument("--advertise", help="Adresse de ce nœud donnée aux clients (par défaut : nom d'hôte)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Threads traitant les requêtes")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING_REQUESTS,
+                        help="Connexions en attente d'un thread avant de répondre 'busy'")
+    parser.add_argument("--ip-rate", type=float, default=IP_RATE_LIMIT,
+                        help="Requêtes par seconde et par IP (0 = pas de limite, ex: tests de charge en local)")
+    parser.add_argument("--player-rate", type=float, default=PLAYER_RATE_LIMIT,
+                        help="Requêtes par seconde et par joueur (0 = pas de limite)")
+    args = parser.parse_args()
+    shard_count = max(1, args.shards)
+    PORT = args.port
+    PING_PORT = args.ping_port if args.ping_port is not None else PORT + 1
+    STATS_PORT = args.stats_port if args.stats_port is not None else PORT + 2
+    SHARD_BASE_PORT = args.shard_base_port
+    pending_requests = queue.Queue(maxsize=max(1, args.max_pending))
+    # Rafales autorisées : deux secondes de débit
+    ip_limiter.rate, ip_limiter.burst = args.ip_rate, 2 * args.ip_rate
+    player_limiter.rate, player_limiter.burst = args.player_rate, 2 * args.player_rate
+    
+    if args.node_id is not None:
+        if not args.node_id or "-" in args.node_id or not args.directory:
+            parser.error("--node-id doit être non vide, sans '-', et accompagné de --directory")
+        node_id = args.node_id
+        directory_address = parse_address(args.directory, DIRECTORY_PORT)
+        node_address = {"host": args.advertise or socket.gethostname(), "port": PORT, "ping_port": PING_PORT}
+        journal = Journal(journal_path())
+        setup_logging(log_path())
+        # Classement propre à chaque nœud : les résultats des salles d'un nœud n'alimentent que son
+        # classement, et LEADERBOARD / GET_RATING répondent pour le nœud qui les reçoit
+        ratings.journal = Journal(os.path.join("data", f"ratings_{node_id}.jsonl"))
+    
     # Configurer le gestionnaire de signaux
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
-    # Démarrer le thread de nettoyage
-    cleanup_thread = threading.Thread(target=clean_stale_rooms, daemon=True)
-    cleanup_thread.start()
+    ratings.load()
+    
+    if shard_count > 1:
+        # Ce processus ne fait qu'accepter les connexions et router les requêtes vers les shards
+        for index in range(shard_count):
+            start_shard(index)
+        supervisor_thread = threading.Thread(target=supervise_shards, daemon=True)
+        supervisor_thread.start()
+    else:
+        # Restaurer l'état sauvegardé avant d'accepter des connexions
+        load_journal()
+        
+        # Démarrer le thread de nettoyage
+        cleanup_thread = threading.Thread(target=clean_stale_rooms, daemon=True)
+        cleanup_thread.start()
     
     # Socket pour les connexions principales
     main_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     main_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     main_socket.bind((HOST, PORT))
-    main_socket.listen(10)
+    main_socket.listen(ACCEPT_BACKLOG)
     
     # Socket pour les pings
     ping_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     ping_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     ping_socket.bind((HOST, PING_PORT))
-    ping_socket.listen(10)
+    ping_socket.listen(ACCEPT_BACKLOG)
     
     # Socket pour les statistiques
     stats_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -599,16 +1530,23 @@ def main():
     stats_socket.bind((HOST, STATS_PORT))
     stats_socket.listen(5)
     
-    logging.info(f"Serveur démarré sur {HOST}:{PORT} (principal), {HOST}:{PING_PORT} (ping) et {HOST}:{STATS_PORT} (stats)")
+    logging.info(f"Serveur démarré sur {HOST}:{PORT} (principal), {HOST}:{PING_PORT} (ping) et {HOST}:{STATS_PORT} (stats)"
+                 + (f", {shard_count} shards" if shard_count > 1 else "")
+                 + (f", nœud {node_id} du cluster" if node_id is not None else ""))
+    
+    for _ in range(max(1, args.workers)):
+        threading.Thread(target=request_worker, daemon=True).start()
+    
+    if node_id is not None:
+        heartbeat_thread = threading.Thread(target=cluster_heartbeat, daemon=True)
+        heartbeat_thread.start()
     
     # Thread pour gérer les pings
     def handle_ping_connections():
         while True:
             try:
                 client, addr = ping_socket.accept()
-                ping_thread = threading.Thread(target=handle_ping, args=(client,))
-                ping_thread.daemon = True
-                ping_thread.start()
+                start_side_thread(handle_ping, client)
             except Exception as e:
                 logging.error(f"Erreur lors de l'acceptation d'une connexion ping: {e}")
     
@@ -620,9 +1558,7 @@ def main():
         while True:
             try:
                 client, addr = stats_socket.accept()
-                stats_thread = threading.Thread(target=handle_stats, args=(client,))
-                stats_thread.daemon = True
-                stats_thread.start()
+                start_side_thread(handle_stats, client)
             except Exception as e:
                 logging.error(f"Erreur lors de l'acceptation d'une connexion stats: {e}")
     
@@ -633,16 +1569,16 @@ def main():
     try:
         while True:
             client, addr = main_socket.accept()
-            logging.info(f"Nouvelle connexion de {addr[0]}:{addr[1]}")
-            
-            client_thread = threading.Thread(target=handle_client, args=(client, addr))
-            client_thread.daemon = True
-            client_thread.start()
+            logging.debug(f"Nouvelle connexion de {addr[0]}:{addr[1]}")
+            dispatch_connection(client, addr)
     
     except KeyboardInterrupt:
         logging.info("Arrêt du serveur...")
     
     finally:
+        journal.append("stats", stats=stats.snapshot())
+        journal.close()
+        ratings.close()
         main_socket.close()
         ping_socket.close()
         stats_socket.close()
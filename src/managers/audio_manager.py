@@ -0,0 +1,158 @@
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import GameSettings
+from managers.bundle import open_asset
+
+PRIORITY_LOW = 0  # Survol de menu, pas...
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2  # Coups, annonces : peuvent prendre la place d'un son moins important
+
+# Réglages par événement : (priorité, délai minimal en secondes entre deux lectures)
+EVENT_SETTINGS: Dict[str, Tuple[int, float]] = {
+    "hit": (PRIORITY_HIGH, 0.08),
+    "attack": (PRIORITY_NORMAL, 0.08),
+    "special": (PRIORITY_HIGH, 0.2),
+    "jump": (PRIORITY_NORMAL, 0.1),
+    "menu": (PRIORITY_LOW, 0.05),
+    "hover": (PRIORITY_LOW, 0.05),
+    "select": (PRIORITY_NORMAL, 0.1),
+    "victory": (PRIORITY_HIGH, 1.0),
+    "versus": (PRIORITY_HIGH, 1.0)
+}
+DEFAULT_EVENT_SETTINGS = (PRIORITY_NORMAL, 0.0)
+
+# Le réglage doit précéder pygame.init() pour que le mixeur soit ouvert directement avec ces paramètres
+pygame.mixer.pre_init(GameSettings.MIXER_FREQUENCY, -16, 2, GameSettings.MIXER_BUFFER)
+
+
+class SoundBank:
+    """Sons décodés une seule fois et partagés par tous les écrans.
+
+    Un son est désigné par son nom (fichier `<nom>.wav` du dossier des sons). Un fichier absent
+    est mémorisé comme tel : le disque n'est interrogé qu'une fois par nom.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._sounds: Dict[str, Optional[pygame.mixer.Sound]] = {}
+
+    def get(self, name: str) -> Optional[pygame.mixer.Sound]:
+        if name not in self._sounds:
+            path = os.path.join(self.directory, f"{name}.wav")
+            try:
+                self._sounds[name] = pygame.mixer.Sound(open_asset(path))
+            except (pygame.error, FileNotFoundError) as e:
+                logging.warning(f"Son {name} indisponible ({path}): {e}")
+                self._sounds[name] = None
+        return self._sounds[name]
+
+    def preload(self, names: Iterable[str]):
+        for name in names:
+            self.get(name)
+
+    def clear(self):
+        self._sounds.clear()
+
+
+class AudioEngine:
+    """Lecture des effets sonores sur un nombre fixe de canaux.
+
+    Chaque événement a une priorité et un délai minimal entre deux lectures (EVENT_SETTINGS) :
+    60 coups par seconde ne donnent qu'un son toutes les 80 ms. Quand tous les canaux sont
+    occupés, le son le moins prioritaire (le plus ancien à priorité égale) est coupé, à
+    condition de ne pas être plus prioritaire que le nouveau ; sinon le nouveau son est ignoré.
+    """
+
+    def __init__(self, voices: int = GameSettings.MIXER_VOICES, volume: float = GameSettings.SFX_VOLUME):
+        self.voices = voices
+        self.volume = volume
+        self.enabled = False
+        self.bank = SoundBank(str(GameSettings.SOUNDS_DIR))
+        self._channels: List[pygame.mixer.Channel] = []
+        self._playing: List[Tuple[int, float]] = []  # Par canal : (priorité, début de lecture)
+        self._last_played: Dict[str, float] = {}
+
+    def init(self) -> bool:
+        """Ouvre le mixeur (une seule fois) ; retourne False si le son est désactivé ou indisponible."""
+        if self.enabled:
+            return True
+        if not GameSettings.SOUND_ENABLED:
+            return False
+        try:
+            expected = (GameSettings.MIXER_FREQUENCY, -16, 2)
+            current = pygame.mixer.get_init()
+            if current is not None and current != expected:
+                # Mixeur déjà ouvert avec d'autres réglages (pygame.init() avant l'import de ce module)
+                pygame.mixer.quit()
+                current = None
+            if current is None:
+                pygame.mixer.init(GameSettings.MIXER_FREQUENCY, -16, 2, GameSettings.MIXER_BUFFER)
+            pygame.mixer.set_num_channels(self.voices)
+        except pygame.error as e:
+            logging.error(f"Mixeur audio indisponible: {e}")
+            return False
+        self._channels = [pygame.mixer.Channel(index) for index in range(self.voices)]
+        self._playing = [(PRIORITY_LOW, 0.0)] * self.voices
+        self.enabled = True
+        logging.info(f"Audio: {self.voices} canaux, {GameSettings.MIXER_FREQUENCY} Hz, "
+                     f"tampon de {GameSettings.MIXER_BUFFER} échantillons")
+        return True
+
+    def preload(self, names: Iterable[str]):
+        if self.enabled:
+            self.bank.preload(names)
+
+    def play(self, name: str, priority: Optional[int] = None, cooldown: Optional[float] = None,
+             volume: float = 1.0) -> Optional[pygame.mixer.Channel]:
+        """Joue un son de la banque ; retourne le canal utilisé, ou None si le son n'est pas joué."""
+        if not self.enabled:
+            return None
+        default_priority, default_cooldown = EVENT_SETTINGS.get(name, DEFAULT_EVENT_SETTINGS)
+        priority = default_priority if priority is None else priority
+        cooldown = default_cooldown if cooldown is None else cooldown
+
+        now = time.monotonic()
+        if now - self._last_played.get(name, float("-inf")) < cooldown:
+            return None
+        sound = self.bank.get(name)
+        if sound is None:
+            return None
+
+        index = self._find_channel(priority)
+        if index is None:
+            return None
+        channel = self._channels[index]
+        channel.set_volume(self.volume * volume)
+        channel.play(sound)
+        self._playing[index] = (priority, now)
+        self._last_played[name] = now
+        return channel
+
+    def _find_channel(self, priority: int) -> Optional[int]:
+        victim = None
+        for index, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return index
+            if victim is None or self._playing[index] < self._playing[victim]:
+                victim = index
+        # Vol de canal : le son en cours le moins prioritaire (puis le plus ancien)
+        if victim is not None and self._playing[victim][0] <= priority:
+            self._channels[victim].stop()
+            return victim
+        return None
+
+    def stop(self):
+        if self.enabled:
+            pygame.mixer.stop()
+
+
+# Moteur partagé par le jeu, le mode multijoueur et la sélection des personnages
+audio = AudioEngine()
@@ -0,0 +1,130 @@
+import io
+import logging
+import mmap
+import os
+import struct
+import sys
+import zipfile
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+# Exécution depuis l'archive distribuée (utils/build_dist.py). Le __main__ de l'archive renseigne
+# cette variable ; hors archive, les assets sont lus sur disque comme avant
+ARCHIVE_ENV = "PYTHFIGHTER_ARCHIVE"
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Points d'entrée lançables, par nom : module dans l'archive, script dans les sources
+ENTRY_POINTS = {
+    "launcher": "core.main",
+    "select": "core.selector",
+    "game": "core.game",
+    "replay": "core.replay",
+    "server": "core.server",
+}
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")  # En-tête local d'une entrée zip (30 octets)
+_LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+
+
+class AssetPack:
+    """Assets stockés sans compression dans l'archive, lus par une seule projection mémoire.
+
+    L'index (nom -> position, taille) est construit une fois depuis le répertoire central du zip ;
+    chaque lecture est ensuite une copie depuis la mémoire projetée, sans ouverture de fichier.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index: Dict[str, Tuple[int, int]] = {}
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with zipfile.ZipFile(f) as archive:
+                for info in archive.infolist():
+                    if info.compress_type == zipfile.ZIP_STORED and info.filename.startswith("assets/"):
+                        self.index[info.filename] = (self._data_offset(info.header_offset), info.file_size)
+
+    def _data_offset(self, header_offset: int) -> int:
+        fields = _LOCAL_HEADER.unpack_from(self._map, header_offset)
+        if fields[0] != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"En-tête local invalide à {header_offset}")
+        name_length, extra_length = fields[-2], fields[-1]
+        return header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def read(self, name: str) -> bytes:
+        offset, size = self.index[name]
+        return self._map[offset:offset + size]
+
+    def names(self) -> List[str]:
+        return list(self.index)
+
+
+def _open_pack() -> Optional[AssetPack]:
+    archive = os.getenv(ARCHIVE_ENV)
+    if not archive:
+        return None
+    try:
+        return AssetPack(archive)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        logging.error(f"Assets de l'archive {archive} illisibles: {e}")
+        return None
+
+
+pack = _open_pack()
+
+
+def asset_name(path: Union[str, os.PathLike]) -> Optional[str]:
+    """Nom d'un asset dans l'archive : chemin à partir du dossier "assets" (quel que soit le préfixe)."""
+    parts = os.path.normpath(os.fspath(path)).replace("\\", "/").split("/")
+    if "assets" not in parts:
+        return None
+    start = len(parts) - 1 - parts[::-1].index("assets")
+    return "/".join(parts[start:])
+
+
+def asset_exists(path: Union[str, os.PathLike]) -> bool:
+    if pack is not None:
+        return asset_name(path) in pack
+    return os.path.exists(path)
+
+
+def open_asset(path: Union[str, os.PathLike]) -> Union[str, os.PathLike, BinaryIO]:
+    """Source à passer aux chargeurs (pygame.image.load, mixer.Sound, Font, PIL...).
+
+    Hors archive, le chemin lui-même ; depuis l'archive, un fichier en mémoire. Un asset absent
+    de l'archive lève FileNotFoundError, comme un fichier absent du disque.
+    """
+    if pack is None:
+        return path
+    name = asset_name(path)
+    if name not in pack:
+        raise FileNotFoundError(f"Asset absent de l'archive: {path}")
+    return io.BytesIO(pack.read(name))
+
+
+def read_asset(path: Union[str, os.PathLike]) -> bytes:
+    source = open_asset(path)
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def list_assets(directory: Union[str, os.PathLike]) -> List[str]:
+    """Noms des fichiers d'un dossier d'assets (comme os.listdir, vide si le dossier n'existe pas)."""
+    if pack is None:
+        return os.listdir(directory) if os.path.isdir(directory) else []
+    prefix = f"{asset_name(directory)}/"
+    return [name[len(prefix):] for name in pack.names()
+            if name.startswith(prefix) and "/" not in name[len(prefix):]]
+
+
+def entry_command(entry: str, *args: str) -> List[str]:
+    """Commande qui lance un point d'entrée du jeu dans un nouveau processus (archive ou sources)."""
+    archive = os.getenv(ARCHIVE_ENV)
+    if archive:
+        return [sys.executable, archive, entry, *args]
+    script = os.path.join(SRC_DIR, *ENTRY_POINTS[entry].split(".")) + ".py"
+    return [sys.executable, script, *args]
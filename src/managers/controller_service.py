@@ -0,0 +1,215 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+# pygame (plus de 150 ms d'import) n'est chargé qu'au démarrage du thread : le launcher importe
+# ce module avant d'afficher sa fenêtre, et ne crée le service qu'après
+
+# Actions envoyées à l'interface (seuls les changements d'état en produisent)
+NAV_UP = "up"
+NAV_DOWN = "down"
+NAV_LEFT = "left"
+NAV_RIGHT = "right"
+BUTTON_CONFIRM = "confirm"  # Bouton A/X
+BUTTON_START = "start"
+
+CONFIRM_BUTTON = 0
+START_BUTTON = 7
+AXIS_THRESHOLD = 0.5
+NAV_REPEAT = 0.2  # Répétition (s) d'une direction maintenue, comme l'ancien délai de navigation
+WAIT_TIMEOUT = 100  # Attente maximale (ms) d'un événement : borne le délai de pause ou d'arrêt
+
+
+@dataclass
+class ControllerAction:
+    action: str
+    instance_id: int
+
+
+class ControllerService:
+    """Lecture des manettes dans un thread dédié, bloqué sur la file d'événements SDL.
+
+    Le thread ne lit rien tant qu'aucun événement n'arrive : pas de scrutation des boutons et
+    axes. Il traduit boutons, stick et croix en actions (NAV_*, BUTTON_*) placées dans une file
+    thread-safe, puis appelle `notify` pour que l'interface vienne les chercher avec `poll()`.
+    Une direction maintenue est répétée toutes les NAV_REPEAT secondes.
+
+    SDL veut que les événements soient lus par le thread qui a initialisé la vidéo (sous Windows,
+    les messages des périphériques arrivent dans la file de ce thread) : l'affichage et les
+    manettes sont donc initialisés et fermés par le thread lui-même, jamais par l'interface.
+    `joysticks` n'est rempli qu'une fois le thread démarré.
+
+    La file d'événements pygame est globale au processus : `pause()` ferme l'affichage et les
+    manettes du thread avant qu'un jeu pygame ne tourne dans le même processus (le jeu les
+    initialise alors sur son propre thread), `resume()` les rouvre ensuite.
+    """
+
+    def __init__(self, notify: Optional[Callable[[], None]] = None):
+        self.notify = notify
+        self.actions: "queue.Queue[ControllerAction]" = queue.Queue()
+        self.joysticks: Dict[int, "pygame.joystick.Joystick"] = {}
+        self._directions: Dict[int, Dict[int, int]] = {}  # instance_id -> {axe: -1/0/1}
+        self._held: Optional[ControllerAction] = None
+        self._next_repeat = 0.0
+        self._running = threading.Event()
+        self._paused = threading.Event()
+        self._idle = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._open = False  # Affichage et manettes initialisés par le thread
+
+    @property
+    def primary_joystick(self) -> Optional["pygame.joystick.Joystick"]:
+        return next(iter(list(self.joysticks.values())), None)  # Dictionnaire modifié par le thread
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="controller-input", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def pause(self):
+        """Suspend la lecture et attend que le thread ait fermé l'affichage et les manettes."""
+        self._idle.clear()
+        self._paused.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._idle.wait(timeout=1)
+
+    def resume(self):
+        self._paused.clear()
+
+    def poll(self) -> List[ControllerAction]:
+        """Actions reçues depuis le dernier appel (à appeler depuis le thread de l'interface)."""
+        actions = []
+        while True:
+            try:
+                actions.append(self.actions.get_nowait())
+            except queue.Empty:
+                return actions
+
+    def _run(self):
+        import pygame
+
+        try:
+            while self._running.is_set():
+                if self._paused.is_set():
+                    self._close_devices()
+                    self._idle.set()
+                    time.sleep(WAIT_TIMEOUT / 1000)
+                    continue
+                if not self._open:
+                    try:
+                        self._open_devices()
+                    except pygame.error as e:
+                        logging.error(f"Manettes indisponibles: {e}")
+                        return
+                timeout = WAIT_TIMEOUT
+                if self._held is not None:
+                    timeout = max(1, min(timeout, int((self._next_repeat - time.monotonic()) * 1000)))
+                try:
+                    event = pygame.event.wait(timeout)
+                except pygame.error as e:
+                    logging.error(f"Lecture des manettes interrompue: {e}")
+                    return
+                if event.type != pygame.NOEVENT:
+                    self._handle(event)
+                if self._held is not None and time.monotonic() >= self._next_repeat:
+                    self._emit(self._held.action, self._held.instance_id, repeat=True)
+        finally:
+            self._close_devices()
+
+    def _open_devices(self):
+        import pygame
+
+        # Le sous-système vidéo porte la file d'événements ; aucune fenêtre pygame n'est ouverte
+        pygame.display.init()
+        pygame.joystick.init()
+        for index in range(pygame.joystick.get_count()):
+            self._add_joystick(index)
+        self._open = True
+        logging.info(f"Nombre de manettes détectées : {len(self.joysticks)}")
+
+    def _close_devices(self):
+        if not self._open:
+            return
+        import pygame
+
+        self.joysticks.clear()
+        self._directions.clear()
+        self._held = None
+        pygame.joystick.quit()
+        pygame.display.quit()
+        self._open = False
+
+    def _handle(self, event):
+        import pygame
+
+        if event.type == pygame.JOYDEVICEADDED:
+            # Aussi reçu au démarrage pour les manettes déjà branchées : déjà connues, elles sont ignorées
+            self._add_joystick(event.device_index)
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            self.joysticks.pop(event.instance_id, None)
+            self._directions.pop(event.instance_id, None)
+            if self._held is not None and self._held.instance_id == event.instance_id:
+                self._held = None
+        elif event.type == pygame.JOYBUTTONDOWN:
+            if event.button == CONFIRM_BUTTON:
+                self._emit(BUTTON_CONFIRM, event.instance_id)
+            elif event.button == START_BUTTON:
+                self._emit(BUTTON_START, event.instance_id)
+        elif event.type == pygame.JOYAXISMOTION and event.axis in (0, 1):
+            direction = 0 if abs(event.value) <= AXIS_THRESHOLD else (1 if event.value > 0 else -1)
+            self._set_direction(event.instance_id, event.axis, direction)
+        elif event.type == pygame.JOYHATMOTION:
+            x, y = event.value
+            self._set_direction(event.instance_id, 0, x)
+            self._set_direction(event.instance_id, 1, -y)  # Croix : y positif vers le haut
+
+    def _set_direction(self, instance_id: int, axis: int, direction: int):
+        directions = self._directions.setdefault(instance_id, {})
+        if directions.get(axis, 0) == direction:
+            return
+        directions[axis] = direction
+        if direction:
+            if axis == 0:
+                self._emit(NAV_LEFT if direction < 0 else NAV_RIGHT, instance_id, hold=True)
+            else:
+                self._emit(NAV_UP if direction < 0 else NAV_DOWN, instance_id, hold=True)
+        elif self._held is not None and self._held.instance_id == instance_id:
+            self._held = None
+
+    def _emit(self, action: str, instance_id: int, hold: bool = False, repeat: bool = False):
+        entry = ControllerAction(action, instance_id)
+        if hold:
+            self._held = entry
+        if hold or repeat:
+            self._next_repeat = time.monotonic() + NAV_REPEAT
+        self.actions.put(entry)
+        if self.notify is not None:
+            try:
+                self.notify()
+            except Exception as e:
+                logging.debug(f"Notification de l'interface impossible: {e}")
+
+    def _add_joystick(self, device_index: int):
+        import pygame
+
+        try:
+            joystick = pygame.joystick.Joystick(device_index)
+            joystick.init()
+        except pygame.error as e:
+            logging.error(f"Manette {device_index} inutilisable: {e}")
+            return
+        if joystick.get_instance_id() in self.joysticks:
+            return
+        self.joysticks[joystick.get_instance_id()] = joystick
+        logging.info(f"Manette {joystick.get_instance_id()} : {joystick.get_name()}")
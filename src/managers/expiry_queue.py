@@ -0,0 +1,69 @@
+import heapq
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class ExpiryQueue:
+    """File d'expiration (tas) avec rafraîchissement paresseux des échéances.
+
+    `touch` ne fait que mémoriser la nouvelle échéance (O(1)) : l'entrée du tas n'est replacée
+    que lorsqu'elle arrive en tête, c'est-à-dire au plus une fois par échéance écoulée et non à
+    chaque activité. Thread-safe.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}  # Échéance réelle de chaque clé
+        self._scheduled: Dict[Hashable, float] = {}  # Échéance de l'entrée valide dans le tas
+        self._counter = 0  # Départage les échéances égales sans comparer les clés
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Ajoute une clé ou change son échéance."""
+        with self._lock:
+            self._deadlines[key] = deadline
+            scheduled = self._scheduled.get(key)
+            # Une échéance plus tardive sera prise en compte quand l'entrée actuelle arrivera en tête
+            if scheduled is None or deadline < scheduled:
+                self._push(key, deadline)
+
+    touch = schedule
+
+    def remove(self, key: Hashable):
+        """Retire une clé (son entrée dans le tas est ignorée plus tard)."""
+        with self._lock:
+            self._deadlines.pop(key, None)
+            self._scheduled.pop(key, None)
+
+    def pop_expired(self, now: float) -> List[Hashable]:
+        """Retire et retourne les clés dont l'échéance est passée."""
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, _, key = heapq.heappop(self._heap)
+                if self._scheduled.get(key) != deadline:
+                    continue  # Entrée obsolète (clé retirée ou replacée)
+                actual = self._deadlines[key]
+                if actual <= now:
+                    del self._deadlines[key]
+                    del self._scheduled[key]
+                    expired.append(key)
+                else:
+                    self._push(key, actual)
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        """Prochaine échéance du tas (peut être antérieure à l'échéance réelle, jamais postérieure)."""
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def _push(self, key: Hashable, deadline: float):
+        self._counter += 1
+        self._scheduled[key] = deadline
+        heapq.heappush(self._heap, (deadline, self._counter, key))
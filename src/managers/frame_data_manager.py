@@ -0,0 +1,73 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from managers.bundle import read_asset
+
+FRAME_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'assets', 'characters', 'frame_data.json')
+
+# Délai d'une frame d'animation (s) quand le manifeste n'en donne pas
+DEFAULT_FRAME_DELAY = 0.1
+
+# Valeurs utilisées si un personnage n'apparaît pas dans le manifeste
+DEFAULT_FIGHTER_DATA = {
+    "directory": None,
+    "hitbox": {"width": 0.7, "height": 0.85},
+    "moves": {
+        "attack": {"startup": 4, "active": 6, "recovery": 20},
+        "special_attack": {"startup": 8, "active": 12, "recovery": 40, "cooldown": 240},
+    },
+    "animations": {},
+}
+
+# Le manifeste n'est lu qu'une seule fois par processus
+_frame_data: Optional[Dict] = None
+
+
+def load_frame_data(path: str = FRAME_DATA_PATH) -> Dict:
+    """Charge le manifeste des frames (généré par utils/build_frame_data.py)."""
+    global _frame_data
+    if _frame_data is None:
+        try:
+            _frame_data = json.loads(read_asset(path).decode("utf-8"))
+            logging.info(f"Frame data loaded: {len(_frame_data.get('fighters', {}))} fighters")
+        except (OSError, ValueError) as e:
+            logging.error(f"Error loading frame data {path}: {e}")
+            _frame_data = {"fighters": {}}
+    return _frame_data
+
+
+def get_fighter_frame_data(name: str) -> Dict:
+    """Retourne les données de frames d'un personnage (valeurs par défaut si absent)."""
+    fighter_data = load_frame_data()["fighters"].get(name)
+    if fighter_data is None:
+        logging.warning(f"No frame data for {name}, using defaults")
+        return dict(DEFAULT_FIGHTER_DATA, directory=name.lower())
+    return fighter_data
+
+
+def get_move(fighter_data: Dict, move: str) -> Dict:
+    return fighter_data["moves"].get(move) or DEFAULT_FIGHTER_DATA["moves"][move]
+
+
+def get_move_duration(fighter_data: Dict, move: str) -> int:
+    """Durée totale d'une attaque en frames (startup + active + recovery)."""
+    move_data = get_move(fighter_data, move)
+    return move_data["startup"] + move_data["active"] + move_data["recovery"]
+
+
+def get_move_cooldown(fighter_data: Dict, move: str) -> int:
+    """Frames avant de pouvoir relancer l'attaque (sa durée si le manifeste ne donne pas de cooldown)."""
+    return get_move(fighter_data, move).get("cooldown", get_move_duration(fighter_data, move))
+
+
+def get_active_window(fighter_data: Dict, move: str) -> Tuple[int, int]:
+    """Frames de l'attaque (depuis son début) pendant lesquelles elle peut toucher : [début, fin[."""
+    move_data = get_move(fighter_data, move)
+    return move_data["startup"], move_data["startup"] + move_data["active"]
+
+
+def get_frame_delays(fighter_data: Dict, action: str) -> List[float]:
+    """Délai (s) de chaque frame d'une animation, dans l'ordre des frames."""
+    return fighter_data["animations"].get(action, {}).get("delays", [])
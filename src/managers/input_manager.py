@@ -0,0 +1,244 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pygame
+
+# Actions de navigation des menus, issues du clavier comme de la manette
+MENU_UP = "up"
+MENU_DOWN = "down"
+MENU_SELECT = "select"
+MENU_BACK = "back"
+
+MENU_KEYS = {pygame.K_UP: MENU_UP, pygame.K_DOWN: MENU_DOWN, pygame.K_RETURN: MENU_SELECT, pygame.K_ESCAPE: MENU_BACK}
+MENU_BUTTONS = {0: MENU_SELECT, 1: MENU_BACK}
+
+
+@dataclass
+class InputFrame:
+    frame: int
+    time: float
+    word: int
+
+
+class InputHistory:
+    """Derniers mots d'entrée d'un joueur (tampon circulaire, une entrée par frame)."""
+
+    def __init__(self, size: int = 60):
+        self.size = size
+        self.frames: Deque[InputFrame] = deque(maxlen=size)
+
+    def push(self, frame: int, word: int, timestamp: Optional[float] = None):
+        self.frames.append(InputFrame(frame, time.perf_counter() if timestamp is None else timestamp, word))
+
+    def latest(self) -> int:
+        return self.frames[-1].word if self.frames else 0
+
+    def pressed(self, mask: int, index: int = -1) -> bool:
+        """Vrai si un des bits de `mask` passe à 1 sur la frame `index` (front montant)."""
+        if len(self.frames) < -index:
+            return False
+        previous = self.frames[index - 1].word if len(self.frames) > -index else 0
+        return bool(self.frames[index].word & mask) and not previous & mask
+
+    def words(self) -> List[int]:
+        return [entry.word for entry in self.frames]
+
+    def restore(self, words: Sequence[int], last_frame: int):
+        """Recharge l'historique d'un point de contrôle (horodatages non conservés)."""
+        self.frames.clear()
+        first_frame = last_frame - len(words) + 1
+        for offset, word in enumerate(words):
+            self.frames.append(InputFrame(first_frame + offset, 0.0, word))
+
+
+Step = Union[str, int]  # Masque de bits, ou direction relative ("forward" / "back")
+
+
+@dataclass(frozen=True)
+class Command:
+    name: str
+    steps: Tuple[Step, ...]
+    window: int  # Nombre maximum de frames entre la première et la dernière étape
+
+
+class CommandParser:
+    """Reconnaît des commandes (suites d'appuis, ex: arrière, avant, attaque) dans un historique.
+
+    Chaque étape doit être un nouvel appui (front montant), dans l'ordre, la dernière sur la
+    frame courante. Les directions relatives dépendent du côté vers lequel regarde le joueur :
+    `directions` donne, pour "forward" et "back", le masque correspondant à chaque orientation.
+    """
+
+    def __init__(self, commands: Iterable[Command], directions: Dict[str, Dict[int, int]]):
+        self.commands = list(commands)
+        self.directions = directions
+
+    def mask(self, step: Step, facing: int) -> int:
+        return self.directions[step][facing] if isinstance(step, str) else step
+
+    def match(self, history: InputHistory, facing: int) -> List[str]:
+        return [command.name for command in self.commands if self._matches(command, history, facing)]
+
+    def _matches(self, command: Command, history: InputHistory, facing: int) -> bool:
+        masks = [self.mask(step, facing) for step in command.steps]
+        if not history.pressed(masks[-1]):
+            return False
+        remaining = len(masks) - 2
+        index = -2
+        limit = -min(len(history.frames), command.window + 1)
+        while remaining >= 0 and index >= limit:
+            if history.pressed(masks[remaining], index):
+                remaining -= 1
+            index -= 1
+        return remaining < 0
+
+
+class InputManager:
+    """Entrées en direct du clavier et des manettes, tenues à jour par les événements pygame.
+
+    Rien n'est interrogé pendant la frame : `process_events` suit les touches et boutons
+    enfoncés, `sample` produit ensuite le mot d'entrée de chaque joueur. Un appui relâché avant
+    la fin de la frame compte quand même pour cette frame. Les manettes sont attribuées aux
+    joueurs dans l'ordre de connexion, et peuvent être branchées ou retirées en cours de partie.
+    """
+
+    def __init__(self, key_bindings: Dict[int, Dict[int, int]], pad_bits: Dict[str, int],
+                 pad_buttons: Dict[int, int], deadzone: float = 0.2,
+                 use_joysticks: bool = True):
+        self.key_bindings = key_bindings
+        self.players = sorted(key_bindings)
+        self.pad_bits = pad_bits  # "connected", "left", "right"
+        self.pad_buttons = pad_buttons  # bit -> bouton
+        self.deadzone = deadzone
+        self.use_joysticks = use_joysticks
+        self.joysticks: Dict[int, pygame.joystick.Joystick] = {}  # instance_id -> manette
+        self._pad_player: Dict[int, int] = {}  # instance_id -> joueur
+        self._key_to_bit = {key: (player, bit) for player, bindings in key_bindings.items()
+                            for bit, key in bindings.items()}
+        self._button_to_bit = {button: bit for bit, button in pad_buttons.items()}
+        self._keys_down = set()
+        self._held: Dict[int, int] = {player: 0 for player in self.players}  # boutons de manette enfoncés
+        self._axis: Dict[int, int] = {player: 0 for player in self.players}  # direction du stick
+        self._hat: Dict[int, int] = {player: 0 for player in self.players}  # direction de la croix
+        self._latched: Dict[int, int] = {player: 0 for player in self.players}  # appuis depuis la dernière frame
+        self._menu_actions: List[str] = []
+        self._menu_axis: Dict[int, int] = {}  # instance_id -> dernière direction verticale du stick
+
+        if use_joysticks:
+            for index in range(min(len(self.players), pygame.joystick.get_count())):
+                self._add_joystick(index)
+
+    @property
+    def controllers(self) -> List[pygame.joystick.Joystick]:
+        return list(self.joysticks.values())
+
+    def process_events(self, events: Iterable[pygame.event.Event]):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self._keys_down.add(event.key)
+                binding = self._key_to_bit.get(event.key)
+                if binding:
+                    self._latched[binding[0]] |= binding[1]
+                if event.key in MENU_KEYS:
+                    self._menu_actions.append(MENU_KEYS[event.key])
+            elif event.type == pygame.KEYUP:
+                self._keys_down.discard(event.key)
+            elif event.type in (pygame.WINDOWFOCUSLOST, pygame.ACTIVEEVENT):
+                # Les relâchements ne sont plus reçus sans le focus : ne rien laisser enfoncé
+                if event.type == pygame.WINDOWFOCUSLOST or not getattr(event, "gain", 1):
+                    self._keys_down.clear()
+            elif not self.use_joysticks:
+                continue
+            elif event.type == pygame.JOYDEVICEADDED:
+                self._add_joystick(event.device_index)
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                self._remove_joystick(event.instance_id)
+            elif event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+                self._pad_button(event)
+            elif event.type == pygame.JOYAXISMOTION:
+                self._pad_axis(event)
+            elif event.type == pygame.JOYHATMOTION:
+                self._pad_hat(event)
+
+    def sample(self) -> List[int]:
+        """Mots d'entrée de la frame, dans l'ordre des joueurs."""
+        words = []
+        for player in self.players:
+            word = self._latched[player]
+            for bit, key in self.key_bindings[player].items():
+                if key in self._keys_down:
+                    word |= bit
+            if player in self._pad_player.values():
+                word |= self.pad_bits["connected"] | self._held[player]
+                direction = self._hat[player] or self._axis[player]
+                if direction:
+                    word |= self.pad_bits["left"] if direction < 0 else self.pad_bits["right"]
+            self._latched[player] = 0
+            words.append(word)
+        return words
+
+    def flush(self):
+        """Oublie les appuis accumulés (changement d'écran) ; les touches tenues restent prises en compte."""
+        for player in self.players:
+            self._latched[player] = 0
+        self._menu_actions.clear()
+
+    def take_menu_actions(self) -> List[str]:
+        actions, self._menu_actions = self._menu_actions, []
+        return actions
+
+    def _add_joystick(self, device_index: int):
+        free = [player for player in self.players if player not in self._pad_player.values()]
+        if not free:
+            return
+        try:
+            joystick = pygame.joystick.Joystick(device_index)
+            joystick.init()
+        except pygame.error:
+            return
+        instance_id = joystick.get_instance_id()
+        if instance_id in self.joysticks:
+            return
+        self.joysticks[instance_id] = joystick
+        self._pad_player[instance_id] = free[0]
+
+    def _remove_joystick(self, instance_id: int):
+        player = self._pad_player.pop(instance_id, None)
+        self.joysticks.pop(instance_id, None)
+        self._menu_axis.pop(instance_id, None)
+        if player is not None:
+            self._held[player] = self._axis[player] = self._hat[player] = 0
+
+    def _pad_button(self, event):
+        player = self._pad_player.get(event.instance_id)
+        if event.type == pygame.JOYBUTTONDOWN and event.button in MENU_BUTTONS:
+            self._menu_actions.append(MENU_BUTTONS[event.button])
+        bit = self._button_to_bit.get(event.button)
+        if player is None or bit is None:
+            return
+        if event.type == pygame.JOYBUTTONDOWN:
+            self._held[player] |= bit
+            self._latched[player] |= bit
+        else:
+            self._held[player] &= ~bit
+
+    def _pad_axis(self, event):
+        if event.axis == 1:
+            # Navigation des menus au stick : une action par passage du seuil, pas de répétition par frame
+            direction = 0 if abs(event.value) <= 0.5 else (-1 if event.value < 0 else 1)
+            if direction and direction != self._menu_axis.get(event.instance_id):
+                self._menu_actions.append(MENU_UP if direction < 0 else MENU_DOWN)
+            self._menu_axis[event.instance_id] = direction
+        player = self._pad_player.get(event.instance_id)
+        if player is not None and event.axis == 0:
+            self._axis[player] = 0 if abs(event.value) <= self.deadzone else (-1 if event.value < 0 else 1)
+
+    def _pad_hat(self, event):
+        x, y = event.value
+        if y:
+            self._menu_actions.append(MENU_UP if y > 0 else MENU_DOWN)
+        player = self._pad_player.get(event.instance_id)
+        if player is not None:
+            self._hat[player] = x
@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Marqueurs internes envoyés au thread d'écriture
+_STOP = object()
+
+
+class _Compact:
+    def __init__(self, events: List[Dict]):
+        self.events = events
+
+
+class Journal:
+    """Journal append-only (une ligne JSON par événement) avec écritures groupées.
+
+    Les événements sont mis en file par les threads appelants et écrits par un thread dédié :
+    tout ce qui arrive pendant `flush_interval` est écrit en une fois et suivi d'un seul fsync.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05, max_batch: int = 1024):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.event_count = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+
+    def replay(self) -> Iterator[Dict]:
+        """Relit les événements du journal. Une dernière ligne tronquée (crash) est ignorée."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    logging.warning(f"Journal {self.path}: ligne {line_number} illisible, ignorée")
+                    continue
+                self.event_count += 1
+                yield event
+
+    def rewrite(self, events: List[Dict]):
+        """Remplace le journal par une liste d'événements (écriture atomique)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.event_count = len(events)
+
+    def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def append(self, event_type: str, **data):
+        """Ajoute un événement (non bloquant).
+
+        L'événement est sérialisé immédiatement : les objets passés peuvent être modifiés ensuite.
+        """
+        data["type"] = event_type
+        data["t"] = time.time()
+        self._queue.put(json.dumps(data, separators=(",", ":")) + "\n")
+
+    def flush(self):
+        """Attend que tous les événements en file soient écrits sur disque."""
+        self._queue.join()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def compact(self, events: List[Dict]):
+        """Remplace le journal par un instantané pendant que le serveur tourne.
+
+        La réécriture est faite par le thread d'écriture : les événements ajoutés après l'appel
+        sont écrits à la suite de l'instantané. Ils peuvent donc y être déjà reflétés, les
+        événements doivent être idempotents au rejeu.
+        """
+        self._queue.put(_Compact(events))
+
+    def _write_lines(self, lines: List[str]):
+        if not lines:
+            return
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.event_count += len(lines)
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch and batch[-1] is not _STOP:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            pending = []
+            try:
+                for item in batch:
+                    if isinstance(item, _Compact):
+                        self._write_lines(pending)
+                        pending = []
+                        self._file.close()
+                        self.rewrite(item.events)
+                        self._file = open(self.path, "a", encoding="utf-8")
+                        logging.info(f"Journal {self.path} compacté: {len(item.events)} événements")
+                    elif item is not _STOP:
+                        pending.append(item)
+                self._write_lines(pending)
+            except OSError as e:
+                logging.error(f"Erreur d'écriture du journal {self.path}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if batch[-1] is _STOP:
+                self._file.close()
+                return
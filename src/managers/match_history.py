@@ -0,0 +1,77 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+class MatchHistory:
+    """Historique des matchs d'une salle : les derniers résultats et des agrégats sur tous les matchs.
+
+    Seuls les `capacity` derniers résultats sont conservés (tampon circulaire). Les agrégats
+    (victoires/défaites par personnage et par joueur, durée totale) sont mis à jour à chaque
+    ajout, le résumé ne parcourt donc jamais l'historique.
+    """
+
+    def __init__(self, capacity: int = 50):
+        self.capacity = capacity
+        self.total = 0  # Nombre de matchs joués depuis la création de la salle
+        self.total_duration = 0.0
+        self.wins_by_fighter: Dict[str, int] = {}
+        self.losses_by_fighter: Dict[str, int] = {}
+        self.wins_by_player: Dict[str, int] = {}
+        self._recent: Deque[Dict] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def append(self, result: Dict):
+        self._recent.append(result)
+        self.total += 1
+        self.total_duration += result.get("duration") or 0
+        winner_fighter = result.get("winner_fighter")
+        loser_fighter = result.get("loser_fighter")
+        self.wins_by_fighter[winner_fighter] = self.wins_by_fighter.get(winner_fighter, 0) + 1
+        self.losses_by_fighter[loser_fighter] = self.losses_by_fighter.get(loser_fighter, 0) + 1
+        self.wins_by_player[result.get("winner")] = self.wins_by_player.get(result.get("winner"), 0) + 1
+
+    def latest(self) -> Optional[Dict]:
+        return self._recent[-1] if self._recent else None
+
+    def page(self, offset: int = 0, limit: int = 10) -> List[Dict]:
+        """Résultats du plus récent au plus ancien, à partir de `offset`."""
+        end = len(self._recent) - offset
+        return [self._recent[i] for i in range(end - 1, max(end - limit, 0) - 1, -1)]
+
+    def summary(self) -> Dict:
+        return {
+            "matches": self.total,
+            "average_duration": round(self.total_duration / self.total, 1) if self.total else 0,
+            "wins_by_fighter": self.wins_by_fighter,
+            "losses_by_fighter": self.losses_by_fighter,
+            "wins_by_player": self.wins_by_player
+        }
+
+    def to_dict(self) -> Dict:
+        """État persisté dans le journal."""
+        return {
+            "recent": list(self._recent),
+            "total": self.total,
+            "total_duration": self.total_duration,
+            "wins_by_fighter": self.wins_by_fighter,
+            "losses_by_fighter": self.losses_by_fighter,
+            "wins_by_player": self.wins_by_player
+        }
+
+    @classmethod
+    def from_dict(cls, data, capacity: int = 50) -> "MatchHistory":
+        history = cls(capacity)
+        if isinstance(data, list):
+            # Ancien format du journal : liste complète des résultats
+            for result in data:
+                history.append(result)
+            return history
+        history._recent.extend(data["recent"])
+        history.total = data["total"]
+        history.total_duration = data["total_duration"]
+        history.wins_by_fighter = data["wins_by_fighter"]
+        history.losses_by_fighter = data["losses_by_fighter"]
+        history.wins_by_player = data["wins_by_player"]
+        return history
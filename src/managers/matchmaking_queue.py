@@ -0,0 +1,163 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+
+@dataclass
+class Ticket:
+    """Joueur en attente d'un adversaire."""
+    player_uuid: str
+    rating: float
+    region: str
+    request: Dict  # Requête d'origine (nom, personnage...) utilisée pour créer ou rejoindre la salle
+    queued_at: float
+    last_poll: float
+
+
+class MatchmakingQueue:
+    """File de matchmaking par région, triée par classement.
+
+    Chaque région garde ses tickets dans une liste triée (classement, arrivée, UUID). La
+    recherche d'un adversaire part du classement du joueur (bisect) et s'en éloigne des deux
+    côtés par écart croissant : le premier adversaire acceptable est donc le plus proche, et à
+    écart égal le plus ancien. Le coût est O(log n) plus les tickets sautés en chemin : tickets
+    abandonnés (retirés au passage, une seule fois chacun) et adversaires dont la propre fenêtre
+    est encore trop étroite pour l'écart.
+    La fenêtre de recherche s'élargit avec le temps d'attente, et un appariement n'est fait que
+    si chacun des deux joueurs accepte l'écart de classement. Non thread-safe (appelée sous
+    rooms_lock dans core/server.py).
+    """
+
+    def __init__(self, base_window: float = 100, widen_rate: float = 25, max_window: float = 800,
+                 ticket_timeout: float = 15, result_ttl: float = 60):
+        self.base_window = base_window
+        self.widen_rate = widen_rate  # Points de fenêtre gagnés par seconde d'attente
+        self.max_window = max_window
+        self.ticket_timeout = ticket_timeout  # Un ticket non interrogé depuis ce délai est abandonné
+        self.result_ttl = result_ttl
+        self.total_matches = 0
+        self._tickets: Dict[str, Ticket] = {}
+        self._regions: Dict[str, SortedList] = {}  # Région -> (classement, arrivée, UUID) triés
+        self._results: Dict[str, Tuple[float, Dict]] = {}  # Appariements pas encore récupérés
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, player_uuid) -> bool:
+        return player_uuid in self._tickets
+
+    def window(self, ticket: Ticket, now: float) -> float:
+        """Écart de classement accepté par le joueur après son temps d'attente."""
+        return min(self.max_window, self.base_window + self.widen_rate * (now - ticket.queued_at))
+
+    def add(self, player_uuid: str, rating: float, region: str, request: Dict, now: float) -> Ticket:
+        self.remove(player_uuid)
+        ticket = Ticket(player_uuid, rating, region, request, now, now)
+        self._tickets[player_uuid] = ticket
+        self._regions.setdefault(region, SortedList()).add(self._key(ticket))
+        return ticket
+
+    def remove(self, player_uuid: str) -> Optional[Ticket]:
+        ticket = self._tickets.pop(player_uuid, None)
+        if ticket is None:
+            return None
+
+        entries = self._regions[ticket.region]
+        entries.remove(self._key(ticket))
+        if not entries:
+            del self._regions[ticket.region]
+        return ticket
+
+    def poll(self, player_uuid: str, now: float) -> Optional[Ticket]:
+        """Ticket du joueur (None s'il n'est pas en file), marqué comme toujours actif."""
+        ticket = self._tickets.get(player_uuid)
+        if ticket is not None:
+            ticket.last_poll = now
+        return ticket
+
+    def find_opponent(self, ticket: Ticket, now: float) -> Optional[Ticket]:
+        """Meilleur adversaire pour le ticket : plus petit écart de classement, puis plus ancien."""
+        entries = self._regions.get(ticket.region)
+        if not entries:
+            return None
+        window = self.window(ticket, now)
+        below = entries.bisect_left((ticket.rating,)) - 1
+        above = below + 1
+
+        best = None
+        stale = []
+        while True:
+            # Prochain candidat par écart croissant (à écart égal, le plus ancien des deux côtés)
+            left = entries[below] if below >= 0 else None
+            right = entries[above] if above < len(entries) else None
+            if left is None and right is None:
+                break
+            left_gap = ticket.rating - left[0] if left is not None else float("inf")
+            right_gap = right[0] - ticket.rating if right is not None else float("inf")
+            if left_gap < right_gap or (left_gap == right_gap and left[1] <= right[1]):
+                entry, gap = left, left_gap
+                below -= 1
+            else:
+                entry, gap = right, right_gap
+                above += 1
+            if gap > window or (best is not None and gap > abs(best.rating - ticket.rating)):
+                break
+
+            candidate = self._tickets[entry[2]]
+            if candidate is ticket:
+                continue
+            if now - candidate.last_poll > self.ticket_timeout:
+                stale.append(candidate.player_uuid)
+                continue
+            if gap <= self.window(candidate, now) and (best is None or candidate.queued_at < best.queued_at):
+                best = candidate
+
+        for player_uuid in stale:
+            self.remove(player_uuid)
+        return best
+
+    def record_match(self, waiting: Ticket, arriving: Ticket, waiting_result: Dict, now: float):
+        """Retire les deux joueurs de la file et garde la réponse destinée au joueur qui attendait."""
+        self.remove(waiting.player_uuid)
+        self.remove(arriving.player_uuid)
+        self._results[waiting.player_uuid] = (now, waiting_result)
+        self._wait_times.append(now - waiting.queued_at)
+        self._wait_times.append(now - arriving.queued_at)
+        self.total_matches += 1
+
+    def take_result(self, player_uuid: str) -> Optional[Dict]:
+        entry = self._results.pop(player_uuid, None)
+        return entry[1] if entry else None
+
+    def prune(self, now: float) -> int:
+        """Abandonne les tickets des joueurs partis et les résultats jamais récupérés."""
+        stale = [player_uuid for player_uuid, ticket in self._tickets.items()
+                 if now - ticket.last_poll > self.ticket_timeout]
+        for player_uuid in stale:
+            self.remove(player_uuid)
+        for player_uuid in [player_uuid for player_uuid, (matched_at, _) in self._results.items()
+                            if now - matched_at > self.result_ttl]:
+            del self._results[player_uuid]
+        return len(stale)
+
+    def wait_time_percentiles(self) -> Dict[str, float]:
+        """Temps d'attente (secondes) des derniers joueurs appariés."""
+        waits = sorted(self._wait_times)
+        if not waits:
+            return {}
+        return {f"p{p}": round(waits[min(len(waits) - 1, len(waits) * p // 100)], 2) for p in (50, 90, 99)}
+
+    def to_dict(self) -> Dict:
+        return {
+            "queued": len(self._tickets),
+            "regions": {region: len(entries) for region, entries in self._regions.items()},
+            "total_matches": self.total_matches,
+            "wait_time": self.wait_time_percentiles()
+        }
+
+    @staticmethod
+    def _key(ticket: Ticket) -> Tuple[float, float, str]:
+        return ticket.rating, ticket.queued_at, ticket.player_uuid
@@ -0,0 +1,125 @@
+import bisect
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Bornes (secondes) des histogrammes de latence : de 0,25 ms à 2,5 s
+LATENCY_BUCKETS = (0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{escape_label(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_metric(name: str, kind: str, help_text: str, samples: Iterable[Tuple[Labels, float]]) -> List[str]:
+    """Lignes d'une métrique simple (counter ou gauge) au format d'exposition texte."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{format_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+
+def format_histogram(name: str, help_text: str, buckets: Sequence[float],
+                     samples: Iterable[Tuple[Labels, Sequence[int], float, int]]) -> List[str]:
+    """Lignes d'un histogramme ; chaque échantillon donne les effectifs non cumulés par borne."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, counts, total, count in samples:
+        cumulative = 0
+        for bound, bucket_count in zip(buckets, counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+        lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {count}")
+        lines.append(f"{name}_sum{format_labels(labels)} {total}")
+        lines.append(f"{name}_count{format_labels(labels)} {count}")
+    return lines
+
+
+def bucket_counts(values: Iterable[float], buckets: Sequence[float]) -> List[int]:
+    """Effectifs non cumulés par borne (les valeurs au-delà de la dernière borne ne comptent que dans +Inf)."""
+    counts = [0] * len(buckets)
+    for value in values:
+        index = bisect.bisect_left(buckets, value)
+        if index < len(buckets):
+            counts[index] += 1
+    return counts
+
+
+class Metrics:
+    """Compteurs et histogrammes du chemin des requêtes, exposés au format texte de Prometheus.
+
+    Les threads de requêtes ne font qu'ajouter un événement dans une deque (append atomique, sans
+    verrou). Les événements sont agrégés à la lecture (`render`), ou dès que `max_pending`
+    événements attendent, par le seul thread qui obtient le verrou d'agrégation sans attendre.
+    """
+
+    def __init__(self, max_pending: int = 100000):
+        self.max_pending = max_pending
+        self._events: deque = deque()
+        self._aggregate_lock = threading.Lock()
+        self._descriptions: Dict[str, Tuple[str, str, Sequence[float]]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self._descriptions[name] = (kind, help_text, buckets)
+        if kind == "histogram":
+            self._histograms.setdefault(name, {})
+        else:
+            self._counters.setdefault(name, {})
+
+    def inc(self, name: str, value: float = 1, **labels):
+        self._record(name, tuple(sorted(labels.items())), value)
+
+    def observe(self, name: str, value: float, **labels):
+        self._record(name, tuple(sorted(labels.items())), value)
+
+    def render(self) -> List[str]:
+        self._aggregate()
+        lines = []
+        with self._aggregate_lock:
+            for name, (kind, help_text, buckets) in self._descriptions.items():
+                if kind == "histogram":
+                    samples = [(labels, counts, total, count)
+                               for labels, (counts, total, count) in sorted(self._histograms[name].items())]
+                    lines.extend(format_histogram(name, help_text, buckets, samples))
+                else:
+                    lines.extend(format_metric(name, kind, help_text, sorted(self._counters[name].items())))
+        return lines
+
+    def _record(self, name: str, labels: Labels, value: float):
+        self._events.append((name, labels, value))
+        if len(self._events) > self.max_pending:
+            self._aggregate(blocking=False)
+
+    def _aggregate(self, blocking: bool = True):
+        if not self._aggregate_lock.acquire(blocking=blocking):
+            return  # Un autre thread agrège déjà
+        try:
+            while True:
+                try:
+                    name, labels, value = self._events.popleft()
+                except IndexError:
+                    break
+                kind, _, buckets = self._descriptions[name]
+                if kind == "histogram":
+                    entry = self._histograms[name].get(labels)
+                    if entry is None:
+                        entry = self._histograms[name][labels] = [[0] * len(buckets), 0.0, 0]
+                    index = bisect.bisect_left(buckets, value)
+                    if index < len(buckets):
+                        entry[0][index] += 1
+                    entry[1] += value
+                    entry[2] += 1
+                else:
+                    counters = self._counters[name]
+                    counters[labels] = counters.get(labels, 0) + value
+        finally:
+            self._aggregate_lock.release()
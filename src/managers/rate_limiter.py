@@ -0,0 +1,51 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class TokenBucketLimiter:
+    """Limite de débit par clé (adresse IP, UUID de joueur...) : un seau de jetons par clé.
+
+    Chaque clé reçoit `rate` jetons par seconde, dans la limite de `burst`. Les seaux sont
+    gardés du moins au plus récemment utilisé ; au-delà de `max_keys`, les plus anciens sont
+    oubliés (un seau oublié repart plein, ce qui ne pénalise jamais un client légitime).
+    Avec `rate <= 0`, la limite est désactivée.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()  # clé -> [jetons, dernier remplissage]
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, key: Hashable, now: Optional[float] = None) -> float:
+        """Consomme un jeton pour `key`.
+
+        Retourne 0 si la requête est acceptée, sinon le délai (s) avant qu'un jeton soit disponible.
+        """
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
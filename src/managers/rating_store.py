@@ -0,0 +1,188 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from managers.journal import Journal
+
+# Marqueur interne envoyé au thread de mise à jour
+_STOP = object()
+
+
+@dataclass
+class PlayerRating:
+    player_uuid: str  # Clé du joueur (identifiant persistant du client), jamais renvoyée aux clients
+    name: str  # Nom du premier match classé, pour l'affichage seulement
+    rating: float
+    games: int = 0
+    wins: int = 0
+    losses: int = 0
+    updated_at: float = 0.0
+
+    def public(self) -> Dict:
+        data = asdict(self)
+        del data["player_uuid"]
+        return dict(data, rating=round(self.rating))
+
+
+class RatingStore:
+    """Classement Elo d'un serveur (d'un nœud en cluster), persistant et indexé par classement.
+
+    Les résultats sont mis en file par `submit` (non bloquant) et appliqués par un thread dédié,
+    par lots : une rafale de fins de match ne ralentit pas le traitement des requêtes. Chaque
+    joueur modifié est écrit dans un journal (managers/journal.py) ; au rejeu, la dernière ligne
+    d'un joueur fait foi. L'index trié (-classement, UUID) donne le top N et le rang d'un joueur
+    en O(log n).
+
+    Les joueurs sont identifiés par leur UUID : deux joueurs du même nom (ex: "Joueur", le nom
+    par défaut) ont chacun leur classement. Le nom retenu est celui du premier match classé : un
+    joueur ne peut pas prendre le nom affiché d'un autre en changeant le sien.
+    """
+
+    def __init__(self, path: str, default_rating: float = 1000, k_factor: float = 32,
+                 provisional_k_factor: float = 48, provisional_games: int = 10,
+                 batch_interval: float = 0.2, compact_threshold: int = 50000):
+        self.default_rating = default_rating
+        self.k_factor = k_factor
+        self.provisional_k_factor = provisional_k_factor  # Les premiers matchs comptent davantage
+        self.provisional_games = provisional_games
+        self.batch_interval = batch_interval
+        self.compact_threshold = compact_threshold
+        self.journal = Journal(path)
+        self._players: Dict[str, PlayerRating] = {}
+        self._index = SortedList()
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self):
+        """Relit le journal, le compacte puis démarre les écritures et le thread de mise à jour."""
+        legacy = 0
+        for event in self.journal.replay():
+            if "player_uuid" not in event.get("player", {}):
+                legacy += 1  # Classement par nom des versions précédentes : pas d'UUID à qui l'attribuer
+                continue
+            try:
+                player = PlayerRating(**event["player"])
+            except (KeyError, TypeError) as e:
+                logging.warning(f"Classement: événement invalide ignoré ({e}): {event}")
+                continue
+            self._set_rating(player, player.rating)
+        if legacy:
+            logging.warning(f"Classement: {legacy} entrées indexées par nom ignorées (classement repris à zéro)")
+        self.journal.rewrite(self._snapshot_events())
+        self.journal.start()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        logging.info(f"Classement chargé: {len(self._players)} joueurs")
+
+    def submit(self, winner_uuid: str, winner_name: str, loser_uuid: str, loser_name: str):
+        """Ajoute un résultat à appliquer (non bloquant). Les noms ne servent qu'aux nouveaux joueurs."""
+        if winner_uuid and loser_uuid and winner_uuid != loser_uuid:
+            self._pending.put(((winner_uuid, winner_name), (loser_uuid, loser_name)))
+
+    def flush(self):
+        """Attend que tous les résultats soumis soient appliqués."""
+        self._pending.join()
+
+    def close(self):
+        if self._thread is not None:
+            self._pending.put(_STOP)
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.journal.close()
+
+    def rating_of(self, player_uuid: str) -> float:
+        with self._lock:
+            player = self._players.get(player_uuid)
+            return player.rating if player else self.default_rating
+
+    def get(self, player_uuid: str) -> Optional[Dict]:
+        """Classement et rang (1 = premier) d'un joueur, None s'il n'a jamais joué."""
+        with self._lock:
+            player = self._players.get(player_uuid)
+            if player is None:
+                return None
+            rank = self._index.index((-player.rating, player_uuid)) + 1
+            return dict(player.public(), rank=rank, total=len(self._players))
+
+    def top(self, limit: int = 10, offset: int = 0) -> List[Dict]:
+        with self._lock:
+            entries = self._index.islice(offset, offset + limit)
+            return [dict(self._players[key].public(), rank=offset + i + 1) for i, (_, key) in enumerate(entries)]
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def expected_score(self, rating: float, opponent_rating: float) -> float:
+        return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+    def apply_result(self, winner: Tuple[str, str], loser: Tuple[str, str],
+                     now: float) -> Tuple[PlayerRating, PlayerRating]:
+        """Met à jour les deux joueurs, donnés par (UUID, nom) (appelé avec le verrou par le thread de mise à jour).
+
+        Le nom ne sert qu'à créer un joueur qui n'est pas encore classé."""
+        won, lost = [self._players.get(player_uuid) or PlayerRating(player_uuid, name, self.default_rating)
+                     for player_uuid, name in (winner, loser)]
+
+        expected = self.expected_score(won.rating, lost.rating)
+        self._set_rating(won, won.rating + self._k(won) * (1 - expected))
+        self._set_rating(lost, lost.rating - self._k(lost) * (1 - expected))
+        for player in (won, lost):
+            player.games += 1
+            player.updated_at = now
+        won.wins += 1
+        lost.losses += 1
+        return won, lost
+
+    def _k(self, player: PlayerRating) -> float:
+        return self.provisional_k_factor if player.games < self.provisional_games else self.k_factor
+
+    def _set_rating(self, player: PlayerRating, rating: float):
+        """Enregistre le joueur avec son nouveau classement en gardant l'index trié à jour."""
+        key = player.player_uuid
+        previous = self._players.get(key)
+        if previous is not None:
+            self._index.remove((-previous.rating, key))
+        player.rating = rating
+        self._players[key] = player
+        self._index.add((-rating, key))
+
+    def _snapshot_events(self) -> List[Dict]:
+        return [{"type": "rating", "player": asdict(player)} for player in self._players.values()]
+
+    def _worker(self):
+        while True:
+            batch = [self._pending.get()]
+            time.sleep(self.batch_interval)  # Laisse les résultats de la rafale s'accumuler
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                changed = {}
+                with self._lock:
+                    now = time.time()
+                    for item in batch:
+                        if item is _STOP:
+                            continue
+                        for player in self.apply_result(item[0], item[1], now):
+                            changed[player.player_uuid] = asdict(player)
+                    if self.journal.event_count > self.compact_threshold:
+                        self.journal.compact(self._snapshot_events())
+                for player in changed.values():
+                    self.journal.append("rating", player=player)
+            except Exception as e:
+                logging.error(f"Classement: erreur lors de l'application des résultats: {e}")
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+            if any(item is _STOP for item in batch):
+                return
@@ -0,0 +1,141 @@
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from managers.expiry_queue import ExpiryQueue
+
+
+class RoomRegistry:
+    """Salles du serveur avec des index secondaires maintenus à chaque modification.
+
+    S'utilise comme un dictionnaire room_id -> Room. Les salles appellent `reindex` quand leurs
+    joueurs ou leur statut changent (voir Room._changed dans core/server.py), ce qui garde les
+    index cohérents sans jamais parcourir toutes les salles. L'échéance d'expiration de chaque
+    salle (room.expires_at()) est suivie de la même façon, rafraîchie par `touch`.
+    """
+
+    def __init__(self):
+        self._rooms: Dict[str, object] = {}
+        self._by_uuid: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_player: Dict[str, str] = {}
+        self._open: Dict[str, None] = {}  # Salles en attente d'un adversaire (ordre d'ouverture)
+        # Clés sous lesquelles chaque salle est indexée, pour la retirer des index en O(1)
+        self._indexed: Dict[str, Tuple[Set[str], str, Set[str], bool]] = {}
+        self._expiry = ExpiryQueue()
+
+    # Interface dictionnaire
+    def __getitem__(self, room_id: str):
+        return self._rooms[room_id]
+
+    def __setitem__(self, room_id: str, room):
+        if room_id in self._rooms:
+            self._unindex(room_id)
+        self._rooms[room_id] = room
+        room.registry = self
+        self._index(room)
+        self._expiry.schedule(room_id, room.expires_at())
+
+    def __delitem__(self, room_id: str):
+        room = self._rooms.pop(room_id)
+        room.registry = None
+        self._unindex(room_id)
+        self._expiry.remove(room_id)
+
+    def __contains__(self, room_id) -> bool:
+        return room_id in self._rooms
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rooms)
+
+    def get(self, room_id, default=None):
+        return self._rooms.get(room_id, default)
+
+    def pop(self, room_id, *default):
+        if room_id not in self._rooms and default:
+            return default[0]
+        room = self._rooms[room_id]
+        del self[room_id]
+        return room
+
+    def keys(self):
+        return self._rooms.keys()
+
+    def values(self):
+        return self._rooms.values()
+
+    def items(self):
+        return self._rooms.items()
+
+    # Index secondaires
+    def count_rooms_for_uuid(self, player_uuid: str) -> int:
+        return len(self._by_uuid.get(player_uuid, ()))
+
+    def rooms_with_status(self, status: str) -> List:
+        return [self._rooms[room_id] for room_id in self._by_status.get(status, ())]
+
+    def open_rooms(self, limit: Optional[int] = None) -> List:
+        """Salles en attente avec moins de deux joueurs, par ordre d'ouverture."""
+        return [self._rooms[room_id] for room_id in islice(self._open, limit)]
+
+    def open_room_count(self) -> int:
+        return len(self._open)
+
+    def player_count(self) -> int:
+        return len(self._by_player)
+
+    def room_for_player(self, player_id: str):
+        room_id = self._by_player.get(player_id)
+        return self._rooms.get(room_id) if room_id else None
+
+    def reindex(self, room):
+        """À appeler après un changement de joueurs ou de statut d'une salle."""
+        if self._rooms.get(room.id) is room:
+            self._unindex(room.id)
+            self._index(room)
+            self._expiry.touch(room.id, room.expires_at())
+
+    # Expiration
+    def touch(self, room):
+        """À appeler après une activité dans la salle (repousse son expiration)."""
+        if self._rooms.get(room.id) is room:
+            self._expiry.touch(room.id, room.expires_at())
+
+    def pop_expired(self, now: float) -> List[str]:
+        """Identifiants des salles dont l'échéance est passée (à supprimer par l'appelant)."""
+        return [room_id for room_id in self._expiry.pop_expired(now) if room_id in self._rooms]
+
+    def next_deadline(self) -> Optional[float]:
+        return self._expiry.next_deadline()
+
+    def _index(self, room):
+        uuids = {player.get("uuid") for player in room.players.values() if player.get("uuid")}
+        player_ids = set(room.players)
+        is_open = room.status == "waiting" and len(room.players) < 2
+
+        for player_uuid in uuids:
+            self._by_uuid.setdefault(player_uuid, set()).add(room.id)
+        self._by_status.setdefault(room.status, set()).add(room.id)
+        for player_id in player_ids:
+            self._by_player[player_id] = room.id
+        if is_open:
+            self._open[room.id] = None
+
+        self._indexed[room.id] = (uuids, room.status, player_ids, is_open)
+
+    def _unindex(self, room_id: str):
+        uuids, status, player_ids, is_open = self._indexed.pop(room_id)
+
+        for player_uuid in uuids:
+            room_ids = self._by_uuid[player_uuid]
+            room_ids.discard(room_id)
+            if not room_ids:
+                del self._by_uuid[player_uuid]
+        self._by_status[status].discard(room_id)
+        for player_id in player_ids:
+            if self._by_player.get(player_id) == room_id:
+                del self._by_player[player_id]
+        if is_open:
+            del self._open[room_id]
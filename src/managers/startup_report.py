@@ -0,0 +1,67 @@
+import importlib
+import os
+import sys
+import time
+from typing import List, Optional, TextIO, Tuple
+
+# Origine des mesures : import de ce module, à faire en premier dans le point d'entrée
+STARTED = time.perf_counter()
+
+STARTUP_BUDGET = 0.3  # Délai visé (s) avant le premier affichage
+REPORT_FLAG = "--startup-report"
+REPORT_ENV = "PYTHFIGHTER_STARTUP_REPORT"
+
+
+class StartupReport:
+    """Jalons du démarrage et durée des imports faits à la demande, à la manière de `-X importtime`.
+
+    Activé par l'option --startup-report ou la variable PYTHFIGHTER_STARTUP_REPORT=1 ; sinon
+    `mark` et `report` ne coûtent rien. `import_module` importe toujours, en mesurant si activé.
+    """
+
+    def __init__(self, enabled: bool, budget: float = STARTUP_BUDGET):
+        self.enabled = enabled
+        self.budget = budget
+        self.marks: List[Tuple[str, float]] = []
+        self.imports: List[Tuple[str, float, int]] = []  # (module, durée, nouveaux modules chargés)
+        self.first_paint: Optional[float] = None
+
+    def mark(self, label: str, first_paint: bool = False):
+        if not self.enabled:
+            return
+        now = time.perf_counter() - STARTED
+        self.marks.append((label, now))
+        if first_paint and self.first_paint is None:
+            self.first_paint = now
+
+    def import_module(self, name: str):
+        if not self.enabled or name in sys.modules:
+            return importlib.import_module(name)
+        loaded = len(sys.modules)
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports.append((name, time.perf_counter() - start, len(sys.modules) - loaded))
+        return module
+
+    def report(self, stream: Optional[TextIO] = None):
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        stream.write("Démarrage (ms depuis le début du point d'entrée)\n")
+        previous = 0.0
+        for label, at in self.marks:
+            stream.write(f"  {at * 1000:8.1f}  (+{(at - previous) * 1000:7.1f})  {label}\n")
+            previous = at
+        if self.imports:
+            stream.write("Imports à la demande\n")
+            for name, duration, count in sorted(self.imports, key=lambda entry: -entry[1]):
+                stream.write(f"  {duration * 1000:8.1f}  {count:5d} modules  {name}\n")
+        if self.first_paint is not None:
+            verdict = "OK" if self.first_paint <= self.budget else "DÉPASSÉ"
+            stream.write(f"Premier affichage : {self.first_paint * 1000:.0f} ms "
+                         f"(budget {self.budget * 1000:.0f} ms) {verdict}\n")
+        stream.write(f"Détail de tous les imports : python -X importtime {sys.argv[0]}\n")
+        stream.flush()
+
+
+startup = StartupReport(REPORT_FLAG in sys.argv or os.getenv(REPORT_ENV) == "1")
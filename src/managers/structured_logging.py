@@ -0,0 +1,145 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+# Champs standard d'un LogRecord, exclus des champs supplémentaires écrits en JSON
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par message : horodatage, niveau, origine, message et champs `extra`."""
+
+    def format(self, record):
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "src": f"{record.module}:{record.lineno}",
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Limite le débit de chaque message, identifié par `extra={"log_key": ...}` ou par sa ligne d'origine.
+
+    Chaque clé dispose d'un seau de jetons (`rate` messages par seconde, rafales de `burst`).
+    `sample_rates` permet en plus de ne garder qu'une fraction des messages d'une clé
+    (ex: {"client.poll": 0.01}). Le nombre de messages écartés est ajouté (champ `suppressed`)
+    au prochain message accepté pour la même clé.
+    """
+
+    def __init__(self, rate: float = 5, burst: int = 20, sample_rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_rates = sample_rates or {}
+        self._buckets: Dict[str, list] = {}  # clé -> [jetons, dernier remplissage, messages vus, écartés]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "log_key", None) or f"{record.module}:{record.lineno}"
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now, 0, 0]
+            bucket[2] += 1
+
+            sample_rate = self.sample_rates.get(key)
+            if sample_rate is not None and bucket[2] % max(1, round(1 / sample_rate)) != 0:
+                bucket[3] += 1
+                return False
+
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[3] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[3] = bucket[3], 0
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Met les messages en file pour le thread d'écriture ; si la file est pleine, le message est perdu
+    (et compté) plutôt que de bloquer l'appelant."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(log_file: Optional[str] = None, level: int = logging.INFO, console: bool = True,
+                  rate: float = 5, burst: int = 20, sample_rates: Optional[Dict[str, float]] = None,
+                  backup_days: int = 7, queue_size: int = 10000) -> NonBlockingQueueHandler:
+    """Configure le logging racine : file non bloquante, limitation de débit et écriture en arrière-plan.
+
+    Le fichier (JSON, une ligne par message) change chaque jour à minuit et les `backup_days`
+    derniers jours sont conservés. La console garde le format lisible habituel. Peut être rappelée
+    (ex: dans un processus fils) pour changer de configuration.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    handlers = []
+    if log_file:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when="midnight", backupCount=backup_days, encoding="utf-8", delay=True)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handlers.append(console_handler)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter(rate, burst, sample_rates))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    return _queue_handler
+
+
+def shutdown_logging():
+    """Écrit les messages encore en file et arrête le thread d'écriture."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
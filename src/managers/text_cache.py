@@ -0,0 +1,85 @@
+import re
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, ...]
+
+_DIGIT_SPLIT = re.compile(r"(\d)")
+
+
+def quantize(value: float, steps: int = 16) -> float:
+    """Arrondit une valeur de [0, 1] à `steps` niveaux : les couleurs animées (pulsations) ne
+    produisent alors qu'un petit nombre de textes différents à mettre en cache."""
+    return round(value * steps) / steps
+
+
+class TextCache:
+    """Registre de polices et cache LRU des textes rendus.
+
+    Les polices sont créées une fois par (nom, taille) et jamais libérées (il y en a peu).
+    Les surfaces de texte sont gardées par (police, taille, texte, couleur, antialiasing) ;
+    au-delà de `capacity`, les moins récemment utilisées sont oubliées.
+
+    Pour les textes qui changent sans cesse (points de vie, combo, chrono), `blit_dynamic`
+    découpe le texte en chiffres et en parties fixes, chacun rendu une seule fois : afficher
+    "87/150" puis "86/150" ne rend plus rien.
+    """
+
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size: int, name: Optional[str] = None) -> pygame.font.Font:
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text: str, size: int, color: Color, name: Optional[str] = None,
+               antialias: bool = True) -> pygame.Surface:
+        """Surface du texte, rendue au premier appel puis servie depuis le cache.
+
+        La surface est partagée : ne pas la modifier (set_alpha, dessin...), en faire une copie.
+        """
+        key = (name, size, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.font(size, name).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def dynamic_width(self, text: str, size: int, color: Color, name: Optional[str] = None) -> int:
+        """Largeur du texte tel que l'affiche `blit_dynamic` (les morceaux rendus restent en cache)."""
+        return sum(self.render(part, size, color, name).get_width() for part in _DIGIT_SPLIT.split(text) if part)
+
+    def blit_dynamic(self, target: pygame.Surface, text: str, pos: Tuple[float, float], size: int,
+                     color: Color, name: Optional[str] = None) -> pygame.Rect:
+        """Dessine `text` morceau par morceau (chiffres et parties fixes en cache) et retourne la zone couverte."""
+        x, y = pos
+        height = 0
+        for part in _DIGIT_SPLIT.split(text):
+            if part:
+                surface = self.render(part, size, color, name)
+                target.blit(surface, (x, y))
+                x += surface.get_width()
+                height = max(height, surface.get_height())
+        return pygame.Rect(pos[0], pos[1], x - pos[0], height)
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+# Cache partagé par le jeu, les menus et le HUD
+text_cache = TextCache()
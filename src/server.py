@@ -11,10 +11,14 @@ import sys
 from datetime import datetime
 from collections import deque
 
+from managers.expiry_queue import ExpiryQueue
+
 # Configuration du serveur
 HOST = '0.0.0.0'  # Écoute sur toutes les interfaces
 PORT = 25568      # Port principal
 PING_PORT = 25569 # Port pour les pings
+INACTIVE_THRESHOLD = 300  # Une salle inactive depuis 5 minutes est supprimée
+CLEANUP_MAX_WAIT = 60  # Le thread de nettoyage se réveille au moins toutes les minutes
 
 # Configuration du logging
 log_dir = "logs"
@@ -34,6 +38,8 @@ logging.basicConfig(
 
 # Stockage des salles et des joueurs
 rooms = {}
+rooms_lock = threading.Lock()  # Protège les ajouts/suppressions de salles
+room_expiry = ExpiryQueue()  # Échéance d'inactivité de chaque salle
 player_states = {}
 active_connections = 0
 total_connections = 0
@@ -77,13 +83,18 @@ class Room:
             "uuid": player_uuid or str(uuid.uuid4()),  # Utiliser l'UUID fourni ou en générer un nouveau
             "score": 0
         }
-        self.last_activity = time.time()
+        self.touch()
         return True
     
+    def touch(self):
+        """Note une activité dans la salle et repousse son expiration."""
+        self.last_activity = time.time()
+        room_expiry.touch(self.id, self.last_activity + INACTIVE_THRESHOLD)
+    
     def remove_player(self, player_id):
         if player_id in self.players:
             del self.players[player_id]
-            self.last_activity = time.time()
+            self.touch()
             return True
         return False
     
@@ -91,7 +102,7 @@ class Room:
         if player_id in self.players:
             self.game_state[player_id] = game_state
             self.players[player_id]["last_active"] = time.time()
-            self.last_activity = time.time()
+            self.touch()
             return True
         return False
     
@@ -104,7 +115,7 @@ class Room:
     def set_player_ready(self, player_id, ready=True):
         if player_id in self.players:
             self.players[player_id]["ready"] = ready
-            self.last_activity = time.time()
+            self.touch()
             
             # Si les deux joueurs sont prêts, commencer le match
             if ready and len(self.players) == 2:
@@ -192,7 +203,9 @@ def handle_client(client_socket, client_address):
                 
                 player_id = str(uuid.uuid4())
                 room = Room(player_id, player_name, fighter_type, player_uuid)
-                rooms[room.id] = room
+                with rooms_lock:
+                    rooms[room.id] = room
+                    room_expiry.schedule(room.id, room.last_activity + INACTIVE_THRESHOLD)
                 
                 response = {
                     "status": "success",
@@ -208,12 +221,13 @@ def handle_client(client_socket, client_address):
                 fighter_type = request.get("fighter_type", "Mitsu")
                 player_uuid = request.get("player_uuid", str(uuid.uuid4()))
                 
-                if room_id not in rooms:
+                # Lecture unique : le thread de nettoyage peut retirer la salle entre le test et l'accès
+                room = rooms.get(room_id)
+                if room is None:
                     response = {"status": "error", "message": "Salle introuvable"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
                     return
                 
-                room = rooms[room_id]
                 player_id = str(uuid.uuid4())
                 
                 # Vérifier si la salle est pleine
@@ -240,12 +254,12 @@ def handle_client(client_socket, client_address):
                 player_id = request.get("player_id")
                 game_state = request.get("game_state", {})
                 
-                if room_id not in rooms:
+                room = rooms.get(room_id)
+                if room is None:
                     response = {"status": "error", "message": "Salle introuvable"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
                     return
                 
-                room = rooms[room_id]
                 if player_id not in room.players:
                     response = {"status": "error", "message": "Joueur non trouvé dans cette salle"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
@@ -259,12 +273,12 @@ def handle_client(client_socket, client_address):
                 room_id = request.get("room_id")
                 player_id = request.get("player_id")
                 
-                if room_id not in rooms:
+                room = rooms.get(room_id)
+                if room is None:
                     response = {"status": "error", "message": "Salle introuvable"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
                     return
                 
-                room = rooms[room_id]
                 if player_id not in room.players:
                     response = {"status": "error", "message": "Joueur non trouvé dans cette salle"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
@@ -282,12 +296,12 @@ def handle_client(client_socket, client_address):
                 player_id = request.get("player_id")
                 ready = request.get("ready", True)
                 
-                if room_id not in rooms:
+                room = rooms.get(room_id)
+                if room is None:
                     response = {"status": "error", "message": "Salle introuvable"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
                     return
                 
-                room = rooms[room_id]
                 if player_id not in room.players:
                     response = {"status": "error", "message": "Joueur non trouvé dans cette salle"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
@@ -301,12 +315,12 @@ def handle_client(client_socket, client_address):
                 room_id = request.get("room_id")
                 player_id = request.get("player_id")
                 
-                if room_id not in rooms:
+                room = rooms.get(room_id)
+                if room is None:
                     response = {"status": "error", "message": "Salle introuvable"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
                     return
                 
-                room = rooms[room_id]
                 if player_id not in room.players:
                     response = {"status": "error", "message": "Joueur non trouvé dans cette salle"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
@@ -325,12 +339,12 @@ def handle_client(client_socket, client_address):
                 loser_id = request.get("loser_id")
                 match_duration = request.get("match_duration", 0)
                 
-                if room_id not in rooms:
+                room = rooms.get(room_id)
+                if room is None:
                     response = {"status": "error", "message": "Salle introuvable"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
                     return
                 
-                room = rooms[room_id]
                 success = room.record_match_result(winner_id, loser_id, match_duration)
                 
                 if success:
@@ -344,12 +358,12 @@ def handle_client(client_socket, client_address):
                 room_id = request.get("room_id")
                 player_id = request.get("player_id")
                 
-                if room_id not in rooms:
+                room = rooms.get(room_id)
+                if room is None:
                     response = {"status": "error", "message": "Salle introuvable"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
                     return
                 
-                room = rooms[room_id]
                 if player_id not in room.players:
                     response = {"status": "error", "message": "Joueur non trouvé dans cette salle"}
                     client_socket.send(json.dumps(response).encode('utf-8'))
@@ -359,7 +373,9 @@ def handle_client(client_socket, client_address):
                 
                 # Si la salle est vide, la supprimer
                 if room.is_empty():
-                    del rooms[room_id]
+                    with rooms_lock:
+                        rooms.pop(room_id, None)
+                        room_expiry.remove(room_id)
                     logging.info(f"Salle {room_id} supprimée car vide")
                 
                 response = {"status": "success"}
@@ -391,18 +407,11 @@ def handle_ping(client_socket, client_address):
         client_socket.close()
 
 def clean_inactive_rooms():
-    """Nettoie les salles inactives."""
-    current_time = time.time()
-    inactive_threshold = 300  # 5 minutes
-    
-    rooms_to_remove = []
-    for room_id, room in rooms.items():
-        if current_time - room.last_activity > inactive_threshold:
-            rooms_to_remove.append(room_id)
-    
-    for room_id in rooms_to_remove:
-        del rooms[room_id]
-        logging.info(f"Salle {room_id} supprimée pour inactivité")
+    """Nettoie les salles inactives dont l'échéance est passée."""
+    with rooms_lock:
+        for room_id in room_expiry.pop_expired(time.time()):
+            if rooms.pop(room_id, None) is not None:
+                logging.info(f"Salle {room_id} supprimée pour inactivité")
 
 def main_server():
     """Serveur principal pour les connexions de jeu."""
@@ -453,9 +462,13 @@ def cleanup_thread():
     while True:
         try:
             clean_inactive_rooms()
-            time.sleep(60)  # Vérifier toutes les minutes
+            # Attendre la prochaine échéance (au plus une minute)
+            next_deadline = room_expiry.next_deadline()
+            wait = CLEANUP_MAX_WAIT if next_deadline is None else next_deadline - time.time()
+            time.sleep(min(CLEANUP_MAX_WAIT, max(1, wait)))
         except Exception as e:
             logging.error(f"Erreur lors du nettoyage: {e}")
+            time.sleep(60)
 
 def signal_handler(sig, frame):
     """Gestionnaire de signal pour arrêter proprement le serveur."""
@@ -0,0 +1,129 @@
+# Construit l'archive distribuable du jeu : un seul fichier .pyz (zipapp)
+#
+# Usage : python src/utils/build_dist.py [--output dist/pythfighter.pyz] [--optimize 1]
+# Lancement : python dist/pythfighter-py311.pyz [launcher|select|game P1 P2|replay FICHIER|server]
+#
+# L'archive contient :
+#   - le code précompilé (.pyc sans les sources, compressé) : aucun module n'est compilé au lancement ;
+#   - les assets, stockés sans compression : le jeu les lit dans une projection mémoire de l'archive
+#     (managers/bundle.py) au lieu d'ouvrir des centaines de petits fichiers ;
+#   - un __main__.py qui choisit le point d'entrée.
+# Les dépendances (pygame, customtkinter, Pillow...) restent installées dans l'environnement Python :
+# rien n'est installé au lancement. Le bytecode dépend de la version de Python qui construit
+# l'archive, d'où la version dans le nom du fichier.
+
+import argparse
+import importlib.util
+import os
+import py_compile
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from managers.bundle import ARCHIVE_ENV, ENTRY_POINTS
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PACKAGES = ["core", "config", "managers", "scripts"]
+ASSETS_DIR = "assets"
+DEFAULT_OUTPUT = os.path.join("dist", f"pythfighter-py{sys.version_info.major}{sys.version_info.minor}.pyz")
+DEFAULT_INTERPRETER = "/usr/bin/env python3"
+
+MAIN_TEMPLATE = '''# Point d'entrée de l'archive PythFighter (générée par utils/build_dist.py)
+import importlib.util
+import os
+import runpy
+import sys
+
+if importlib.util.MAGIC_NUMBER != {magic!r}:
+    sys.exit("Cette archive a été construite pour Python {version} : "
+             "reconstruisez-la avec python src/utils/build_dist.py")
+
+# Avant tout import du jeu : managers/bundle.py ouvre les assets de l'archive
+os.environ[{env!r}] = os.path.dirname(os.path.abspath(__file__))
+
+from managers.bundle import ENTRY_POINTS
+
+entry = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in ENTRY_POINTS else "launcher"
+if len(sys.argv) > 1 and sys.argv[1] == entry:
+    del sys.argv[1]
+runpy.run_module(ENTRY_POINTS[entry], run_name="__main__", alter_sys=True)
+'''
+
+
+def iter_modules():
+    for package in PACKAGES:
+        for root, dirs, files in os.walk(os.path.join(SRC_DIR, package)):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    yield os.path.join(root, name)
+
+
+def iter_assets():
+    for root, dirs, files in os.walk(os.path.join(SRC_DIR, ASSETS_DIR)):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            yield os.path.join(root, name)
+
+
+def archive_name(path):
+    return os.path.relpath(path, SRC_DIR).replace(os.sep, "/")
+
+
+def build(output, optimize, interpreter):
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    modules = assets = 0
+    with open(output, "wb") as f:
+        if interpreter:
+            f.write(f"#!{interpreter}\n".encode("utf-8"))
+        with zipfile.ZipFile(f, "w") as archive, tempfile.TemporaryDirectory() as tmp:
+            main_source = MAIN_TEMPLATE.format(magic=importlib.util.MAGIC_NUMBER, env=ARCHIVE_ENV,
+                                               version=f"{sys.version_info.major}.{sys.version_info.minor}")
+            archive.writestr("__main__.py", main_source, compress_type=zipfile.ZIP_DEFLATED)
+
+            # Bytecode sans source : le hash non vérifié évite toute comparaison de date au chargement.
+            # Les dossiers ont leur propre entrée : sans __init__, zipimport ne trouve les paquets
+            # (espaces de noms) que par elles
+            directories = set()
+            for path in iter_modules():
+                name = archive_name(path)
+                directory = name.rpartition("/")[0]
+                if directory not in directories:
+                    directories.add(directory)
+                    archive.writestr(zipfile.ZipInfo(f"{directory}/"), b"")
+                cfile = os.path.join(tmp, "module.pyc")
+                py_compile.compile(path, cfile=cfile, dfile=name, doraise=True, optimize=optimize,
+                                   invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+                archive.write(cfile, name[:-3] + ".pyc", compress_type=zipfile.ZIP_DEFLATED)
+                modules += 1
+
+            # Assets non compressés : lus directement dans la projection mémoire de l'archive
+            for path in iter_assets():
+                archive.write(path, archive_name(path), compress_type=zipfile.ZIP_STORED)
+                assets += 1
+
+    if interpreter and os.name == "posix":
+        os.chmod(output, 0o755)
+    size = os.path.getsize(output) / (1024 * 1024)
+    print(f"{output} : {modules} modules, {assets} assets, {size:.1f} Mo "
+          f"en {time.perf_counter() - start:.1f} s")
+    print(f"Points d'entrée : {', '.join(ENTRY_POINTS)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit l'archive distribuable de PythFighter")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Fichier .pyz à créer")
+    parser.add_argument("--optimize", type=int, default=1, choices=(0, 1, 2),
+                        help="Niveau d'optimisation du bytecode (comme python -O)")
+    parser.add_argument("--python", default=DEFAULT_INTERPRETER,
+                        help="Interpréteur de la ligne shebang (vide pour ne pas en mettre)")
+    args = parser.parse_args()
+    build(args.output, args.optimize, args.python)
+
+
+if __name__ == "__main__":
+    main()
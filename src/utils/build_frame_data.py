@@ -0,0 +1,122 @@
+# Génère le manifeste des données de frames à partir des dossiers d'assets des personnages
+#
+# Usage : python src/utils/build_frame_data.py
+#
+# Le manifeste (assets/characters/frame_data.json) contient, pour chaque personnage :
+#   - le dossier réel des assets (la casse varie selon les personnages),
+#   - la liste ordonnée des frames de chaque animation et leur délai (lu dans le nom du fichier),
+#   - les données d'équilibrage (startup/active/recovery des attaques, hitbox).
+# Les données d'équilibrage déjà présentes dans le manifeste sont conservées lors de la régénération,
+# on peut donc les modifier directement dans le JSON sans toucher au code.
+
+import json
+import os
+import re
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.fighters import Mitsu, Tank, Noya, ThunderStrike, Bruiser
+
+CHARACTERS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'characters')
+MANIFEST_PATH = os.path.join(CHARACTERS_DIR, 'frame_data.json')
+MANIFEST_VERSION = 1
+
+# Délai par défaut quand le nom du fichier n'en contient pas (ex: bruiser/jump/00.png)
+DEFAULT_FRAME_DELAY = 0.1
+
+# Certains dossiers n'ont pas le nom attendu par le jeu
+ACTION_ALIASES = {
+    "death": "dead",
+}
+
+FRAME_PATTERN = re.compile(r"^(?:frame_)?(\d+)(?:_delay-([\d.]+)s)?\.png$", re.IGNORECASE)
+
+# Valeurs d'équilibrage par défaut, reprises du code de Fighter (cooldowns de 30 et 240 frames)
+DEFAULT_HITBOX = {"width": 0.7, "height": 0.85}
+DEFAULT_MOVES = {
+    "attack": {"startup": 4, "active": 6, "recovery": 20},
+    "special_attack": {"startup": 8, "active": 12, "recovery": 40, "cooldown": 240},
+}
+
+
+def scan_animation(folder):
+    """Retourne la liste ordonnée des frames d'un dossier d'animation et leurs délais."""
+    frames = []
+    for file_name in os.listdir(folder):
+        match = FRAME_PATTERN.match(file_name)
+        if not match:
+            continue
+        index = int(match.group(1))
+        delay = float(match.group(2)) if match.group(2) else DEFAULT_FRAME_DELAY
+        frames.append((index, file_name, delay))
+
+    frames.sort()
+    return {
+        "frames": [file_name for _, file_name, _ in frames],
+        "delays": [delay for _, _, delay in frames],
+    }
+
+
+def scan_fighter(directory):
+    """Parcourt les dossiers d'animation d'un personnage."""
+    animations = {}
+    fighter_dir = os.path.join(CHARACTERS_DIR, directory)
+    for folder in sorted(os.listdir(fighter_dir)):
+        folder_path = os.path.join(fighter_dir, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        animation = scan_animation(folder_path)
+        if not animation["frames"]:
+            continue
+        animation["folder"] = folder
+        animations[ACTION_ALIASES.get(folder, folder)] = animation
+    return animations
+
+
+def build_manifest(previous=None):
+    """Construit le manifeste en conservant les données d'équilibrage existantes."""
+    previous_fighters = (previous or {}).get("fighters", {})
+    directories = {
+        name.lower(): name for name in os.listdir(CHARACTERS_DIR)
+        if os.path.isdir(os.path.join(CHARACTERS_DIR, name))
+    }
+
+    fighters = {}
+    for fighter_class in [Mitsu, Tank, Noya, ThunderStrike, Bruiser]:
+        name = fighter_class().name
+        directory = directories.get(name.lower())
+        if directory is None:
+            print(f"Aucun dossier d'assets pour {name}")
+            continue
+
+        old = previous_fighters.get(name, {})
+        fighters[name] = {
+            "directory": directory,
+            "hitbox": old.get("hitbox", dict(DEFAULT_HITBOX)),
+            "moves": old.get("moves", json.loads(json.dumps(DEFAULT_MOVES))),
+            "animations": scan_fighter(directory),
+        }
+
+    return {"version": MANIFEST_VERSION, "fighters": fighters}
+
+
+def main():
+    previous = None
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    manifest = build_manifest(previous)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    for name, data in manifest["fighters"].items():
+        counts = ", ".join(f"{action}: {len(anim['frames'])}" for action, anim in data["animations"].items())
+        print(f"{name} ({data['directory']}) -> {counts}")
+    print(f"Manifeste écrit dans {os.path.normpath(MANIFEST_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# Générateur de charge pour le serveur relais (core/server.py)
+#
+# Simule N joueurs sans affichage sur asyncio. Les joueurs vont par paires : l'un crée une salle,
+# l'autre la rejoint, les deux se déclarent prêts puis échangent UPDATE_STATE / GET_OPPONENT_STATE
+# à la fréquence choisie, avec les mêmes messages que MultiplayerManager (core/multi.py).
+# Affiche le débit, les percentiles de latence par action, les erreurs et, si --server-pid est
+# donné (Linux), le CPU et la mémoire du serveur et de ses shards.
+#
+# Usage : python src/utils/load_test.py --players 200 --tick 20 --duration 30 [--server-pid PID]
+#         [--json resultats.json] [--max-p99-ms 50 --max-error-rate 0.01]
+# Le code de sortie vaut 1 si un seuil --max-* est dépassé (utilisable comme garde-fou de régression).
+# Tous les joueurs simulés partagent une adresse IP : lancer le serveur avec --ip-rate 0, sinon la
+# limite par IP répond "busy" (compté dans les erreurs).
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 25568
+READY_POLL_INTERVAL = 0.1
+REQUEST_TIMEOUT = 5
+MAX_REDIRECTS = 3
+
+
+class LoadStats:
+    """Latences et erreurs collectées pendant le test."""
+
+    def __init__(self):
+        self.latencies = {}  # action -> liste de durées (secondes)
+        self.errors = {}  # "action: raison" -> nombre
+        self.requests = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def record(self, action, latency):
+        self.latencies.setdefault(action, []).append(latency)
+        self.requests += 1
+
+    def error(self, action, reason):
+        key = f"{action}: {reason}"
+        self.errors[key] = self.errors.get(key, 0) + 1
+        self.requests += 1
+
+    def error_count(self):
+        return sum(self.errors.values())
+
+    def report(self):
+        duration = max(1e-9, (self.finished_at or time.perf_counter()) - self.started_at)
+        actions = {}
+        for action, values in sorted(self.latencies.items()):
+            values.sort()
+            actions[action] = {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p90_ms": round(percentile(values, 90) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2)
+            }
+        return {
+            "duration_s": round(duration, 2),
+            "requests": self.requests,
+            "throughput_rps": round(self.requests / duration, 1),
+            "errors": self.error_count(),
+            "error_rate": round(self.error_count() / max(1, self.requests), 4),
+            "error_details": self.errors,
+            "actions": actions
+        }
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * p // 100)]
+
+
+class ProcessMonitor:
+    """CPU et mémoire d'un processus et de ses enfants, lus dans /proc (Linux uniquement)."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.peak_rss_mb = 0
+        self._start = None
+
+    def _pids(self):
+        pids = [self.pid]
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        if int(f.read().rsplit(")", 1)[1].split()[1]) == self.pid:
+                            pids.append(int(entry))
+                except (OSError, IndexError, ValueError):
+                    continue
+        return pids
+
+    def sample(self):
+        """Temps CPU cumulé (secondes) et mémoire résidente totale (Mo)."""
+        cpu = 0.0
+        rss_kb = 0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                cpu += (int(fields[11]) + int(fields[12])) / self.clock_ticks
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            rss_kb += int(line.split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_kb / 1024)
+        return cpu, rss_kb / 1024
+
+    def start(self):
+        self._start = (time.perf_counter(), self.sample()[0])
+
+    def report(self):
+        wall_start, cpu_start = self._start
+        cpu, rss_mb = self.sample()
+        wall = max(1e-9, time.perf_counter() - wall_start)
+        return {
+            "processes": len(self._pids()),
+            "cpu_percent": round((cpu - cpu_start) / wall * 100, 1),
+            "rss_mb": round(rss_mb, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1)
+        }
+
+
+class SimulatedPlayer:
+    """Joueur simulé utilisant le protocole de MultiplayerManager (une connexion par requête)."""
+
+    def __init__(self, index, args, stats, connection_limit):
+        self.index = index
+        self.args = args
+        self.stats = stats
+        self.connection_limit = connection_limit
+        self.address = (args.host, args.port)
+        self.player_uuid = str(uuid.uuid4())
+        self.room_id = None
+        self.player_id = None
+        self.pos_x = random.uniform(100, 1000)
+
+    async def request(self, data):
+        """Envoie une requête et retourne la réponse (None en cas d'erreur, comptée dans les stats)."""
+        action = data["action"]
+        for _ in range(MAX_REDIRECTS + 1):
+            async with self.connection_limit:
+                start = time.perf_counter()
+                try:
+                    reader, writer = await asyncio.wait_for(asyncio.open_connection(*self.address), REQUEST_TIMEOUT)
+                    try:
+                        writer.write(json.dumps(data).encode('utf-8'))
+                        await writer.drain()
+                        raw = await asyncio.wait_for(reader.read(), REQUEST_TIMEOUT)
+                    finally:
+                        writer.close()
+                    response = json.loads(raw.decode('utf-8'))
+                except asyncio.TimeoutError:
+                    self.stats.error(action, "timeout")
+                    return None
+                except (OSError, ValueError) as e:
+                    self.stats.error(action, type(e).__name__)
+                    return None
+                latency = time.perf_counter() - start
+
+            if "node" in response:
+                self.address = (response["node"]["host"], response["node"]["port"])
+            if response.get("status") != "redirect":
+                break
+            data = dict(data, redirected=True)
+
+        if response.get("status") == "error":
+            self.stats.error(action, response.get("message", "erreur"))
+            return None
+        if response.get("status") == "busy":
+            # Refus du contrôle de charge du serveur : compté à part des erreurs de traitement
+            self.stats.error(action, "busy")
+            return None
+        self.stats.record(action, latency)
+        return response
+
+    def game_state(self):
+        """Même forme que l'état envoyé par MultiplayerGame.update."""
+        self.pos_x = min(1100, max(50, self.pos_x + random.uniform(-8, 8)))
+        return {
+            "position": {"x": self.pos_x, "y": 600},
+            "velocity": {"x": random.uniform(-5, 5), "y": 0},
+            "health": 100,
+            "stamina": 100,
+            "attacking": random.random() < 0.1,
+            "blocking": False,
+            "animation": "idle",
+            "direction": 1
+        }
+
+    async def host(self, room_future):
+        response = await self.request({"action": "CREATE_ROOM", "player_name": f"load{self.index}",
+                                       "fighter_type": "Mitsu", "player_uuid": self.player_uuid})
+        if response is None:
+            room_future.set_result(None)
+            return
+        self.room_id, self.player_id = response["room_id"], response["player_id"]
+        room_future.set_result(self.room_id)
+        await self.play()
+
+    async def join(self, room_future):
+        room_id = await room_future
+        if room_id is None:
+            return
+        self.address = (self.args.host, self.args.port)
+        response = await self.request({"action": "JOIN_ROOM", "room_id": room_id, "player_name": f"load{self.index}",
+                                       "fighter_type": "Tank", "player_uuid": self.player_uuid})
+        if response is None:
+            return
+        self.room_id, self.player_id = room_id, response["player_id"]
+        await self.play()
+
+    async def play(self):
+        ids = {"room_id": self.room_id, "player_id": self.player_id}
+        await self.request(dict(ids, action="SET_READY", ready=True))
+
+        deadline = time.perf_counter() + self.args.duration
+        while time.perf_counter() < deadline:
+            response = await self.request(dict(ids, action="CHECK_OPPONENT_READY"))
+            if response is not None and response.get("ready"):
+                break
+            await asyncio.sleep(READY_POLL_INTERVAL)
+
+        interval = 1 / self.args.tick
+        next_tick = time.perf_counter()
+        while time.perf_counter() < deadline:
+            await self.request(dict(ids, action="UPDATE_STATE", game_state=self.game_state()))
+            await self.request(dict(ids, action="GET_OPPONENT_STATE"))
+            # Pas de rattrapage : un joueur en retard saute des ticks, comme le vrai client
+            next_tick = max(next_tick + interval, time.perf_counter())
+            await asyncio.sleep(next_tick - time.perf_counter())
+
+        await self.request(dict(ids, action="LEAVE_ROOM"))
+
+
+async def sample_server(monitor):
+    while True:
+        monitor.sample()
+        await asyncio.sleep(1)
+
+
+async def run(args, monitor=None):
+    stats = LoadStats()
+    connection_limit = asyncio.Semaphore(args.max_connections)
+    tasks = []
+    sampler = asyncio.create_task(sample_server(monitor)) if monitor is not None else None
+    stats.started_at = time.perf_counter()
+    for pair in range(args.players // 2):
+        room_future = asyncio.get_running_loop().create_future()
+        host = SimulatedPlayer(pair * 2, args, stats, connection_limit)
+        guest = SimulatedPlayer(pair * 2 + 1, args, stats, connection_limit)
+        tasks.append(asyncio.create_task(host.host(room_future)))
+        tasks.append(asyncio.create_task(guest.join(room_future)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / max(1, args.players // 2))
+    await asyncio.gather(*tasks)
+    stats.finished_at = time.perf_counter()
+    if sampler is not None:
+        sampler.cancel()
+    return stats
+
+
+def print_report(report):
+    print(f"Durée: {report['duration_s']}s - {report['requests']} requêtes - {report['throughput_rps']} req/s - "
+          f"erreurs: {report['errors']} ({report['error_rate'] * 100:.2f}%)")
+    print(f"{'Action':<22}{'Nombre':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for action, values in report["actions"].items():
+        print(f"{action:<22}{values['count']:>9}{values['p50_ms']:>9}{values['p90_ms']:>9}"
+              f"{values['p99_ms']:>9}{values['max_ms']:>9}")
+    for error, count in sorted(report["error_details"].items(), key=lambda item: -item[1])[:10]:
+        print(f"  erreur {error}: {count}")
+    if "server" in report:
+        server = report["server"]
+        print(f"Serveur ({server['processes']} processus): CPU {server['cpu_percent']}%, "
+              f"mémoire {server['rss_mb']} Mo (pic {server['peak_rss_mb']} Mo)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du serveur relais PythFighter")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--players", type=int, default=100, help="Nombre de joueurs simulés (par paires)")
+    parser.add_argument("--tick", type=float, default=20, help="Échanges d'état par seconde et par joueur")
+    parser.add_argument("--duration", type=float, default=30, help="Durée de jeu de chaque joueur (secondes)")
+    parser.add_argument("--ramp", type=float, default=0, help="Durée d'arrivée progressive des joueurs")
+    parser.add_argument("--max-connections", type=int, default=512, help="Connexions simultanées maximum")
+    parser.add_argument("--server-pid", type=int, help="PID du serveur pour mesurer son CPU et sa mémoire")
+    parser.add_argument("--json", help="Écrit le rapport dans ce fichier JSON")
+    parser.add_argument("--action", default="UPDATE_STATE", help="Action vérifiée par --max-p99-ms")
+    parser.add_argument("--max-p99-ms", type=float, help="Échec si le p99 de --action dépasse ce seuil")
+    parser.add_argument("--max-error-rate", type=float, help="Échec si le taux d'erreurs dépasse ce seuil")
+    args = parser.parse_args()
+
+    monitor = None
+    if args.server_pid:
+        if os.path.isdir(f"/proc/{args.server_pid}"):
+            monitor = ProcessMonitor(args.server_pid)
+            monitor.start()
+        else:
+            print(f"Processus {args.server_pid} introuvable dans /proc, mesure du serveur désactivée")
+
+    stats = asyncio.run(run(args, monitor))
+    report = stats.report()
+    if monitor is not None:
+        report["server"] = monitor.report()
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    p99 = report["actions"].get(args.action, {}).get("p99_ms")
+    if args.max_p99_ms is not None and (p99 is None or p99 > args.max_p99_ms):
+        print(f"ÉCHEC: p99 {args.action} = {p99} ms > {args.max_p99_ms} ms")
+        failed = True
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        print(f"ÉCHEC: taux d'erreurs {report['error_rate']} > {args.max_error_rate}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()